@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Benchmark the document validators over the showcase corpus.
+
+Each document is unpacked with unpack_document(), optionally scaled up (paragraphs
+of a .docx or slides of a .pptx are replicated), and validated in a fresh
+process so that peak memory is measured per case.
+
+Usage:
+    python benchmark.py [office_file ...] [--scale 1 10 100] [--workers N]
+        [--streaming | --no-streaming] [--json FILE]
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import lxml.etree
+
+from unpack import unpack_document
+from validation import DOCXSchemaValidator, PPTXSchemaValidator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Documents benchmarked when no files are given
+DEFAULT_CORPUS = SCRIPTS_DIR.parents[4] / "showcase" / "file-factory-output"
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+P_NAMESPACE = "http://schemas.openxmlformats.org/presentationml/2006/main"
+R_NAMESPACE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_RELATIONSHIPS_NAMESPACE = (
+    "http://schemas.openxmlformats.org/package/2006/relationships"
+)
+CONTENT_TYPES_NAMESPACE = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+# Slide relationships that may only be used by one slide, dropped from copies
+SINGLE_OWNER_RELATIONSHIP_TYPES = {"notesSlide", "comments"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the document validators")
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help=f"Office files to benchmark (default: .docx/.pptx files in {DEFAULT_CORPUS})",
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        nargs="+",
+        default=[1, 10, 100],
+        help="Replicate paragraphs/slides this many times (default: 1 10 100)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for per-part schema checks (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--streaming",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Force streaming of the per-element checks on or off",
+    )
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--run-case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        # Child process: validate one prepared case and report on stdout
+        result = run_case(*args.run_case, args.workers, args.streaming)
+        print(json.dumps(result))
+        return
+
+    files = [Path(f) for f in args.files] or find_corpus(DEFAULT_CORPUS)
+    if not files:
+        sys.exit(f"Error: No .docx or .pptx files found in {DEFAULT_CORPUS}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for office_file in files:
+            for scale in args.scale:
+                unpacked_dir = Path(temp_dir) / f"{office_file.stem}-{scale}x"
+                prepare_case(office_file, unpacked_dir, scale)
+                result = benchmark_case(
+                    unpacked_dir, office_file, args.workers, args.streaming
+                )
+                result.update(file=str(office_file), scale=scale)
+                results.append(result)
+                print_result(result)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+def find_corpus(corpus_dir):
+    """Return the .docx and .pptx files under a directory, sorted by path."""
+    corpus_dir = Path(corpus_dir)
+    return sorted(
+        f for pattern in ("*.docx", "*.pptx") for f in corpus_dir.rglob(pattern)
+    )
+
+
+def prepare_case(office_file, unpacked_dir, scale=1):
+    """Unpack an Office file and replicate its content scale times.
+
+    Args:
+        office_file: Path to the .docx or .pptx file
+        unpacked_dir: Directory to unpack into
+        scale: Number of copies of the paragraphs (.docx) or slides (.pptx)
+    """
+    unpack_document(office_file, unpacked_dir)
+
+    if scale > 1:
+        if Path(office_file).suffix.lower() == ".docx":
+            scale_docx(unpacked_dir, scale)
+        else:
+            scale_pptx(unpacked_dir, scale)
+
+
+def scale_docx(unpacked_dir, scale):
+    """Repeat the body content of word/document.xml scale times in total."""
+    document_file = Path(unpacked_dir) / "word" / "document.xml"
+    tree = lxml.etree.parse(str(document_file))
+    body = tree.getroot().find(f"{{{W_NAMESPACE}}}body")
+
+    # Section properties must stay the last child of the body
+    content = [child for child in body if child.tag != f"{{{W_NAMESPACE}}}sectPr"]
+    position = body.index(content[-1]) + 1 if content else 0
+    for _ in range(scale - 1):
+        for child in content:
+            body.insert(position, copy.deepcopy(child))
+            position += 1
+
+    _write_xml(tree, document_file)
+
+
+def scale_pptx(unpacked_dir, scale):
+    """Add copies of every slide so the presentation has scale times as many."""
+    unpacked_dir = Path(unpacked_dir)
+    presentation_file = unpacked_dir / "ppt" / "presentation.xml"
+    presentation_rels_file = unpacked_dir / "ppt" / "_rels" / "presentation.xml.rels"
+    content_types_file = unpacked_dir / "[Content_Types].xml"
+
+    presentation = lxml.etree.parse(str(presentation_file))
+    presentation_rels = lxml.etree.parse(str(presentation_rels_file))
+    content_types = lxml.etree.parse(str(content_types_file))
+
+    slide_id_list = presentation.getroot().find(f"{{{P_NAMESPACE}}}sldIdLst")
+    relationships = presentation_rels.getroot()
+    targets = {
+        rel.get("Id"): rel
+        for rel in relationships.iter(
+            f"{{{PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+        )
+    }
+    slide_ids = list(slide_id_list) if slide_id_list is not None else []
+    overrides = {
+        override.get("PartName"): override
+        for override in content_types.getroot().iter(
+            f"{{{CONTENT_TYPES_NAMESPACE}}}Override"
+        )
+    }
+
+    next_id = max((int(slide_id.get("id")) for slide_id in slide_ids), default=255) + 1
+    next_rid = len(targets) + 1
+    next_slide = 1
+
+    for _ in range(scale - 1):
+        for slide_id in slide_ids:
+            relationship = targets[slide_id.get(f"{{{R_NAMESPACE}}}id")]
+            source = unpacked_dir / "ppt" / relationship.get("Target")
+            while source.with_name(f"slide{next_slide}.xml").exists():
+                next_slide += 1
+            target = source.with_name(f"slide{next_slide}.xml")
+            target.write_bytes(source.read_bytes())
+            _copy_slide_rels(source, target)
+
+            # Register the copy in the content types, relationships and slide list
+            override = copy.deepcopy(overrides[f"/ppt/slides/{source.name}"])
+            override.set("PartName", f"/ppt/slides/{target.name}")
+            content_types.getroot().append(override)
+
+            while f"rId{next_rid}" in targets:
+                next_rid += 1
+            new_relationship = copy.deepcopy(relationship)
+            new_relationship.set("Id", f"rId{next_rid}")
+            new_relationship.set("Target", f"slides/{target.name}")
+            relationships.append(new_relationship)
+            targets[f"rId{next_rid}"] = new_relationship
+
+            new_slide_id = copy.deepcopy(slide_id)
+            new_slide_id.set("id", str(next_id))
+            new_slide_id.set(f"{{{R_NAMESPACE}}}id", f"rId{next_rid}")
+            slide_id_list.append(new_slide_id)
+
+            next_id += 1
+
+    _write_xml(presentation, presentation_file)
+    _write_xml(presentation_rels, presentation_rels_file)
+    _write_xml(content_types, content_types_file)
+
+
+def _copy_slide_rels(source, target):
+    """Copy a slide's .rels file, dropping relationships a copy cannot share."""
+    source_rels = source.parent / "_rels" / f"{source.name}.rels"
+    if not source_rels.exists():
+        return
+
+    tree = lxml.etree.parse(str(source_rels))
+    for rel in list(tree.getroot()):
+        if rel.get("Type", "").split("/")[-1] in SINGLE_OWNER_RELATIONSHIP_TYPES:
+            tree.getroot().remove(rel)
+    _write_xml(tree, target.parent / "_rels" / f"{target.name}.rels")
+
+
+def _write_xml(tree, path):
+    """Write a tree back with an XML declaration, as Office expects."""
+    tree.write(str(path), xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def benchmark_case(unpacked_dir, original_file, workers=1, streaming=None):
+    """Validate a prepared case in a fresh process and return its measurements."""
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve()),
+        "--run-case",
+        str(unpacked_dir),
+        str(original_file),
+        "--workers",
+        str(workers),
+    ]
+    if streaming is not None:
+        command.append("--streaming" if streaming else "--no-streaming")
+
+    completed = subprocess.run(command, check=True, capture_output=True, text=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def run_case(unpacked_dir, original_file, workers=1, streaming=None):
+    """Validate an unpacked document, timing each check.
+
+    Returns:
+        dict: Wall time per check and in total (seconds), whether the
+        document passed, the number of XML parses in this process and the
+        peak RSS of this process and of its worker processes (MB)
+    """
+    match Path(original_file).suffix.lower():
+        case ".docx":
+            validator_class = DOCXSchemaValidator
+        case ".pptx":
+            validator_class = PPTXSchemaValidator
+        case suffix:
+            raise ValueError(f"Validation not supported for file type {suffix}")
+
+    checks = {}
+    start = time.perf_counter()
+    with validator_class(
+        unpacked_dir, original_file, workers=workers, streaming=streaming
+    ) as validator:
+        _time_checks(validator, checks)
+        with contextlib.redirect_stdout(io.StringIO()):
+            valid = validator.validate()
+    total = time.perf_counter() - start
+
+    return {
+        "parts": len(validator.xml_files),
+        "valid": valid,
+        "total": total,
+        "checks": checks,
+        "parse_count": validator.parse_count,
+        "peak_rss_mb": _peak_rss_mb(),
+        "worker_peak_rss_mb": _peak_rss_mb(children=True),
+    }
+
+
+def _time_checks(validator, checks):
+    """Wrap the validator's top-level checks so each call adds to checks[name]."""
+
+    def timed(name, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                checks[name] = checks.get(name, 0.0) + time.perf_counter() - start
+
+        return wrapper
+
+    for name in dir(type(validator)):
+        # validate_file_against_xsd is the per-part step of validate_against_xsd
+        if name == "compare_paragraph_counts" or (
+            name.startswith("validate_") and name != "validate_file_against_xsd"
+        ):
+            setattr(validator, name, timed(name, getattr(validator, name)))
+
+
+def _peak_rss_mb(children=False):
+    """Return the peak resident set size in MB, or None if it is unavailable."""
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def print_result(result):
+    """Print one benchmark case with its per-check times, slowest first."""
+    rss = result["peak_rss_mb"]
+    worker_rss = result["worker_peak_rss_mb"]
+    print(
+        f"{Path(result['file']).name} x{result['scale']}: "
+        f"{result['total']:.2f} s, {result['parts']} parts, "
+        f"{result['parse_count']} parses, "
+        f"peak RSS {f'{rss:.0f} MB' if rss is not None else 'n/a'}"
+        + (f" (workers {worker_rss:.0f} MB)" if worker_rss else "")
+        + ("" if result["valid"] else ", FAILED validation")
+    )
+    for name, seconds in sorted(result["checks"].items(), key=lambda item: -item[1]):
+        print(f"  {name:<40} {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
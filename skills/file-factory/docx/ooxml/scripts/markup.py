@@ -0,0 +1,39 @@
+"""
+Helpers for serialized XML shared by pack.py and unpack.py.
+
+Both scripts serialize parts with lxml and then fix up the text so it
+matches minidom's output byte for byte; unpack.py works on str and pack.py
+on bytes.
+"""
+
+import re
+
+# Comments and tags in serialized XML; text content lies in between
+MARKUP_PATTERN = re.compile(r"(<!--.*?-->|<[^>]*>)", re.DOTALL)
+MARKUP_PATTERN_BYTES = re.compile(MARKUP_PATTERN.pattern.encode("ascii"), re.DOTALL)
+
+
+def escape_text_quotes(xml):
+    """Escape double quotes in text content as minidom does (&quot;).
+
+    Args:
+        xml: Serialized XML (str or bytes)
+
+    Returns:
+        The XML with quotes outside tags and comments escaped, of the same type
+    """
+    if isinstance(xml, bytes):
+        pattern, quote, escaped = MARKUP_PATTERN_BYTES, b'"', b"&quot;"
+    else:
+        pattern, quote, escaped = MARKUP_PATTERN, '"', "&quot;"
+    empty = xml[:0]
+
+    if quote not in pattern.sub(empty, xml):
+        return xml
+    parts = pattern.split(xml)
+    parts[::2] = [text.replace(quote, escaped) for text in parts[::2]]
+    return empty.join(parts)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
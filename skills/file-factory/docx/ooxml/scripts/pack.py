@@ -3,30 +3,158 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--workers N]
+        [--compresslevel N] [--original <office_file> [--modified <part> ...]]
+
+    # Many documents, listed in a JSON lines manifest of {"input": ...,
+    # "output": ..., "original": ...} objects or matched by a glob
+    python pack.py --batch <manifest.jsonl> [--report report.jsonl]
+    python pack.py --batch 'unpacked/*' --output-dir packed [--soffice-workers N]
 """
 
 import argparse
-import shutil
-import subprocess
+import contextlib
+import glob
+import json
+import os
 import sys
 import tempfile
+import threading
+import time
 import defusedxml.minidom
+import lxml.etree
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
+try:
+    from .archive import (
+        canonical_order,
+        compress_data,
+        copy_zipinfo,
+        copyable_members,
+        make_deterministic,
+        read_raw_member,
+        replace_on_success,
+        write_compressed_member,
+    )
+    from .markup import escape_text_quotes
+    from .soffice import SofficePool, SofficeTimeout, get_pool
+except ImportError:  # Run from the scripts directory
+    from archive import (
+        canonical_order,
+        compress_data,
+        copy_zipinfo,
+        copyable_members,
+        make_deterministic,
+        read_raw_member,
+        replace_on_success,
+        write_compressed_member,
+    )
+    from markup import escape_text_quotes
+    from soffice import SofficePool, SofficeTimeout, get_pool
+
+# Declaration written by minidom's toxml(encoding="UTF-8")
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8"?>'
+
+# Package directory of each document type, for naming --batch outputs
+DOCUMENT_DIRECTORIES = {"word": ".docx", "ppt": ".pptx", "xl": ".xlsx"}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
-    parser.add_argument("input_directory", help="Unpacked Office document directory")
-    parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument(
+        "input_directory", nargs="?", help="Unpacked Office document directory"
+    )
+    parser.add_argument(
+        "output_file", nargs="?", help="Output Office file (.docx/.pptx/.xlsx)"
+    )
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes condensing and compressing parts, or packing "
+        "documents with --batch (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--compresslevel",
+        type=int,
+        choices=range(10),
+        metavar="0-9",
+        help="Deflate level for XML and other compressible parts (default: 6)",
+    )
+    parser.add_argument(
+        "--original",
+        help="Office file the directory was unpacked from; unchanged parts are "
+        "copied from it without recompressing",
+    )
+    parser.add_argument(
+        "--modified",
+        nargs="*",
+        metavar="PART",
+        help="Repack from --original, reading only these parts (e.g. "
+        "word/document.xml) from the directory; every other part is copied "
+        "from the original as is",
+    )
+    parser.add_argument(
+        "--deterministic",
+        action="store_true",
+        help="Write identical bytes for identical contents: canonical member "
+        "order, fixed timestamps and permissions",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="MANIFEST_OR_GLOB",
+        help="Pack many documents: a JSON lines manifest of {input, output, "
+        "original} objects, or a glob of unpacked directories (with --output-dir)",
+    )
+    parser.add_argument(
+        "--output-dir", help="Directory for the documents matched by a --batch glob"
+    )
+    parser.add_argument(
+        "--report",
+        default="-",
+        help="JSON lines file with one result per --batch document (default: stdout)",
+    )
+    parser.add_argument(
+        "--soffice-workers",
+        type=int,
+        default=1,
+        help="Concurrent soffice validations for --batch (0 = all CPUs, default: 1)",
+    )
     args = parser.parse_args()
 
+    if args.batch:
+        sys.exit(batch_main(parser, args))
+    if not args.input_directory or not args.output_file:
+        parser.error("input_directory and output_file are required without --batch")
+    if args.modified is not None and not args.original:
+        parser.error("--modified requires --original")
+
     try:
-        success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
-        )
+        if args.modified is not None:
+            success = repack_document(
+                args.original,
+                args.input_directory,
+                args.output_file,
+                args.modified,
+                validate=not args.force,
+                compresslevel=args.compresslevel,
+                deterministic=args.deterministic,
+            )
+        else:
+            success = pack_document(
+                args.input_directory,
+                args.output_file,
+                validate=not args.force,
+                workers=args.workers,
+                compresslevel=args.compresslevel,
+                original_file=args.original,
+                deterministic=args.deterministic,
+            )
 
         # Show warning if validation was skipped
         if args.force:
@@ -42,13 +170,261 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def batch_main(parser, args):
+    """Run --batch and return the exit status (1 if any document failed)."""
+    if args.input_directory or args.modified is not None or args.original:
+        parser.error("--batch takes no input directory, --original or --modified")
+
+    try:
+        if Path(args.batch).is_file():
+            entries = read_manifest(args.batch)
+        elif args.output_dir:
+            entries = glob_entries(args.batch, args.output_dir)
+        else:
+            parser.error("--output-dir is required when --batch is a glob")
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+    with contextlib.ExitStack() as stack:
+        if args.report == "-":
+            report = sys.stdout
+        else:
+            report = stack.enter_context(open(args.report, "w", encoding="utf-8"))
+        results = pack_batch(
+            entries,
+            report,
+            validate=not args.force,
+            workers=args.workers,
+            compresslevel=args.compresslevel,
+            soffice_workers=args.soffice_workers,
+            deterministic=args.deterministic,
+        )
+
+    failed = sum(result["status"] != "ok" for result in results)
+    print(
+        f"Packed {len(results) - failed} of {len(results)} documents", file=sys.stderr
+    )
+    return 1 if failed else 0
+
+
+def read_manifest(manifest_file):
+    """Read a --batch manifest.
+
+    Each non-empty line is a JSON object with the "input" directory, the
+    "output" file and optionally the "original" file to copy unchanged parts
+    from. Relative paths are relative to the manifest's directory.
+
+    Returns:
+        list: One dict per document, with "input", "output" and "original"
+
+    Raises:
+        ValueError: If a line is not valid JSON or lacks input or output
+    """
+    manifest_file = Path(manifest_file)
+    base = manifest_file.parent
+    entries = []
+    with open(manifest_file, encoding="utf-8") as lines:
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                entries.append(
+                    {
+                        "input": str(base / entry["input"]),
+                        "output": str(base / entry["output"]),
+                        "original": (
+                            str(base / entry["original"])
+                            if entry.get("original")
+                            else None
+                        ),
+                    }
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{manifest_file}:{line_number}: invalid entry ({e})")
+    return entries
+
+
+def glob_entries(pattern, output_dir):
+    """Return --batch entries for the unpacked directories matching a glob.
+
+    Each output is named after its directory, with the extension of the
+    document type found in it (word/ for .docx, ppt/ for .pptx, xl/ for .xlsx).
+    """
+    entries = []
+    for input_dir in sorted(Path(path) for path in glob.glob(pattern, recursive=True)):
+        if not input_dir.is_dir():
+            continue
+        suffix = next(
+            (
+                suffix
+                for name, suffix in DOCUMENT_DIRECTORIES.items()
+                if (input_dir / name).is_dir()
+            ),
+            None,
+        )
+        if suffix is None:
+            # Reported as a failure by pack_document
+            suffix = ".unknown"
+        entries.append(
+            {
+                "input": str(input_dir),
+                "output": str(Path(output_dir) / f"{input_dir.name}{suffix}"),
+                "original": None,
+            }
+        )
+    return entries
+
+
+def pack_batch(
+    entries,
+    report,
+    validate=True,
+    workers=1,
+    compresslevel=None,
+    soffice_workers=1,
+    deterministic=False,
+):
+    """Pack many documents, writing one JSON line per document to report.
+
+    Documents are packed by a pool of worker processes (each document is
+    packed in one process) and validated as they are packed, through one
+    SofficePool shared by the whole batch. Lines are written as documents
+    finish, so their order may differ from the order of entries.
+
+    Args:
+        entries: Dicts with the "input" directory, "output" file and
+            "original" file (or None) of each document
+        report: Text file the JSON lines are written to
+        validate: If True, validates each document with soffice; invalid
+            documents are deleted as pack_document does
+        workers: Number of processes packing documents (0 uses every CPU)
+        compresslevel: Deflate level (0-9), as for pack_document
+        soffice_workers: Number of concurrent validations (0 uses every CPU)
+        deterministic: If True, packs in deterministic mode (see pack_document)
+
+    Returns:
+        list: The result of each document, as written to the report: input,
+        output, status ("ok", "invalid" or "error"), an error message if
+        any, and seconds spent packing, validating and in total
+    """
+    workers = workers if workers else os.cpu_count() or 1
+    soffice_workers = soffice_workers if soffice_workers else os.cpu_count() or 1
+    results = []
+    lock = threading.Lock()
+
+    def write(result):
+        with lock:
+            results.append(result)
+            report.write(json.dumps(result) + "\n")
+            report.flush()
+
+    with contextlib.ExitStack() as stack:
+        if validate:
+            pool = stack.enter_context(SofficePool(size=soffice_workers))
+            validators = stack.enter_context(
+                ThreadPoolExecutor(max_workers=soffice_workers)
+            )
+
+        if workers == 1 or len(entries) < 2:
+            packed = map(
+                _pack_batch_entry, entries, repeat(compresslevel), repeat(deterministic)
+            )
+        else:
+            packers = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            packed = packers.map(
+                _pack_batch_entry, entries, repeat(compresslevel), repeat(deterministic)
+            )
+
+        soffice_missing = threading.Event()
+        for result in packed:
+            if validate and result["status"] == "ok":
+                future = validators.submit(
+                    _validate_batch_result, result, pool, soffice_missing
+                )
+                future.add_done_callback(lambda future: write(future.result()))
+            else:
+                write(result)
+
+    if soffice_missing.is_set():
+        print("Warning: soffice not found. Skipped validation.", file=sys.stderr)
+    return results
+
+
+def _pack_batch_entry(entry, compresslevel=None, deterministic=False):
+    """Pack one --batch document without validating it."""
+    result = {"input": entry["input"], "output": entry["output"]}
+    start = time.perf_counter()
+    try:
+        pack_document(
+            entry["input"],
+            entry["output"],
+            compresslevel=compresslevel,
+            original_file=entry["original"],
+            deterministic=deterministic,
+        )
+        result["status"] = "ok"
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    result["pack_seconds"] = result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _validate_batch_result(result, pool, soffice_missing):
+    """Validate a packed --batch document and add the outcome to its result."""
+    start = time.perf_counter()
+    output_file = Path(result["output"])
+    try:
+        error = _conversion_error(output_file, pool)
+    except FileNotFoundError:
+        soffice_missing.set()
+        return result
+
+    if error is not None:
+        output_file.unlink(missing_ok=True)  # Delete the corrupt file
+        result.update(status="invalid", error=error)
+    result["validate_seconds"] = time.perf_counter() - start
+    result["seconds"] += result["validate_seconds"]
+    return result
+
+
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    workers=1,
+    compresslevel=None,
+    original_file=None,
+    pool=None,
+    deterministic=False,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
+    The package is written to a temporary file next to output_file and only
+    moved into place once it is complete; if packing fails, output_file is
+    left untouched.
+
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        workers: Number of worker processes that condense and compress
+            parts (1 packs in this process, 0 uses every CPU). Members are
+            always written in the same order, so the output does not
+            depend on the number of workers.
+        compresslevel: Deflate level (0-9) for XML and other compressible
+            parts (default: zlib's default level). Already compressed media
+            (see archive.STORED_EXTENSIONS) is always stored.
+        original_file: Optional Office file the directory was unpacked from.
+            Parts whose content is unchanged from it are copied over with
+            their compressed data as is, without recompressing.
+        pool: SofficePool used for validation (default: the process's
+            shared pool)
+        deterministic: If True, members are written in canonical order
+            ([Content_Types].xml first, then by name) with a fixed timestamp
+            and permissions, so packing the same contents twice gives the
+            same bytes (with the same compresslevel, zlib version and
+            original_file, whose compressed data is reused as is)
 
     Returns:
         bool: True if successful, False if validation failed
@@ -61,34 +437,207 @@ def pack_document(input_dir, output_file, validate=False):
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
+    workers = workers if workers else os.cpu_count() or 1
+    files = [f for f in input_dir.rglob("*") if f.is_file()]
+    if deterministic:
+        files.sort(key=lambda f: canonical_order(f.relative_to(input_dir).as_posix()))
+    arcnames = [f.relative_to(input_dir) for f in files]
+
+    # Members of the original that can be copied without recompressing
+    source_infos = copyable_members(original_file) if original_file else {}
+    sources = [source_infos.get(arcname.as_posix()) for arcname in arcnames]
+
+    # Create final Office file as zip archive, reading each part once and
+    # condensing XML in memory (the input directory is never modified)
+    with contextlib.ExitStack() as stack:
+        temp_file = stack.enter_context(replace_on_success(output_file))
+        zf = stack.enter_context(zipfile.ZipFile(temp_file, "w"))
+        source = (
+            stack.enter_context(open(original_file, "rb")) if source_infos else None
+        )
+
+        if workers == 1 or len(files) < 2:
+            members = map(
+                _compress_part,
+                files,
+                arcnames,
+                repeat(compresslevel),
+                sources,
+                repeat(original_file),
+            )
+        else:
+            # Workers condense and compress; this process only writes, in file order
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            members = executor.map(
+                _compress_part,
+                files,
+                arcnames,
+                repeat(compresslevel),
+                sources,
+                repeat(original_file),
+                chunksize=max(1, len(files) // (workers * 4)),
+            )
+
+        for zinfo, compressed in members:
+            if compressed is None:
+                # Unchanged part: reuse the original's compressed data
+                source_info = source_infos[zinfo.filename]
+                compressed = read_raw_member(source, source_info)
+                zinfo.compress_type = source_info.compress_type
+                zinfo.compress_size = source_info.compress_size
+            if deterministic:
+                make_deterministic(zinfo)
+            write_compressed_member(zf, zinfo, compressed)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file, pool):
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    return True
+
+
+def repack_document(
+    original_file,
+    input_dir,
+    output_file,
+    modified_parts,
+    validate=False,
+    compresslevel=None,
+    pool=None,
+    deterministic=False,
+):
+    """Write a new Office file from an original and a set of modified parts.
+
+    Only the modified parts are read from the unpacked directory, condensed
+    and compressed; every other member is copied from the original with its
+    compressed data as is, so the cost depends on the size of the edits
+    rather than the size of the package. Parts added to the directory (not
+    in the original) are always packed, and members whose file has been
+    deleted from the directory are dropped. As with pack_document, a failed
+    repack leaves output_file untouched.
+
+    Args:
+        original_file: Office file (.docx/.pptx/.xlsx) to copy unchanged
+            members from, e.g. the file the directory was unpacked from
+        input_dir: Path to the unpacked Office document directory
+        output_file: Path to output Office file
+        modified_parts: Names of the parts changed in the directory, relative
+            to it (e.g. "word/document.xml"). Changes to any other existing
+            part are not picked up.
+        validate: If True, validates with soffice (default: False)
+        compresslevel: Deflate level (0-9) for the parts that are packed
+            (default: zlib's default level)
+        pool: SofficePool used for validation (default: the process's
+            shared pool)
+        deterministic: If True, writes members in canonical order with a
+            fixed timestamp and permissions (see pack_document)
+
+    Returns:
+        bool: True if successful, False if validation failed
+    """
+    input_dir = Path(input_dir)
+    output_file = Path(output_file)
+
+    if not input_dir.is_dir():
+        raise ValueError(f"{input_dir} is not a directory")
+    if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
+        raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
+    if output_file.resolve() == Path(original_file).resolve():
+        raise ValueError(f"{output_file} must not be the original file")
+
+    modified_parts = {Path(part).as_posix() for part in modified_parts}
+    source_infos = copyable_members(original_file)
+    with zipfile.ZipFile(original_file) as original:
+        original_names = original.namelist()
+
+    # Listing the directory finds added and deleted parts without reading them
+    present = {
+        f.relative_to(input_dir).as_posix() for f in input_dir.rglob("*") if f.is_file()
+    }
+    names = [name for name in original_names if name in present]
+    names.extend(sorted(present.difference(original_names)))
+    if deterministic:
+        names.sort(key=canonical_order)
+
+    with (
+        replace_on_success(output_file) as temp_file,
+        zipfile.ZipFile(temp_file, "w") as zf,
+        open(original_file, "rb") as source,
+    ):
+        for name in names:
+            source_info = source_infos.get(name)
+            if source_info is not None and name not in modified_parts:
+                zinfo = copy_zipinfo(source_info)
+                compressed = read_raw_member(source, source_info)
+            else:
+                zinfo, compressed = _compress_part(
+                    input_dir / name, name, compresslevel
+                )
+            if deterministic:
+                make_deterministic(zinfo)
+            write_compressed_member(zf, zinfo, compressed)
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file, pool):
+            output_file.unlink()  # Delete the corrupt file
+            return False
 
     return True
 
 
-def validate_document(doc_path):
-    """Validate document by converting to HTML with soffice."""
+def _compress_part(
+    path, arcname, compresslevel=None, source_info=None, original_file=None
+):
+    """Read, condense (XML only) and compress one part.
+
+    Runs in a worker process in parallel mode, so it only returns data.
+
+    Args:
+        path: Path to the part in the unpacked directory
+        arcname: Name of the member in the package
+        compresslevel: Deflate level, or None for zlib's default
+        source_info: ZipInfo of the same member in the original package, if any
+        original_file: The original package source_info belongs to
+
+    Returns:
+        tuple: (ZipInfo with sizes and CRC filled in, compressed data), where
+        the data is None if the part is unchanged from source_info
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    data = path.read_bytes()
+    if path.name.endswith((".xml", ".rels")):
+        data = condense_xml_bytes(data)
+    return compress_data(zinfo, data, compresslevel, source_info, original_file)
+
+
+def validate_document(doc_path, pool=None):
+    """Validate document by converting to HTML with soffice.
+
+    Args:
+        doc_path: Path to the Office file
+        pool: SofficePool to convert with (default: the process's shared pool)
+    """
+    try:
+        error = _conversion_error(doc_path, pool or get_pool())
+    except FileNotFoundError:
+        print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
+        return True
+
+    if error is not None:
+        print(f"Validation error: {error}", file=sys.stderr)
+        return False
+    return True
+
+
+def _conversion_error(doc_path, pool):
+    """Convert a document to HTML and return why that failed, or None.
+
+    Raises:
+        FileNotFoundError: If soffice is not installed
+    """
     # Determine the correct filter based on file extension
     match doc_path.suffix.lower():
         case ".docx":
@@ -100,40 +649,111 @@ def validate_document(doc_path):
 
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
-            result = subprocess.run(
-                [
-                    "soffice",
-                    "--headless",
-                    "--convert-to",
-                    filter_name,
-                    "--outdir",
-                    temp_dir,
-                    str(doc_path),
-                ],
-                capture_output=True,
-                timeout=10,
-                text=True,
-            )
-            if not (Path(temp_dir) / f"{doc_path.stem}.html").exists():
-                error_msg = result.stderr.strip() or "Document validation failed"
-                print(f"Validation error: {error_msg}", file=sys.stderr)
-                return False
-            return True
+            pool.convert(doc_path, temp_dir, filter_name)
+            return None
         except FileNotFoundError:
-            print("Warning: soffice not found. Skipping validation.", file=sys.stderr)
-            return True
-        except subprocess.TimeoutExpired:
-            print("Validation error: Timeout during conversion", file=sys.stderr)
-            return False
+            raise
+        except SofficeTimeout:
+            return "Timeout during conversion"
         except Exception as e:
-            print(f"Validation error: {e}", file=sys.stderr)
-            return False
+            return str(e) or "Document validation failed"
 
 
 def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
-    with open(xml_file, "r", encoding="utf-8") as f:
-        dom = defusedxml.minidom.parse(f)
+    """Strip unnecessary whitespace and remove comments, rewriting the file."""
+    xml_file = Path(xml_file)
+    xml_file.write_bytes(condense_xml_bytes(xml_file.read_bytes()))
+
+
+def condense_xml_bytes(data):
+    """Return XML content with unnecessary whitespace and comments removed.
+
+    Parts are condensed with lxml; the output is byte-identical to the
+    minidom implementation, which is still used for the rare constructs
+    the lxml serializer writes differently (CDATA sections, processing
+    instructions, DTDs and characters it emits as character references).
+    """
+    condensed = _condense_xml_lxml(data)
+    if condensed is None:
+        condensed = _condense_xml_minidom(data)
+    return condensed
+
+
+def _condense_xml_lxml(data):
+    """Condense XML with lxml, or return None if minidom must be used instead."""
+    declaration_count = 1 if data.lstrip(b"\xef\xbb\xbf").startswith(b"<?xml") else 0
+    if (
+        b"<![CDATA[" in data
+        or b"<!DOCTYPE" in data
+        or data.count(b"<?") > declaration_count
+    ):
+        return None
+
+    # Decode as UTF-8 whatever the declaration says, like the minidom path
+    parser = lxml.etree.XMLParser(
+        encoding="utf-8", huge_tree=True, resolve_entities=False
+    )
+    try:
+        root = lxml.etree.fromstring(data, parser=parser)
+    except lxml.etree.XMLSyntaxError:
+        # Let minidom report the error as before
+        return None
+
+    comments = []
+    for element in root.iter(lxml.etree.Element):
+        # Skip w:t elements (any prefixed *:t element) and their processing
+        if element.prefix is not None and element.tag.endswith("}t"):
+            continue
+
+        # Remove whitespace-only text nodes and comment nodes
+        if element.text and element.text.strip() == "":
+            element.text = None
+        for child in element:
+            if child.tail and child.tail.strip() == "":
+                child.tail = None
+            if child.tag is lxml.etree.Comment:
+                comments.append(child)
+
+    for comment in comments:
+        _remove_keeping_tail(comment)
+
+    parts = [XML_DECLARATION]
+    parts.extend(
+        lxml.etree.tostring(node, encoding="UTF-8")
+        for node in reversed(list(root.itersiblings(preceding=True)))
+    )
+    parts.append(
+        lxml.etree.tostring(
+            root, encoding="UTF-8", xml_declaration=False, with_tail=False
+        )
+    )
+    parts.extend(
+        lxml.etree.tostring(node, encoding="UTF-8") for node in root.itersiblings()
+    )
+    condensed = b"".join(parts)
+
+    # minidom writes tabs, newlines and carriage returns unescaped
+    if b"&#" in condensed:
+        return None
+    return escape_text_quotes(condensed)
+
+
+def _remove_keeping_tail(node):
+    """Remove a node from its parent, keeping the text that follows it."""
+    parent = node.getparent()
+    previous = node.getprevious()
+    tail = node.tail
+    parent.remove(node)
+    if tail:
+        if previous is not None:
+            previous.tail = (previous.tail or "") + tail
+        else:
+            parent.text = (parent.text or "") + tail
+
+
+def _condense_xml_minidom(data):
+    """Return XML content with unnecessary whitespace and comments removed."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
 
     # Process each element to remove whitespace and comments
     for element in dom.getElementsByTagName("*"):
@@ -150,9 +770,7 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return dom.toxml(encoding="UTF-8")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,296 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+import zlib
+from pathlib import Path
+from unittest import mock
+from xml.parsers.expat import ExpatError
+
+from archive import compress_data, copyable_members
+from pack import (
+    _condense_xml_lxml,
+    _condense_xml_minidom,
+    condense_xml_bytes,
+    glob_entries,
+    pack_batch,
+    pack_document,
+    read_manifest,
+    repack_document,
+)
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCondenseXml(unittest.TestCase):
+    def assertSameAsMinidom(self, xml):
+        """The lxml path must produce exactly the bytes of the minidom path."""
+        data = xml.encode("utf-8")
+        condensed = _condense_xml_lxml(data)
+        self.assertIsNotNone(condensed)
+        self.assertEqual(condensed, _condense_xml_minidom(data))
+
+    def test_pretty_printed_document(self):
+        """Indentation between elements is removed, text in w:t is kept"""
+        self.assertSameAsMinidom(
+            '<?xml version="1.0" encoding="ascii" standalone="yes"?>\n'
+            f"<w:document {W}>\n  <w:body>\n    <w:p>\n      <w:r>\n"
+            '        <w:t xml:space="preserve">  </w:t>\n'
+            "      </w:r>\n    </w:p>\n  </w:body>\n</w:document>\n"
+        )
+
+    def test_unprefixed_t_is_condensed(self):
+        """Only prefixed *:t elements keep whitespace-only text"""
+        self.assertSameAsMinidom(
+            '<sst xmlns="urn:x"><si><t xml:space="preserve"> </t></si></sst>'
+        )
+
+    def test_comments_removed_and_surrounding_text_kept(self):
+        """Comments go; the text on either side stays, whitespace-only runs go"""
+        self.assertSameAsMinidom(
+            f"<w:p {W}>a<!--x-->b <!--y-->  <w:r/><!--z--> c<w:t> <!--k--> </w:t></w:p>"
+        )
+
+    def test_top_level_comments_kept(self):
+        self.assertSameAsMinidom("<!--before--><root> <a/> </root><!--after-->")
+
+    def test_quotes_and_escapes(self):
+        """Quotes in text are escaped as minidom does, not in attributes or comments"""
+        self.assertSameAsMinidom(
+            f'<w:p {W} a=\'x"&gt;&lt;&amp;\'><w:t>say "hi" &amp; &lt;go&gt;</w:t>'
+            '<w:t><!--"q" > r--></w:t></w:p>'
+        )
+
+    def test_non_ascii_and_unicode_whitespace(self):
+        """Non-breaking spaces count as whitespace, like str.strip()"""
+        self.assertSameAsMinidom(
+            f"<w:p {W}>\u00a0<w:r><w:t>caf\u00e9 \u2603</w:t></w:r>\u2003</w:p>"
+        )
+
+    def test_namespace_declarations_and_attribute_order(self):
+        self.assertSameAsMinidom(
+            '<a:r xmlns:a="urn:a" x="1" xmlns:b="urn:b" b:y="2" xmlns="urn:d"><c/></a:r>'
+        )
+
+    def test_fallback_constructs(self):
+        """Constructs written differently by lxml fall back to minidom"""
+        for xml in (
+            "<r><![CDATA[ x ]]></r>",
+            "<r><?pi?></r>",
+            '<r a="x&#9;y"/>',
+            "<r>a&#13;b</r>",
+        ):
+            data = xml.encode("utf-8")
+            self.assertIsNone(_condense_xml_lxml(data))
+            self.assertEqual(condense_xml_bytes(data), _condense_xml_minidom(data))
+
+    def test_malformed_xml_raises(self):
+        with self.assertRaises(ExpatError):
+            condense_xml_bytes(b"<r><a></r>")
+
+
+class TestRepackDocument(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.unpacked = Path(self.temp_dir.name) / "unpacked"
+        for name, content in {
+            "[Content_Types].xml": "<Types>\n  <Default/>\n</Types>",
+            "word/document.xml": f"<w:document {W}>\n  <w:body/>\n</w:document>",
+            "word/styles.xml": "<styles>\n  <style/>\n</styles>",
+            "word/media/image1.png": "not really a png",
+        }.items():
+            path = self.unpacked / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        self.original = Path(self.temp_dir.name) / "original.docx"
+        pack_document(self.unpacked, self.original)
+
+    def test_matches_full_pack(self):
+        """Edited, added and deleted parts give the same members as pack_document"""
+        (self.unpacked / "word/document.xml").write_text(
+            f"<w:document {W}>\n  <w:body><w:p/></w:body>\n</w:document>"
+        )
+        (self.unpacked / "word/comments.xml").write_text("<comments>\n</comments>")
+        (self.unpacked / "word/media/image1.png").unlink()
+
+        repacked = Path(self.temp_dir.name) / "repacked.docx"
+        packed = Path(self.temp_dir.name) / "packed.docx"
+        repack_document(self.original, self.unpacked, repacked, ["word/document.xml"])
+        pack_document(self.unpacked, packed)
+
+        with zipfile.ZipFile(repacked) as new, zipfile.ZipFile(packed) as full:
+            self.assertIsNone(new.testzip())
+            self.assertEqual(sorted(new.namelist()), sorted(full.namelist()))
+            for name in full.namelist():
+                self.assertEqual(new.read(name), full.read(name), name)
+
+    def test_unlisted_parts_are_copied(self):
+        """Parts not listed as modified are never read from the directory"""
+        (self.unpacked / "word/styles.xml").write_text("<changed/>")
+
+        repacked = Path(self.temp_dir.name) / "repacked.docx"
+        repack_document(self.original, self.unpacked, repacked, [])
+
+        with zipfile.ZipFile(repacked) as new, zipfile.ZipFile(self.original) as old:
+            self.assertEqual(new.namelist(), old.namelist())
+            for info in old.infolist():
+                self.assertEqual(new.getinfo(info.filename).CRC, info.CRC)
+
+    def test_same_crc_is_not_same_content(self):
+        """A member is only reused raw if its bytes are the same"""
+        source_info = copyable_members(self.original)["word/styles.xml"]
+        with zipfile.ZipFile(self.original) as zf:
+            data = zf.read("word/styles.xml")
+        _, compressed = compress_data(
+            zipfile.ZipInfo("word/styles.xml"), data, None, source_info, self.original
+        )
+        self.assertIsNone(compressed)
+
+        # Different content claiming the same CRC and size
+        changed = data.replace(b"style", b"STYLE")
+        source_info.CRC = zlib.crc32(changed)
+        _, compressed = compress_data(
+            zipfile.ZipInfo("word/styles.xml"),
+            changed,
+            None,
+            source_info,
+            self.original,
+        )
+        self.assertEqual(zlib.decompress(compressed, -15), changed)
+
+    def test_without_raw_writes(self):
+        """Members are still written if ZipFile internals are not available"""
+        expected = Path(self.temp_dir.name) / "expected.docx"
+        output = Path(self.temp_dir.name) / "output.docx"
+        pack_document(self.unpacked, expected, original_file=self.original)
+        with mock.patch("archive._supports_raw_writes", return_value=False):
+            pack_document(self.unpacked, output, original_file=self.original)
+
+        with zipfile.ZipFile(output) as new, zipfile.ZipFile(expected) as old:
+            self.assertIsNone(new.testzip())
+            self.assertEqual(new.namelist(), old.namelist())
+            for name in old.namelist():
+                self.assertEqual(new.read(name), old.read(name), name)
+
+    def test_malformed_part_writes_nothing(self):
+        """A part that fails to condense leaves no partial output behind"""
+        (self.unpacked / "word/styles.xml").write_text("<styles>")
+        output = Path(self.temp_dir.name) / "output.docx"
+        with self.assertRaises(ExpatError):
+            pack_document(self.unpacked, output)
+        self.assertFalse(output.exists())
+
+        # An existing output is kept as it was
+        output.write_bytes(b"previous")
+        with self.assertRaises(ExpatError):
+            pack_document(self.unpacked, output, workers=2)
+        with self.assertRaises(ExpatError):
+            repack_document(self.original, self.unpacked, output, ["word/styles.xml"])
+
+        # As is one when writing the new file fails
+        (self.unpacked / "word/styles.xml").write_text("<styles/>")
+        with mock.patch(
+            "pack.write_compressed_member", side_effect=RuntimeError("disk full")
+        ):
+            with self.assertRaises(RuntimeError):
+                pack_document(self.unpacked, output)
+            with self.assertRaises(RuntimeError):
+                repack_document(
+                    self.original, self.unpacked, output, ["word/styles.xml"]
+                )
+        self.assertEqual(output.read_bytes(), b"previous")
+        self.assertEqual(
+            sorted(path.name for path in output.parent.iterdir()),
+            ["original.docx", "output.docx", "unpacked"],
+        )
+
+    def test_deterministic(self):
+        """Packing the same contents again gives the same bytes"""
+        first = Path(self.temp_dir.name) / "first.docx"
+        second = Path(self.temp_dir.name) / "second.docx"
+        pack_document(self.unpacked, first, deterministic=True)
+        for path in self.unpacked.rglob("*"):
+            os.utime(path, (1e9, 1e9))
+        pack_document(self.unpacked, second, deterministic=True, workers=2)
+
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+        with zipfile.ZipFile(first) as zf:
+            self.assertEqual(
+                zf.namelist(),
+                [
+                    "[Content_Types].xml",
+                    "word/document.xml",
+                    "word/media/image1.png",
+                    "word/styles.xml",
+                ],
+            )
+            self.assertEqual(
+                {info.date_time for info in zf.infolist()}, {(1980, 1, 1, 0, 0, 0)}
+            )
+
+
+class TestPackBatch(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        for name in ("report", "notes"):
+            document = self.root / "unpacked" / name / "word" / "document.xml"
+            document.parent.mkdir(parents=True)
+            document.write_text(f"<w:document {W}>\n  <w:body/>\n</w:document>")
+        (self.root / "unpacked" / "broken" / "word").mkdir(parents=True)
+        (self.root / "unpacked" / "broken" / "word" / "document.xml").write_text("<a>")
+
+    def test_glob_batch(self):
+        entries = glob_entries(str(self.root / "unpacked" / "*"), self.root / "out")
+        self.assertEqual(
+            [Path(entry["output"]).name for entry in entries],
+            ["broken.docx", "notes.docx", "report.docx"],
+        )
+
+        report = io.StringIO()
+        results = pack_batch(entries, report, validate=False)
+
+        lines = [json.loads(line) for line in report.getvalue().splitlines()]
+        self.assertEqual(lines, results)
+        self.assertEqual(
+            [result["status"] for result in results], ["error", "ok", "ok"]
+        )
+        self.assertIn("error", results[0])
+        self.assertFalse((self.root / "out" / "broken.docx").exists())
+        self.assertTrue((self.root / "out" / "report.docx").exists())
+
+    def test_manifest(self):
+        manifest = self.root / "manifest.jsonl"
+        manifest.write_text(
+            '{"input": "unpacked/report", "output": "out/a.docx"}\n'
+            "\n"
+            '{"input": "unpacked/notes", "output": "out/b.docx", "original": "b.docx"}\n'
+        )
+        self.assertEqual(
+            read_manifest(manifest),
+            [
+                {
+                    "input": str(self.root / "unpacked/report"),
+                    "output": str(self.root / "out/a.docx"),
+                    "original": None,
+                },
+                {
+                    "input": str(self.root / "unpacked/notes"),
+                    "output": str(self.root / "out/b.docx"),
+                    "original": str(self.root / "b.docx"),
+                },
+            ],
+        )
+
+        manifest.write_text('{"input": "unpacked/report"}\n')
+        with self.assertRaises(ValueError):
+            read_manifest(manifest)
+
+
+if __name__ == "__main__":
+    unittest.main()
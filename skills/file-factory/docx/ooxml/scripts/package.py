@@ -0,0 +1,332 @@
+"""
+Office package (.docx, .pptx, .xlsx) read lazily from its zip file.
+
+Example usage:
+    from ooxml.scripts.package import OOXMLPackage
+
+    with OOXMLPackage("deck.pptx") as package:
+        # Parsed lxml tree, written back on save
+        slide = package.get_tree("ppt/slides/slide3.xml")
+
+        # Pretty-printed copy on disk, for tools that edit files
+        path = package.materialize("ppt/slides/slide4.xml")
+
+        package.save("edited.pptx")
+"""
+
+import hashlib
+import re
+import shutil
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+try:
+    from .archive import (
+        canonical_order,
+        compress_data,
+        copy_zipinfo,
+        copyable_members,
+        make_deterministic,
+        member_path,
+        read_raw_member,
+        replace_on_success,
+        write_compressed_member,
+    )
+    from .pack import condense_xml_bytes
+    from .unpack import pretty_print_xml
+except ImportError:  # Imported from the scripts directory
+    from archive import (
+        canonical_order,
+        compress_data,
+        copy_zipinfo,
+        copyable_members,
+        make_deterministic,
+        member_path,
+        read_raw_member,
+        replace_on_success,
+        write_compressed_member,
+    )
+    from pack import condense_xml_bytes
+    from unpack import pretty_print_xml
+
+
+# XML declaration (with any byte order mark and the whitespace after it) at
+# the start of a part, kept when the part's tree is serialized again
+XML_DECLARATION_PATTERN = re.compile(rb"(?:\xef\xbb\xbf)?<\?xml\s[^>]*\?>\s*")
+
+# Declaration given to trees of parts that had none, as Office writes it
+DEFAULT_XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+
+
+class OOXMLPackage:
+    """An Office file whose parts are only read when they are asked for.
+
+    Opening a package reads the zip's central directory and nothing else.
+    A part is decompressed when it is read, parsed when its tree is asked
+    for, and written to a scratch directory only when it is materialized.
+    Changed parts are kept in memory (or in the scratch directory), never
+    in the original file.
+
+    save() writes a new file in which every part that was not changed is
+    copied from the original with its compressed data as is, so saving
+    after editing one slide of a large deck only compresses that slide.
+
+    Each part is held in one form at a time. Asking for another form (e.g.
+    get_tree() after materialize()) converts the part's current content, so
+    edits made in the previous form are kept. A part whose tree serializes
+    the same as when it was parsed is not counted as changed, and keeps its
+    original bytes.
+    """
+
+    def __init__(self, path, scratch_dir=None):
+        """
+        Args:
+            path: Path to the .docx, .pptx or .xlsx file
+            scratch_dir: Optional directory for materialized parts (default: a
+                temporary directory, removed by close())
+        """
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._infos = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+
+        self._scratch_dir = Path(scratch_dir) if scratch_dir else None
+        self._own_scratch_dir = scratch_dir is None
+
+        # Part name -> ("bytes", data), ("tree", tree, declaration, source,
+        # digest), ("file", path, digest) or None for a deleted part; parts
+        # not in here are unchanged. A tree's source is the data it was parsed
+        # from if that was already changed (None otherwise) and its digest is
+        # that of the tree serialized right after parsing.
+        self._parts = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the original file and remove the temporary scratch directory."""
+        self._zip.close()
+        if self._own_scratch_dir and self._scratch_dir is not None:
+            shutil.rmtree(self._scratch_dir, ignore_errors=True)
+            self._scratch_dir = None
+
+    @property
+    def part_names(self):
+        """Names of the parts in the package, in the order they will be saved."""
+        names = [name for name in self._infos if self._parts.get(name, ()) is not None]
+        names.extend(
+            name
+            for name, state in self._parts.items()
+            if name not in self._infos and state is not None
+        )
+        return names
+
+    def __contains__(self, name):
+        if name in self._parts:
+            return self._parts[name] is not None
+        return name in self._infos
+
+    def read_bytes(self, name):
+        """Return the current content of a part.
+
+        Raises:
+            KeyError: If there is no such part
+        """
+        state = self._state(name)
+        if state is None:
+            return self._zip.read(name)
+
+        match state[0]:
+            case "bytes":
+                return state[1]
+            case "tree":
+                data = _serialize_tree(state[1], state[2])
+                if hashlib.sha256(data).digest() != state[4]:
+                    return data
+                # Unedited trees keep the bytes they were parsed from
+                return self._zip.read(name) if state[3] is None else state[3]
+            case "file":
+                data = state[1].read_bytes()
+                if name.endswith((".xml", ".rels")):
+                    data = condense_xml_bytes(data)
+                return data
+
+    def write_bytes(self, name, data):
+        """Replace the content of a part, or add a new one.
+
+        New parts also need a content type in [Content_Types].xml and
+        usually a relationship; those are not added automatically.
+        """
+        self._forget(name)
+        self._parts[name] = ("bytes", bytes(data))
+
+    def delete(self, name):
+        """Remove a part from the package.
+
+        Raises:
+            KeyError: If there is no such part
+        """
+        self._state(name)
+        self._forget(name)
+        self._parts[name] = None
+
+    def get_tree(self, name):
+        """Return the parsed lxml tree of an XML part.
+
+        The tree is parsed once and changes made to it are saved.
+
+        Raises:
+            KeyError: If there is no such part
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        state = self._state(name)
+        if state is not None and state[0] == "tree":
+            return state[1]
+
+        modified = self.is_modified(name)
+        data = self.read_bytes(name)
+        parser = lxml.etree.XMLParser(huge_tree=True, resolve_entities=False)
+        tree = lxml.etree.ElementTree(lxml.etree.fromstring(data, parser=parser))
+
+        match = XML_DECLARATION_PATTERN.match(data)
+        declaration = match.group() if match else DEFAULT_XML_DECLARATION
+        digest = hashlib.sha256(_serialize_tree(tree, declaration)).digest()
+        self._forget(name)
+        self._parts[name] = (
+            "tree",
+            tree,
+            declaration,
+            data if modified else None,
+            digest,
+        )
+        return tree
+
+    def materialize(self, name):
+        """Write a part to the scratch directory and return its path.
+
+        XML parts are pretty-printed as unpack.py does, so line numbers match
+        an unpacked directory. Changes made to the file are picked up by
+        read_bytes() and save(); an XML file is condensed again as pack.py
+        does.
+
+        Raises:
+            KeyError: If there is no such part
+        """
+        state = self._state(name)
+        if state is not None and state[0] == "file":
+            return state[1]
+
+        data = self.read_bytes(name)
+        if name.endswith((".xml", ".rels")):
+            data = pretty_print_xml(data)
+
+        if self._scratch_dir is None:
+            self._scratch_dir = Path(tempfile.mkdtemp(prefix="ooxml_"))
+        path = member_path(self._scratch_dir, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+        self._forget(name)
+        self._parts[name] = ("file", path, hashlib.sha256(data).digest())
+        return path
+
+    def is_modified(self, name):
+        """Return True if a part was changed, added or deleted."""
+        state = self._parts.get(name, ())
+        if state == ():
+            return False
+        if state is None or state[0] == "bytes":
+            return True
+        if state[0] == "tree":
+            if state[3] is not None:
+                return True
+            # A tree counts as changed once its serialization differs
+            data = _serialize_tree(state[1], state[2])
+            return hashlib.sha256(data).digest() != state[4]
+        # A materialized part counts as changed once its file is edited
+        return hashlib.sha256(state[1].read_bytes()).digest() != state[2]
+
+    def save(self, output_file, compresslevel=None, deterministic=False):
+        """Write the package, with all changes, to a new Office file.
+
+        Unchanged parts are copied from the original file without being
+        decompressed. Changed parts are compressed again, and copied as
+        well if their content turns out to be the same as the original's.
+        If saving fails, output_file is left untouched.
+
+        Args:
+            output_file: Path to the Office file to write (not the original)
+            compresslevel: Deflate level (0-9) for changed parts (default:
+                zlib's default level)
+            deterministic: If True, writes parts in canonical order with a
+                fixed timestamp and permissions, as pack.py does
+        """
+        output_file = Path(output_file)
+        if output_file.resolve() == self.path.resolve():
+            raise ValueError(f"{output_file} must not be the original file")
+
+        source_infos = copyable_members(self.path)
+        date_time = time.localtime(time.time())[:6]
+
+        with (
+            replace_on_success(output_file) as temp_file,
+            zipfile.ZipFile(temp_file, "w") as zf,
+            open(self.path, "rb") as source,
+        ):
+            names = self.part_names
+            if deterministic:
+                names.sort(key=canonical_order)
+            for name in names:
+                source_info = source_infos.get(name)
+                compressed = None
+                if self.is_modified(name) or source_info is None:
+                    zinfo, compressed = compress_data(
+                        zipfile.ZipInfo(name, date_time),
+                        self.read_bytes(name),
+                        compresslevel,
+                        source_info,
+                        self.path,
+                    )
+                if compressed is None:
+                    zinfo = copy_zipinfo(source_info)
+                    compressed = read_raw_member(source, source_info)
+                if deterministic:
+                    make_deterministic(zinfo)
+                write_compressed_member(zf, zinfo, compressed)
+
+    def _state(self, name):
+        """Return the in-memory state of a part (None if it is unchanged)."""
+        if name in self._parts:
+            state = self._parts[name]
+            if state is None:
+                raise KeyError(f"Part {name} has been deleted")
+            return state
+        if name not in self._infos:
+            raise KeyError(f"There is no part named {name}")
+        return None
+
+    def _forget(self, name):
+        """Drop the current in-memory form of a part, removing its scratch file."""
+        state = self._parts.pop(name, None)
+        if state is not None and state[0] == "file":
+            state[1].unlink(missing_ok=True)
+
+
+def _serialize_tree(tree, declaration):
+    """Serialize a part's tree after its XML declaration, in its encoding."""
+    encoding = tree.docinfo.encoding or "UTF-8"
+    return declaration + lxml.etree.tostring(
+        tree, encoding=encoding, xml_declaration=False
+    )
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
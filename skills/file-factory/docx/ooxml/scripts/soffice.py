@@ -0,0 +1,438 @@
+"""
+Pool of headless LibreOffice (soffice) instances shared by document conversions.
+
+When the Python UNO bridge is importable (the uno module shipped with
+LibreOffice, e.g. the python3-uno package), every slot of the pool is a
+long-lived soffice process listening on a named pipe. Documents are loaded
+and exported over that connection, so LibreOffice only starts once per slot
+instead of once per conversion. Slots are checked before each use and
+restarted if their process died or stopped answering, and a conversion that
+runs past its timeout kills its instance, which is then restarted.
+
+Without the bridge, each conversion runs soffice --convert-to as before,
+but at most size conversions run at once and every slot after the first
+gets its own user profile, so concurrent conversions do not hand their work
+to each other's process.
+
+Example usage:
+    from soffice import SofficePool
+
+    with SofficePool(size=2) as pool:
+        pdf = pool.convert("deck.pptx", "out", "pdf")
+        html = pool.convert("report.docx", "out", "html:HTML")
+"""
+
+import atexit
+import contextlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+# Seconds a conversion may take once LibreOffice is running
+DEFAULT_TIMEOUT = 30
+
+# Seconds to wait for a listening instance to accept connections
+START_TIMEOUT = 60
+
+# PDF export filters by document service, for conversions to plain "pdf"
+PDF_FILTERS = {
+    "com.sun.star.presentation.PresentationDocument": "impress_pdf_Export",
+    "com.sun.star.sheet.SpreadsheetDocument": "calc_pdf_Export",
+    "com.sun.star.drawing.DrawingDocument": "draw_pdf_Export",
+    "com.sun.star.text.TextDocument": "writer_pdf_Export",
+}
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+class SofficeError(RuntimeError):
+    """A conversion failed."""
+
+
+class SofficeTimeout(SofficeError):
+    """A conversion did not finish in time."""
+
+
+def get_pool():
+    """Return the pool shared by this process, creating it on first use.
+
+    The pool has a single slot and is closed when the interpreter exits.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SofficePool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+class SofficePool:
+    """A fixed number of soffice slots, used by one conversion at a time each.
+
+    Slots are started on first use. The pool can be shared between threads;
+    callers wait for a free slot once size conversions are running.
+    """
+
+    def __init__(
+        self, size=1, timeout=DEFAULT_TIMEOUT, soffice="soffice", use_uno=None
+    ):
+        """
+        Args:
+            size: Maximum number of concurrent conversions (0 = number of CPUs)
+            timeout: Seconds a conversion may take (not counting startup of a
+                listening instance)
+            soffice: Name or path of the soffice executable
+            use_uno: Use listening instances over the UNO bridge; by default
+                they are used whenever the bridge is importable
+
+        Raises:
+            ValueError: If use_uno is True but the bridge is not importable
+        """
+        if use_uno and uno is None:
+            raise ValueError("The LibreOffice UNO bridge (uno module) is not available")
+
+        self.size = size if size else os.cpu_count() or 1
+        self.timeout = timeout
+        self.soffice = soffice
+        self.uses_uno = uno is not None if use_uno is None else use_uno
+
+        self._profiles_dir = None
+        self._slots = []
+        self._idle = []
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def convert(self, input_path, output_dir, convert_to, timeout=None):
+        """Convert a document, like soffice --convert-to.
+
+        Args:
+            input_path: Document to convert
+            output_dir: Directory for the converted file (created if missing)
+            convert_to: Target as accepted by --convert-to: an extension,
+                optionally followed by an export filter (e.g. "pdf",
+                "html:HTML"). Only "pdf" may be given without a filter when
+                listening instances are used.
+            timeout: Seconds the conversion may take (default: the pool's)
+
+        Returns:
+            Path: The converted file, named after the input with the new extension
+
+        Raises:
+            FileNotFoundError: If soffice is not installed
+            SofficeTimeout: If the conversion did not finish in time
+            SofficeError: If the conversion failed
+        """
+        input_path = Path(input_path).resolve()
+        output_dir = Path(output_dir).resolve()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with self._slot() as slot:
+            return slot.convert(
+                input_path, output_dir, convert_to, timeout or self.timeout
+            )
+
+    def recalculate(self, path, timeout=None):
+        """Recalculate every formula of a spreadsheet and save it in place.
+
+        Only available with listening instances (uses_uno); without the UNO
+        bridge, LibreOffice has no command line option for this.
+
+        Raises:
+            FileNotFoundError: If soffice is not installed
+            SofficeTimeout: If the recalculation did not finish in time
+            SofficeError: If the recalculation failed
+        """
+        if not self.uses_uno:
+            raise SofficeError("Recalculating needs the LibreOffice UNO bridge")
+        with self._slot() as slot:
+            slot.recalculate(Path(path).resolve(), timeout or self.timeout)
+
+    def close(self):
+        """Stop all instances and remove the profiles created for them."""
+        with self._condition:
+            self._closed = True
+            slots, self._slots, self._idle = self._slots, [], []
+            self._condition.notify_all()
+        for slot in slots:
+            slot.stop()
+        if self._profiles_dir is not None:
+            shutil.rmtree(self._profiles_dir, ignore_errors=True)
+            self._profiles_dir = None
+
+    @contextlib.contextmanager
+    def _slot(self):
+        """Check out a free slot, starting a new one if the pool is not full."""
+        with self._condition:
+            while not self._idle and len(self._slots) >= self.size:
+                if self._closed:
+                    break
+                self._condition.wait()
+            if self._closed:
+                raise SofficeError("The soffice pool has been closed")
+
+            if self._idle:
+                slot = self._idle.pop()
+            else:
+                slot = self._new_slot(len(self._slots))
+                self._slots.append(slot)
+
+        try:
+            yield slot
+        finally:
+            with self._condition:
+                if not self._closed:
+                    self._idle.append(slot)
+                    self._condition.notify()
+
+    def _new_slot(self, index):
+        """Create the slot with the given index (not started yet)."""
+        if self.uses_uno or index > 0:
+            # Every listening instance, and every concurrent command after the
+            # first, needs a user profile of its own
+            if self._profiles_dir is None:
+                self._profiles_dir = Path(tempfile.mkdtemp(prefix="soffice_pool_"))
+            profile = self._profiles_dir / f"profile{index}"
+        else:
+            # A single command slot keeps using the user's profile, as before
+            profile = None
+
+        if self.uses_uno:
+            return _ListeningSlot(self.soffice, profile)
+        return _CommandSlot(self.soffice, profile)
+
+
+class _CommandSlot:
+    """Runs one soffice --convert-to process per conversion."""
+
+    def __init__(self, soffice, profile):
+        self.soffice = soffice
+        self.profile = profile
+
+    def convert(self, input_path, output_dir, convert_to, timeout):
+        command = [self.soffice, "--headless"]
+        if self.profile is not None:
+            command.append(f"-env:UserInstallation={self.profile.as_uri()}")
+        command += ["--convert-to", convert_to, "--outdir", str(output_dir)]
+        command.append(str(input_path))
+
+        try:
+            result = subprocess.run(
+                command, capture_output=True, timeout=timeout, text=True
+            )
+        except subprocess.TimeoutExpired:
+            raise SofficeTimeout(f"Conversion of {input_path.name} timed out")
+
+        output_file = _output_path(input_path, output_dir, convert_to)
+        if not output_file.exists():
+            raise SofficeError(result.stderr.strip() or "Conversion failed")
+        return output_file
+
+    def stop(self):
+        pass
+
+
+class _ListeningSlot:
+    """A long-lived soffice process driven over the UNO bridge."""
+
+    def __init__(self, soffice, profile):
+        self.soffice = soffice
+        self.profile = profile
+        self.pipe_name = f"soffice_pool_{uuid.uuid4().hex}"
+        self._process = None
+        self._desktop = None
+        self._timed_out = False
+
+    def convert(self, input_path, output_dir, convert_to, timeout):
+        extension, _, filter_name = convert_to.partition(":")
+        filter_name = filter_name.split(":")[0]
+        if not filter_name and extension != "pdf":
+            raise ValueError(f"An export filter is needed to convert to {extension}")
+        output_file = _output_path(input_path, output_dir, convert_to)
+
+        def export(document):
+            name = filter_name
+            if not name:
+                name = next(
+                    (
+                        pdf_filter
+                        for service, pdf_filter in PDF_FILTERS.items()
+                        if document.supportsService(service)
+                    ),
+                    "writer_pdf_Export",
+                )
+            document.storeToURL(
+                uno.systemPathToFileUrl(str(output_file)),
+                _properties(FilterName=name, Overwrite=True),
+            )
+
+        self._run(input_path, export, timeout, read_only=True)
+        if not output_file.exists():
+            raise SofficeError(f"Conversion of {input_path.name} failed")
+        return output_file
+
+    def recalculate(self, path, timeout):
+        def recalculate(document):
+            document.calculateAll()
+            document.store()
+
+        self._run(path, recalculate, timeout, read_only=False)
+
+    def stop(self):
+        """Terminate the soffice process."""
+        self._desktop = None
+        if self._process is not None:
+            with contextlib.suppress(Exception):
+                self._process.terminate()
+                self._process.wait(timeout=10)
+            if self._process.poll() is None:
+                self._process.kill()
+                self._process.wait()
+            self._process = None
+
+    def _run(self, path, action, timeout, read_only):
+        """Load a document, apply action to it and close it, within timeout."""
+        self._ensure_running(timeout)
+
+        # A conversion that hangs is ended by killing the process; the UNO
+        # call then fails and the instance is restarted on next use
+        self._timed_out = False
+        watchdog = threading.Timer(timeout, self._kill)
+        watchdog.start()
+        document = None
+        try:
+            document = self._desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(path)),
+                "_blank",
+                0,
+                _properties(Hidden=True, ReadOnly=read_only),
+            )
+            if document is None:
+                raise SofficeError(f"LibreOffice could not open {path.name}")
+            action(document)
+        except SofficeError:
+            raise
+        except Exception as e:
+            if self._timed_out:
+                raise SofficeTimeout(f"Processing of {path.name} timed out")
+            raise SofficeError(f"Processing of {path.name} failed: {e}")
+        finally:
+            watchdog.cancel()
+            watchdog.join()
+            if document is not None and not self._timed_out:
+                with contextlib.suppress(Exception):
+                    document.close(True)
+
+    def _kill(self):
+        self._timed_out = True
+        if self._process is not None:
+            with contextlib.suppress(Exception):
+                self._process.kill()
+
+    def _ensure_running(self, timeout):
+        """Start the instance, or restart it if it crashed or stopped answering.
+
+        The health check gets the conversion's timeout; a process that does
+        not answer within it is killed and restarted.
+        """
+        if self._process is not None and self._process.poll() is None:
+            self._timed_out = False
+            watchdog = threading.Timer(timeout, self._kill)
+            watchdog.start()
+            healthy = False
+            try:
+                # Health check: any call that needs the process to answer
+                self._desktop.getComponents()
+                healthy = True
+            except Exception:
+                pass
+            finally:
+                watchdog.cancel()
+                watchdog.join()
+            if healthy and not self._timed_out:
+                return
+        self.stop()
+        self._start()
+
+    def _start(self):
+        """Start soffice listening on the slot's pipe and connect to it."""
+        if shutil.which(self.soffice) is None:
+            raise FileNotFoundError(f"{self.soffice} not found")
+
+        self._process = subprocess.Popen(
+            [
+                self.soffice,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nodefault",
+                "--norestore",
+                "--nolockcheck",
+                f"-env:UserInstallation={self.profile.as_uri()}",
+                f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"
+                )
+                break
+            except Exception:
+                # Not accepting connections yet
+                if self._process.poll() is not None:
+                    self._process = None
+                    raise SofficeError("soffice exited during startup")
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise SofficeTimeout("soffice did not start in time")
+                time.sleep(0.1)
+
+        self._desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+
+def _output_path(input_path, output_dir, convert_to):
+    """Return the file soffice writes for a conversion."""
+    extension = convert_to.split(":")[0]
+    return output_dir / f"{input_path.stem}.{extension}"
+
+
+def _properties(**values):
+    """Return a tuple of UNO PropertyValues."""
+    properties = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -1,29 +1,233 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""
+Unpack and format XML contents of Office files (.docx, .pptx, .xlsx).
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--workers N]
+        [--max-format-size BYTES]
+"""
+
+import argparse
+import os
 import random
-import sys
+import shutil
 import defusedxml.minidom
+import lxml.etree
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
-
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
-
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
-    content = xml_file.read_text(encoding="utf-8")
-    dom = defusedxml.minidom.parseString(content)
-    xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
-
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+try:
+    from .archive import member_path
+    from .markup import escape_text_quotes
+except ImportError:  # Run from the scripts directory
+    from archive import member_path
+    from markup import escape_text_quotes
+
+# Declaration written by minidom's toprettyxml(encoding="ascii")
+XML_DECLARATION = '<?xml version="1.0" encoding="ascii"?>'
+
+# Zip file opened once per worker process by _init_worker
+_worker_zip = None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Unpack an Office file and pretty-print its XML parts"
+    )
+    parser.add_argument("office_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes formatting XML parts (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--max-format-size",
+        type=int,
+        metavar="BYTES",
+        help="Extract XML parts larger than this as is, without pretty-printing",
+    )
+    args = parser.parse_args()
+
+    unpack_document(
+        args.office_file,
+        args.output_dir,
+        workers=args.workers,
+        max_format_size=args.max_format_size,
+    )
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.office_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, workers=1, max_format_size=None):
+    """Extract an Office file into a directory and pretty-print its XML parts.
+
+    Members are streamed out of the zip one at a time, so memory use is
+    bounded by the largest XML part rather than the size of the package.
+
+    Args:
+        input_file: Path to the .docx, .pptx or .xlsx file
+        output_dir: Directory to extract into (created if missing)
+        workers: Number of worker processes that extract and format parts
+            (1 unpacks in this process, 0 uses every CPU)
+        max_format_size: Optional size in bytes; XML parts larger than this
+            are extracted unformatted
+
+    Raises:
+        zipfile.BadZipFile: If input_file is not a zip file
+        xml.parsers.expat.ExpatError: If an XML part is not well-formed
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    workers = workers if workers else os.cpu_count() or 1
+
+    with zipfile.ZipFile(input_file) as zf:
+        members = zf.infolist()
+        if workers == 1 or len(members) < 2:
+            for info in members:
+                _unpack_member(zf, info, output_path, max_format_size)
+            return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(input_file,)
+    ) as pool:
+        # Consume the results so errors in workers are raised here
+        for _ in pool.map(
+            _unpack_worker_member,
+            members,
+            repeat(output_path),
+            repeat(max_format_size),
+            chunksize=max(1, len(members) // (workers * 4)),
+        ):
+            pass
+
+
+def _init_worker(input_file):
+    """Open the package once in each worker process."""
+    global _worker_zip
+    _worker_zip = zipfile.ZipFile(input_file)
+
+
+def _unpack_worker_member(info, output_path, max_format_size):
+    _unpack_member(_worker_zip, info, output_path, max_format_size)
+
+
+def _unpack_member(zf, info, output_path, max_format_size=None):
+    """Extract one member, pretty-printing it if it is an XML part.
+
+    Directories are created with exist_ok rather than by ZipFile.extract(),
+    which fails when two workers create the same directory at once.
+    """
+    target = member_path(output_path, info.filename)
+    if info.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    if info.filename.endswith((".xml", ".rels")) and (
+        max_format_size is None or info.file_size <= max_format_size
+    ):
+        target.write_bytes(pretty_print_xml(zf.read(info)))
+        return
+
+    with zf.open(info) as source, open(target, "wb") as destination:
+        shutil.copyfileobj(source, destination)
+
+
+def pretty_print_xml(data):
+    """Return an XML part indented by two spaces, as minidom's toprettyxml writes it.
+
+    Parts are formatted with lxml; the output is byte-identical to
+    toprettyxml(indent="  ", encoding="ascii"), which is still used for the
+    constructs lxml writes differently (CDATA sections, processing
+    instructions, DTDs and characters it emits as character references).
+    """
+    formatted = _pretty_print_lxml(data)
+    if formatted is None:
+        formatted = _pretty_print_minidom(data)
+    return formatted
+
+
+def _pretty_print_lxml(data):
+    """Pretty-print XML with lxml, or return None if minidom must be used instead."""
+    declaration_count = 1 if data.lstrip(b"\xef\xbb\xbf").startswith(b"<?xml") else 0
+    if (
+        b"<![CDATA[" in data
+        or b"<!DOCTYPE" in data
+        or data.count(b"<?") > declaration_count
+    ):
+        return None
+
+    # Decode as UTF-8 whatever the declaration says, like the minidom path
+    parser = lxml.etree.XMLParser(
+        encoding="utf-8", huge_tree=True, resolve_entities=False
+    )
+    try:
+        root = lxml.etree.fromstring(data, parser=parser)
+    except lxml.etree.XMLSyntaxError:
+        # Let minidom report the error as before
+        return None
+
+    _indent(root)
+    lines = [XML_DECLARATION]
+    lines.extend(
+        lxml.etree.tostring(node, encoding="unicode")
+        for node in reversed(list(root.itersiblings(preceding=True)))
+    )
+    lines.append(lxml.etree.tostring(root, encoding="unicode", with_tail=False))
+    lines.extend(
+        lxml.etree.tostring(node, encoding="unicode") for node in root.itersiblings()
+    )
+    formatted = "\n".join(lines) + "\n"
+
+    # minidom writes tabs, newlines and carriage returns unescaped
+    if "&#" in formatted:
+        return None
+    return escape_text_quotes(formatted).encode("ascii", "xmlcharrefreplace")
+
+
+def _indent(root):
+    """Indent an element tree in place the way toprettyxml lays it out.
+
+    Elements with children get each child on its own line, one level deeper.
+    Like minidom, text next to child elements (including whitespace that
+    already indents them) is kept and written on a line of its own; the
+    text of elements without children is left inline as is.
+    """
+    stack = [(root, "")]
+    while stack:
+        element, indent = stack.pop()
+        if not len(element):
+            continue
+
+        child_indent = indent + "  "
+        element.text = _indented_text(element.text, child_indent, child_indent)
+        last = element[-1]
+        for child in element:
+            next_indent = indent if child is last else child_indent
+            child.tail = _indented_text(child.tail, child_indent, next_indent)
+            stack.append((child, child_indent))
+
+
+def _indented_text(text, indent, next_indent):
+    """Return text laid out on its own line, followed by the next node's indent."""
+    if text:
+        return f"\n{indent}{text}\n{next_indent}"
+    return f"\n{next_indent}"
+
+
+def _pretty_print_minidom(data):
+    """Pretty-print XML with minidom."""
+    dom = defusedxml.minidom.parseString(data.decode("utf-8"))
+    return dom.toprettyxml(indent="  ", encoding="ascii")
+
+
+if __name__ == "__main__":
+    main()
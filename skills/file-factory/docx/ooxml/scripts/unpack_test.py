@@ -0,0 +1,133 @@
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from xml.parsers.expat import ExpatError
+
+from unpack import (
+    _pretty_print_lxml,
+    _pretty_print_minidom,
+    pretty_print_xml,
+    unpack_document,
+)
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPrettyPrintXml(unittest.TestCase):
+    def assertSameAsMinidom(self, xml):
+        """The lxml path must produce exactly the bytes of the minidom path."""
+        data = xml.encode("utf-8")
+        formatted = _pretty_print_lxml(data)
+        self.assertIsNotNone(formatted)
+        self.assertEqual(formatted, _pretty_print_minidom(data))
+
+    def test_condensed_document(self):
+        self.assertSameAsMinidom(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<w:document {W}><w:body><w:p><w:r><w:t xml:space="preserve">  </w:t>'
+            "</w:r><w:r><w:t>x</w:t></w:r></w:p><w:sectPr/></w:body></w:document>"
+        )
+
+    def test_already_indented_document(self):
+        """Whitespace between elements gets a line of its own, as in minidom"""
+        self.assertSameAsMinidom(
+            f"<w:document {W}>\n  <w:body>\n    <w:p/>\n  </w:body>\n</w:document>\n"
+        )
+
+    def test_mixed_content(self):
+        self.assertSameAsMinidom("<a>one<b>two</b>three<c/><d>four<e/></d>five</a>")
+
+    def test_comments(self):
+        self.assertSameAsMinidom(
+            "<!--before--><a><!--first--><b/>x<!--last--></a><!--after-->"
+        )
+
+    def test_quotes_escapes_and_non_ascii(self):
+        """Quotes are escaped in text only; non-ASCII becomes character references"""
+        self.assertSameAsMinidom(
+            f'<w:p {W} a=\'x"&gt;&lt;&amp;\u00e9\'><w:t>say "hi" &amp; &lt;go&gt;'
+            'caf\u00e9 \u2603</w:t><w:t><!--"q" > r\u00e9--></w:t></w:p>'
+        )
+
+    def test_namespace_declarations_and_attribute_order(self):
+        self.assertSameAsMinidom(
+            '<a:r xmlns:a="urn:a" x="1" xmlns:b="urn:b" b:y="2" xmlns="urn:d"><c/></a:r>'
+        )
+
+    def test_fallback_constructs(self):
+        """Constructs written differently by lxml fall back to minidom"""
+        for xml in (
+            "<r><![CDATA[ x ]]></r>",
+            "<r><?pi?></r>",
+            '<r a="x&#9;y"/>',
+            "<r>a&#13;b</r>",
+        ):
+            data = xml.encode("utf-8")
+            self.assertIsNone(_pretty_print_lxml(data))
+            self.assertEqual(pretty_print_xml(data), _pretty_print_minidom(data))
+
+    def test_malformed_xml_raises(self):
+        with self.assertRaises(ExpatError):
+            pretty_print_xml(b"<r><a></r>")
+
+
+class TestUnpackDocument(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.package = Path(self.temp_dir.name) / "package.docx"
+        with zipfile.ZipFile(self.package, "w") as zf:
+            zf.writestr("[Content_Types].xml", "<Types><Default/></Types>")
+            zf.writestr("_rels/.rels", "<Relationships><Relationship/></Relationships>")
+            zf.writestr("word/document.xml", f"<w:document {W}><w:body/></w:document>")
+            zf.writestr("word/media/image1.png", b"<not><xml>")
+            zf.writestr("../outside.xml", "<r/>")
+
+    def test_unpack(self):
+        output = Path(self.temp_dir.name) / "unpacked"
+        unpack_document(self.package, output)
+
+        self.assertEqual(
+            (output / "_rels/.rels").read_bytes(),
+            _pretty_print_minidom(b"<Relationships><Relationship/></Relationships>"),
+        )
+        self.assertEqual((output / "word/media/image1.png").read_bytes(), b"<not><xml>")
+        # Members cannot be written outside the output directory
+        self.assertTrue((output / "outside.xml").exists())
+        self.assertFalse((output.parent / "outside.xml").exists())
+
+    def test_workers_share_new_directories(self):
+        """Workers extracting into the same new directories do not collide"""
+        with zipfile.ZipFile(self.package, "a") as zf:
+            for i in range(200):
+                zf.writestr(f"word/media/dir{i % 5}/image{i}.png", bytes([i]) * 100)
+            zf.writestr("word/embeddings/", b"")
+
+        output = Path(self.temp_dir.name) / "unpacked"
+        unpack_document(self.package, output, workers=4)
+
+        for i in range(200):
+            self.assertEqual(
+                (output / f"word/media/dir{i % 5}/image{i}.png").read_bytes(),
+                bytes([i]) * 100,
+            )
+        self.assertTrue((output / "word/embeddings").is_dir())
+        self.assertTrue((output / "outside.xml").exists())
+
+    def test_max_format_size(self):
+        output = Path(self.temp_dir.name) / "unpacked"
+        unpack_document(self.package, output, max_format_size=30)
+
+        self.assertEqual(
+            (output / "word/document.xml").read_text(),
+            f"<w:document {W}><w:body/></w:document>",
+        )
+        self.assertTrue(
+            (output / "[Content_Types].xml").read_text().startswith("<?xml")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
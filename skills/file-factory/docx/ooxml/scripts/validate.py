@@ -3,14 +3,20 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--workers N] [--cache-dir DIR]
+        [--streaming | --no-streaming]
 """
 
 import argparse
 import sys
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+from validation import (
+    DOCXSchemaValidator,
+    PPTXSchemaValidator,
+    RedliningValidator,
+    ValidationCache,
+)
 
 
 def main():
@@ -30,6 +36,24 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for per-part schema checks (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for persistent per-part validation results, shared across runs",
+    )
+    parser.add_argument(
+        "--streaming",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Stream parts through the per-element checks instead of keeping "
+        "their trees (default: only very large parts)",
+    )
     args = parser.parse_args()
 
     # Validate paths
@@ -53,11 +77,30 @@ def main():
             sys.exit(1)
 
     # Run validators
+    result_cache = ValidationCache(args.cache_dir) if args.cache_dir else None
     success = True
     for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+        if V is RedliningValidator:
+            validator = V(
+                unpacked_dir,
+                original_file,
+                verbose=args.verbose,
+                result_cache=result_cache,
+            )
+            if not validator.validate():
+                success = False
+            continue
+
+        with V(
+            unpacked_dir,
+            original_file,
+            verbose=args.verbose,
+            workers=args.workers,
+            result_cache=result_cache,
+            streaming=args.streaming,
+        ) as validator:
+            if not validator.validate():
+                success = False
 
     if success:
         print("All validations PASSED!")
@@ -2,11 +2,250 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
 import lxml.etree
 
+from .baseline import BaselineSession
+from .walker import PartVisitor, PartWalker
+
+# Directory holding the bundled XSD schemas
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+# Compiled XSD schemas shared by every validator in this process
+# Format: resolved schema path -> lxml.etree.XMLSchema (or the compile error)
+_compiled_schemas = {}
+
+
+def load_schema(schema_path):
+    """Return the compiled XMLSchema for an XSD file, compiling it once per process.
+
+    Schemas that fail to compile are remembered too, and the same error is
+    raised on every later call instead of recompiling.
+
+    Args:
+        schema_path: Path to the XSD file
+
+    Returns:
+        lxml.etree.XMLSchema: The compiled schema
+    """
+    key = str(Path(schema_path).resolve())
+    if key not in _compiled_schemas:
+        try:
+            with open(key, "rb") as xsd_file:
+                parser = lxml.etree.XMLParser()
+                xsd_doc = lxml.etree.parse(xsd_file, parser=parser, base_url=key)
+                _compiled_schemas[key] = lxml.etree.XMLSchema(xsd_doc)
+        except Exception as e:
+            _compiled_schemas[key] = e
+
+    schema = _compiled_schemas[key]
+    if isinstance(schema, Exception):
+        raise schema
+    return schema
+
+
+# Marks a result cache miss (None is a valid check result)
+_MISSING = object()
+
+# Validator owned by each worker process of a parallel validation run
+_worker_validator = None
+
+
+def _init_worker(validator_class, unpacked_dir, original_file, options):
+    """Create the validator used by a worker process for the rest of its life."""
+    global _worker_validator
+    validator_class.warm_schema_cache()
+    _worker_validator = validator_class(unpacked_dir, original_file, **options)
+
+
+def _run_worker_check(method_name, xml_file):
+    """Run a per-part check in a worker process and return its result."""
+    return getattr(_worker_validator, method_name)(xml_file)
+
+
+class _UniqueIdsVisitor(PartVisitor):
+    """Collects the IDs listed in UNIQUE_ID_REQUIREMENTS, outside mc:AlternateContent."""
+
+    # Comments are visited so that they fail the check as in a full-tree loop
+    COMMENTS = True
+    SKIP_ALTERNATE_CONTENT = True
+
+    def __init__(self, validator, xml_file):
+        super().__init__()
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.LOCAL_NAMES = frozenset(self.requirements)
+        self.relative_path = xml_file.relative_to(validator.unpacked_dir)
+
+        # ("error", message) and ("global", id_value, sourceline, tag) entries
+        self.entries = []
+
+        # Track IDs that must be unique within this file
+        self.file_ids = {}
+
+    def visit(self, elem, walker):
+        # Get the element name without namespace
+        tag = walker.local_name(elem.tag).lower()
+
+        # Check if this element type has ID uniqueness requirements
+        if tag not in self.requirements:
+            return
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if walker.local_name(attr).lower() == attr_name:
+                id_value = value
+                break
+
+        if id_value is None:
+            return
+
+        if scope == "global":
+            # Global uniqueness is checked across files by the caller
+            self.entries.append(("global", id_value, elem.sourceline, tag))
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.entries.append(
+                    (
+                        "error",
+                        f"  {self.relative_path}: "
+                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
+                        f"(first occurrence at line {ids[id_value]})",
+                    )
+                )
+            else:
+                ids[id_value] = elem.sourceline
+
+    def fail(self, error):
+        self.entries.append(("error", f"  {self.relative_path}: Error: {error}"))
+        super().fail(error)
+
+    def result(self):
+        return self.entries
+
+
+class _NamespacesVisitor(PartVisitor):
+    """Checks that prefixes in the root's Ignorable attributes are declared."""
+
+    def __init__(self, validator, xml_file):
+        super().__init__()
+        self.relative_path = xml_file.relative_to(validator.unpacked_dir)
+
+    def root(self, root, walker):
+        declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+        for attr_val in [v for k, v in root.attrib.items() if k.endswith("Ignorable")]:
+            undeclared = set(attr_val.split()) - declared
+            self.errors.extend(
+                f"  {self.relative_path}: "
+                f"Namespace '{ns}' in Ignorable but not declared"
+                for ns in undeclared
+            )
+
+
+class _RootNameVisitor(PartVisitor):
+    """Records the local name of the part's root element."""
+
+    def __init__(self):
+        super().__init__()
+        self.root_name = None
+
+    def root(self, root, walker):
+        self.root_name = walker.local_name(root.tag)
+
+    def fail(self, error):
+        self.root_name = None
+        super().fail(error)
+
+    def result(self):
+        return self.root_name
+
+
+class _RelationshipIdsVisitor(PartVisitor):
+    """Checks r:id attributes against the part's .rels file."""
+
+    ATTRIBUTES = frozenset(
+        {"{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"}
+    )
+
+    def __init__(self, validator, xml_file):
+        super().__init__()
+        self.validator = validator
+        self.relative_path = xml_file.relative_to(validator.unpacked_dir)
+        self.rid_to_type = {}
+
+        # Determine the corresponding .rels file
+        # For dir/file.xml, it's dir/_rels/file.xml.rels
+        rels_file = xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+
+        # Skip .rels files themselves, and files without a .rels file (that's okay)
+        if xml_file.suffix == ".rels" or not rels_file.exists():
+            self.active = False
+            return
+
+        try:
+            # Parse the .rels file to get valid relationship IDs and their types
+            rels_root = validator._get_xml_tree(rels_file).getroot()
+            for rel in rels_root.findall(
+                f".//{{{validator.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
+            ):
+                rid = rel.get("Id")
+                rel_type = rel.get("Type", "")
+                if rid:
+                    # Check for duplicate rIds
+                    if rid in self.rid_to_type:
+                        rels_rel_path = rels_file.relative_to(validator.unpacked_dir)
+                        self.errors.append(
+                            f"  {rels_rel_path}: Line {rel.sourceline}: "
+                            f"Duplicate relationship ID '{rid}' (IDs must be unique)"
+                        )
+                    # Extract just the type name from the full URL
+                    type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                    self.rid_to_type[rid] = type_name
+        except Exception as e:
+            self.fail(e)
+
+    def visit(self, elem, walker):
+        # Check for r:id attribute (relationship ID)
+        rid_attr = elem.get(f"{{{self.validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
+        if not rid_attr:
+            return
+
+        elem_name = walker.local_name(elem.tag)
+
+        # Check if the ID exists
+        if rid_attr not in self.rid_to_type:
+            self.errors.append(
+                f"  {self.relative_path}: Line {elem.sourceline}: "
+                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
+                f"(valid IDs: {', '.join(sorted(self.rid_to_type.keys())[:5])}{'...' if len(self.rid_to_type) > 5 else ''})"
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(elem_name)
+            if expected_type:
+                actual_type = self.rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        f"  {self.relative_path}: Line {elem.sourceline}: "
+                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
+                        f"but should point to a '{expected_type}' relationship"
+                    )
+
+    def fail(self, error):
+        self.errors.append(f"  Error processing {self.relative_path}: {error}")
+        super().fail(error)
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -81,6 +320,9 @@ class BaseSchemaValidator:
         "http://schemas.openxmlformats.org/package/2006/content-types"
     )
 
+    # Template placeholders removed from text before XSD validation
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
     # Folders where we should clean ignorable namespaces
     MAIN_CONTENT_FOLDERS = {"word", "ppt", "xl"}
 
@@ -103,13 +345,70 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
+    # Checks that look at one part at a time, run together for each part in
+    # parallel mode. Each returns a picklable result for a single file.
+    PART_CHECKS = (
+        "_check_xml_part",
+        "_check_namespaces_part",
+        "_check_unique_ids_part",
+        "_check_relationship_ids_part",
+        "_get_root_name",
+    )
+
+    # Per-part checks that also read the part's .rels file
+    RELS_DEPENDENT_CHECKS = {"_check_relationship_ids_part"}
+
+    # Parts at least this large are streamed by default (see streaming)
+    STREAMING_MIN_BYTES = 32 * 1024 * 1024
+
+    def __init__(
+        self,
+        unpacked_dir,
+        original_file,
+        verbose=False,
+        workers=1,
+        dirty_parts=None,
+        result_cache=None,
+        streaming=None,
+    ):
+        """
+        Args:
+            unpacked_dir: Directory holding the unpacked document
+            original_file: Original document used as the baseline
+            verbose: Enable verbose output
+            workers: Number of worker processes for per-part checks
+                (1 runs everything in this process, 0 uses every CPU)
+            dirty_parts: Part names (e.g. "word/document.xml") edited since
+                the last run that used result_cache, or None if unknown.
+                Dirty parts are always re-hashed; other parts reuse their
+                cached digest while their size and mtime are unchanged.
+            result_cache: Optional ValidationCache with per-part results of
+                earlier runs; only parts missing from it are re-checked
+            streaming: Check well-formedness, namespaces, IDs and r:id
+                references with an incremental parse that discards each
+                subtree once checked, instead of keeping the part's tree.
+                True streams every part, False none, and None (default)
+                only parts of at least STREAMING_MIN_BYTES.
+        """
         self.unpacked_dir = Path(unpacked_dir).resolve()
         self.original_file = Path(original_file)
         self.verbose = verbose
+        self.workers = workers if workers else os.cpu_count() or 1
+        self.dirty_parts = (
+            None
+            if dirty_parts is None
+            else {Path(part).as_posix() for part in dirty_parts}
+        )
+        self.result_cache = result_cache
+        self.streaming = streaming
+
+        # Cache counters at the start of this run, for report_cache_stats()
+        self._cache_counts = (
+            (result_cache.hits, result_cache.misses) if result_cache else None
+        )
 
         # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.schemas_dir = SCHEMAS_DIR
 
         # Get all XML and .rels files
         patterns = ["*.xml", "*.rels"]
@@ -120,28 +419,313 @@ class BaseSchemaValidator:
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
+        # Parsed trees shared by all checks (path -> tree or parse exception)
+        self._xml_trees = {}
+        self.parse_count = 0
+
+        # Results of the single per-element walk over each part
+        self._walk_results = {}
+
+        # Original document, read in place for baseline comparisons
+        self.baseline = BaselineSession(self.original_file)
+
+        # Worker pool and per-part check results of a parallel run
+        self._pool = None
+        self._part_check_results = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool and close the original document."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self.baseline.close()
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         raise NotImplementedError("Subclasses must implement the validate method")
 
-    def validate_xml(self):
-        """Validate that all XML files are well-formed."""
-        errors = []
+    def report_cache_stats(self):
+        """Print the result cache hits and misses of this run (verbose only)."""
+        if not self.verbose or self.result_cache is None:
+            return
+        hits = self.result_cache.hits - self._cache_counts[0]
+        misses = self.result_cache.misses - self._cache_counts[1]
+        print(f"Result cache: {hits} hits, {misses} misses")
+
+    def _get_pool(self):
+        """Start the worker pool on first use."""
+        if self._pool is None:
+            # Compile schemas before forking so workers inherit them
+            self.warm_schema_cache(self.schemas_dir)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(
+                    type(self),
+                    self.unpacked_dir,
+                    self.original_file,
+                    {"streaming": self.streaming},
+                ),
+            )
+        return self._pool
+
+    def _map_parts(self, method_name, files):
+        """Run a per-part method on each file and return the results in file order.
+
+        With more than one worker the files are spread over the process pool;
+        results are still returned in the order of files, so error output
+        does not depend on scheduling. With a result cache, only files whose
+        cache key is missing are checked.
+        """
+        files = list(files)
+        if self.result_cache is None:
+            return self._run_parts(method_name, files)
+
+        keys = [self._part_cache_key(method_name, xml_file) for xml_file in files]
+        results = [self.result_cache.get(key, _MISSING) for key in keys]
+        missing = [index for index, result in enumerate(results) if result is _MISSING]
+
+        checked = self._run_parts(method_name, [files[index] for index in missing])
+        for index, result in zip(missing, checked):
+            self.result_cache.put(keys[index], result)
+            results[index] = result
+        return results
+
+    def _run_parts(self, method_name, files):
+        """Run a per-part method on each file, in the pool if there is one."""
+        if self.workers == 1 or len(files) < 2:
+            return [getattr(self, method_name)(xml_file) for xml_file in files]
+
+        chunksize = max(1, len(files) // (self.workers * 4))
+        return list(
+            self._get_pool().map(
+                _run_worker_check, repeat(method_name), files, chunksize=chunksize
+            )
+        )
+
+    def _run_part_checks(self, xml_file):
+        """Run every check in PART_CHECKS on one file. Returns {check: result}."""
+        return {check: getattr(self, check)(xml_file) for check in self.PART_CHECKS}
+
+    def _collect_part_results(self, check):
+        """Return the results of a per-part check for each file in xml_files.
+
+        In parallel mode all PART_CHECKS run in one pass over the pool, so
+        each part is parsed by a single worker; later calls read the stored
+        results.
+        """
+        if self.workers == 1:
+            return self._map_parts(check, self.xml_files)
+
+        if self._part_check_results is None:
+            self._part_check_results = self._map_part_checks()
+        return [result[check] for result in self._part_check_results]
+
+    def _map_part_checks(self):
+        """Run all PART_CHECKS on each file in xml_files. Returns [{check: result}].
+
+        Results are cached per check, under the same keys a serial run uses,
+        and a file is only sent to the pool if one of its checks is missing.
+        """
+        if self.result_cache is None:
+            return self._run_parts("_run_part_checks", self.xml_files)
+
+        keys = [
+            {check: self._part_cache_key(check, xml_file) for check in self.PART_CHECKS}
+            for xml_file in self.xml_files
+        ]
+        results = [
+            {
+                check: self.result_cache.get(key, _MISSING)
+                for check, key in file_keys.items()
+            }
+            for file_keys in keys
+        ]
+        missing = [
+            index
+            for index, result in enumerate(results)
+            if any(value is _MISSING for value in result.values())
+        ]
+
+        checked = self._run_parts(
+            "_run_part_checks", [self.xml_files[index] for index in missing]
+        )
+        for index, result in zip(missing, checked):
+            for check, value in result.items():
+                if results[index][check] is _MISSING:
+                    self.result_cache.put(keys[index][check], value)
+            results[index] = result
+        return results
+
+    def _part_digest(self, xml_file):
+        """Return the content digest of a file in the unpacked directory."""
+        xml_file = Path(xml_file)
+        part_name = xml_file.relative_to(self.unpacked_dir).as_posix()
+        refresh = self.dirty_parts is None or part_name in self.dirty_parts
+        return self.result_cache.file_digest(xml_file, refresh=refresh)
+
+    def _part_cache_key(self, method_name, xml_file):
+        """Build the result cache key for running a per-part method on a file.
+
+        The key covers everything the result depends on: the validator
+        class, the part name (which appears in error messages), the part's
+        content and the content of any other file the check reads.
+        """
+        xml_file = Path(xml_file).resolve()
+        key = (
+            type(self).__name__,
+            method_name,
+            xml_file.relative_to(self.unpacked_dir).as_posix(),
+            self._part_digest(xml_file),
+        )
+
+        if method_name in self.RELS_DEPENDENT_CHECKS:
+            rels_file = xml_file.parent / "_rels" / f"{xml_file.name}.rels"
+            if rels_file.exists():
+                key += (self._part_digest(rels_file),)
+            else:
+                key += (None,)
+
+        if method_name == "validate_file_against_xsd":
+            # New errors are relative to the same part in the original
+            part_data = self.baseline.read_part(key[2])
+            schema_path = self._get_schema_path(xml_file)
+            key += (
+                schema_path.relative_to(self.schemas_dir).as_posix()
+                if schema_path
+                else None,
+                self.result_cache.hash_bytes(part_data)
+                if part_data is not None
+                else None,
+            )
+
+        return key
+
+    def _collect_part_errors(self, check):
+        """Return the errors of a per-part check for all files, in file order."""
+        return [
+            error for errors in self._collect_part_results(check) for error in errors
+        ]
+
+    @classmethod
+    def warm_schema_cache(cls, schemas_dir=None):
+        """Precompile every schema listed in SCHEMA_MAPPINGS.
+
+        Compiled schemas are kept for the lifetime of the process, so a
+        long-lived worker can call this once at startup and no later
+        validation pays the compile cost.
+
+        Args:
+            schemas_dir: Directory containing the XSD files (default: bundled schemas)
 
-        for xml_file in self.xml_files:
+        Returns:
+            int: Number of schemas compiled successfully
+        """
+        schemas_dir = Path(schemas_dir) if schemas_dir else SCHEMAS_DIR
+        compiled = 0
+        for schema_name in sorted(set(cls.SCHEMA_MAPPINGS.values())):
             try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
+                load_schema(schemas_dir / schema_name)
+                compiled += 1
+            except Exception:
+                # Validation reports the compile error for affected files
+                continue
+        return compiled
+
+    def _use_streaming(self, xml_file):
+        """Return True if the per-element checks stream this part."""
+        if self.streaming is None:
+            return Path(xml_file).stat().st_size >= self.STREAMING_MIN_BYTES
+        return bool(self.streaming)
+
+    def _get_xml_tree(self, xml_file, keep=True):
+        """Return the parsed tree for an XML file, parsing it at most once.
+
+        The tree is shared by every check, so callers must treat it as
+        read-only and copy it if they need to modify it.
+        Parse errors are remembered and re-raised on each call.
+
+        With keep=False a part that has not been parsed yet is parsed
+        without being kept, so its tree is freed once the caller is done.
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._xml_trees:
+            self.parse_count += 1
+            try:
+                tree = lxml.etree.parse(str(xml_file))
             except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+                tree = e
+            if not keep:
+                if isinstance(tree, Exception):
+                    raise tree
+                return tree
+            self._xml_trees[xml_file] = tree
+
+        tree = self._xml_trees[xml_file]
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    def _part_visitors(self, xml_file):
+        """Create the per-element checks to run on a part in a single walk.
+
+        Subclasses extend this with their own format-specific checks.
+
+        Returns:
+            dict: Result name -> PartVisitor
+        """
+        return {
+            "namespaces": _NamespacesVisitor(self, xml_file),
+            "root_name": _RootNameVisitor(),
+            "unique_ids": _UniqueIdsVisitor(self, xml_file),
+            "relationship_ids": _RelationshipIdsVisitor(self, xml_file),
+        }
+
+    def _walk_part(self, xml_file):
+        """Run all per-element checks on a part in one walk, at most once per part.
+
+        Large parts (see streaming) are walked while they are parsed and
+        never kept in memory; others are walked over the shared tree.
+
+        Returns:
+            dict: Result name -> result of the corresponding visitor, plus
+            "parse_error" -> the exception raised parsing the part, or None
+        """
+        xml_file = Path(xml_file)
+        if xml_file not in self._walk_results:
+            visitors = self._part_visitors(xml_file)
+            parse_error = None
+            try:
+                if self._use_streaming(xml_file):
+                    self.parse_count += 1
+                    PartWalker(visitors.values()).stream(xml_file)
+                else:
+                    root = self._get_xml_tree(xml_file).getroot()
+                    PartWalker(visitors.values()).walk(root)
+            except Exception as e:
+                # A streamed part may fail halfway; report it like a part
+                # that could not be parsed at all
+                parse_error = e
+                visitors = self._part_visitors(xml_file)
+                for visitor in visitors.values():
+                    if visitor.active:
+                        visitor.fail(e)
+
+            self._walk_results[xml_file] = {
+                name: visitor.result() for name, visitor in visitors.items()
+            }
+            self._walk_results[xml_file]["parse_error"] = parse_error
+        return self._walk_results[xml_file]
+
+    def validate_xml(self):
+        """Validate that all XML files are well-formed."""
+        errors = self._collect_part_errors("_check_xml_part")
 
         if errors:
             print(f"FAILED - Found {len(errors)} XML violations:")
@@ -153,26 +737,30 @@ class BaseSchemaValidator:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _check_xml_part(self, xml_file):
+        """Check that a single XML file is well-formed. Returns a list of errors."""
+        try:
+            # Try to parse the XML file
+            if self._use_streaming(xml_file):
+                parse_error = self._walk_part(xml_file)["parse_error"]
+                if parse_error is not None:
+                    raise parse_error
+            else:
+                self._get_xml_tree(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: Line {e.lineno}: {e.msg}"
+            ]
+        except Exception as e:
+            return [
+                f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                f"Unexpected error: {str(e)}"
+            ]
+        return []
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
-        errors = []
-
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+        errors = self._collect_part_errors("_check_namespaces_part")
 
         if errors:
             print(f"FAILED - {len(errors)} namespace issues:")
@@ -183,86 +771,37 @@ class BaseSchemaValidator:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _check_namespaces_part(self, xml_file):
+        """Check the Ignorable namespace prefixes of a single file. Returns a list of errors."""
+        return self._walk_part(xml_file)["namespaces"]
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
-        for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+        # File-scope IDs are checked per part; global IDs are reduced here, in file order
+        results = self._collect_part_results("_check_unique_ids_part")
+        for xml_file, entries in zip(self.xml_files, results):
+            for entry in entries:
+                if entry[0] == "error":
+                    errors.append(entry[1])
+                    continue
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+                _, id_value, sourceline, tag = entry
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
+                        f"Line {sourceline}: Global ID '{id_value}' in <{tag}> "
+                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        sourceline,
+                        tag,
                     )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
             print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
@@ -274,6 +813,16 @@ class BaseSchemaValidator:
                 print("PASSED - All required IDs are unique")
             return True
 
+    def _check_unique_ids_part(self, xml_file):
+        """Check ID uniqueness within a single file.
+
+        Returns:
+            list: Entries in document order, either ("error", message) for
+            file-scope violations or ("global", id_value, sourceline, tag)
+            for IDs that must be unique across all files
+        """
+        return self._walk_part(xml_file)["unique_ids"]
+
     def validate_file_references(self):
         """
         Validate that all .rels files properly reference files and that all files are referenced.
@@ -310,7 +859,7 @@ class BaseSchemaValidator:
         for rels_file in rels_files:
             try:
                 # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
+                rels_root = self._get_xml_tree(rels_file).getroot()
 
                 # Get the directory where this .rels file is located
                 rels_dir = rels_file.parent
@@ -390,87 +939,7 @@ class BaseSchemaValidator:
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
-        errors = []
-
-        # Process each XML file that might contain r:id references
-        for xml_file in self.xml_files:
-            # Skip .rels files themselves
-            if xml_file.suffix == ".rels":
-                continue
-
-            # Determine the corresponding .rels file
-            # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
-
-            # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
-                continue
-
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+        errors = self._collect_part_errors("_check_relationship_ids_part")
 
         if errors:
             print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
@@ -483,6 +952,10 @@ class BaseSchemaValidator:
                 print("PASSED - All relationship ID references are valid")
             return True
 
+    def _check_relationship_ids_part(self, xml_file):
+        """Check the r:id references of a single file. Returns a list of errors."""
+        return self._walk_part(xml_file)["relationship_ids"]
+
     def _get_expected_relationship_type(self, element_name):
         """
         Get the expected relationship type for an element.
@@ -531,7 +1004,7 @@ class BaseSchemaValidator:
 
         try:
             # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
+            root = self._get_xml_tree(content_types_file).getroot()
             declared_parts = set()
             declared_extensions = set()
 
@@ -580,7 +1053,8 @@ class BaseSchemaValidator:
             all_files = [f for f in all_files if f.is_file()]
 
             # Check all XML files for Override declarations
-            for xml_file in self.xml_files:
+            root_names = self._collect_part_results("_get_root_name")
+            for xml_index, xml_file in enumerate(self.xml_files):
                 path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
                     "\\", "/"
                 )
@@ -592,18 +1066,15 @@ class BaseSchemaValidator:
                 ):
                     continue
 
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
-                        )
-
-                except Exception:
+                root_name = root_names[xml_index]
+                if root_name is None:
                     continue  # Skip unparseable files
 
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+                    )
+
             # Check all non-XML files for Default extension declarations
             for file_path in all_files:
                 # Skip XML files and metadata files (already checked above)
@@ -638,6 +1109,10 @@ class BaseSchemaValidator:
                 )
             return True
 
+    def _get_root_name(self, xml_file):
+        """Return the local name of a file's root element, or None if unparseable."""
+        return self._walk_part(xml_file)["root_name"]
+
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
 
@@ -692,11 +1167,9 @@ class BaseSchemaValidator:
         valid_count = 0
         skipped_count = 0
 
-        for xml_file in self.xml_files:
+        results = self._map_parts("validate_file_against_xsd", self.xml_files)
+        for xml_file, (is_valid, new_file_errors) in zip(self.xml_files, results):
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
 
             if is_valid is None:
                 skipped_count += 1
@@ -762,60 +1235,58 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
-
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
-
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+    def _preprocess_for_xsd(self, xml_doc, clean_namespaces):
+        """Prepare a parsed document for XSD validation, modifying it in place.
 
-        return lxml.etree.ElementTree(xml_copy)
+        In a single pass over the tree, template tags ({{ ... }} placeholders)
+        are removed from text outside w:t elements and, if clean_namespaces
+        is set, attributes and elements outside OOXML_NAMESPACES are removed.
+        The mc:Ignorable attribute is always dropped from the root.
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        Args:
+            xml_doc: Parsed tree owned by the caller
+            clean_namespaces: Remove content from non-OOXML namespaces
+        """
+        root = xml_doc.getroot()
+        template_pattern = self.TEMPLATE_TAG_PATTERN
+        ignorable_elements = []
 
-        # Find elements to remove
-        for elem in list(root):
+        for elem in root.iter():
             # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+            if callable(elem.tag):
                 continue
+            tag_str = elem.tag
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+            # Template tags are kept in w:t text, which is validated as is
+            if not (tag_str.endswith("}t") or tag_str == "t"):
+                if elem.text and "{{" in elem.text:
+                    elem.text = template_pattern.sub("", elem.text)
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = template_pattern.sub("", elem.tail)
+
+            if not clean_namespaces:
+                continue
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+            # Remove attributes not in allowed namespaces
+            attrs_to_remove = [
+                attr
+                for attr in elem.attrib
+                if attr.startswith("{")
+                and attr.split("}")[0][1:] not in self.OOXML_NAMESPACES
+            ]
+            for attr in attrs_to_remove:
+                del elem.attrib[attr]
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+            # Collect elements not in allowed namespaces (never the root)
+            if elem is not root and tag_str.startswith("{"):
+                if tag_str.split("}")[0][1:] not in self.OOXML_NAMESPACES:
+                    ignorable_elements.append(elem)
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+        # Remove collected elements; descendants of removed elements go with them
+        for elem in ignorable_elements:
+            parent = elem.getparent()
+            if parent is not None:
+                parent.remove(elem)
 
         # Remove mc:Ignorable attribute from root
         if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
@@ -829,29 +1300,47 @@ class BaseSchemaValidator:
         if not schema_path:
             return None, None  # Skip file
 
+        # Streamed parts are too large to keep, so they get a throwaway tree
+        # that preprocessing can modify directly
+        streamed = self._use_streaming(xml_file)
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self._get_xml_tree(xml_file, keep=not streamed)
+        except Exception as e:
+            return False, {str(e)}
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        return self._validate_xml_doc_xsd(
+            xml_doc,
+            schema_path,
+            xml_file.relative_to(base_path),
+            copy_tree=not streamed,
+        )
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+    def _validate_xml_doc_xsd(
+        self, xml_doc, schema_path, relative_path, copy_tree=True
+    ):
+        """Validate a parsed XML document against XSD schema. Returns (is_valid, errors_set).
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        Args:
+            xml_doc: Parsed tree to validate
+            schema_path: Path to the XSD schema to validate against
+            relative_path: Path of the part within the package
+            copy_tree: Preprocess a copy of xml_doc; pass False if the caller
+                owns the tree and it may be modified
+        """
+        try:
+            # Load schema (compiled once per process)
+            schema = load_schema(schema_path)
+
+            # Preprocess XML (one copy of a shared tree, then a single pass)
+            if copy_tree:
+                xml_doc = copy.deepcopy(xml_doc)
+            xml_doc = self._preprocess_for_xsd(
+                xml_doc,
+                clean_namespaces=bool(
+                    relative_path.parts
+                    and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+                ),
+            )
 
             # Validate
             if schema.validate(xml_doc):
@@ -875,76 +1364,64 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        part_name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
-
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
-
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
-
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
+        # Each original part is validated at most once per session
+        if part_name not in self.baseline.xsd_errors:
+            self.baseline.xsd_errors[part_name] = self._get_cached_original_errors(
+                relative_path
             )
-            return errors if errors else set()
+        return self.baseline.xsd_errors[part_name]
+
+    def _get_cached_original_errors(self, relative_path):
+        """Validate an original part, reusing the result cache across sessions."""
+        part_name = relative_path.as_posix()
+        if self.result_cache is None or not self.baseline.has_part(part_name):
+            return self._validate_original_part_xsd(relative_path)
+
+        key = (
+            type(self).__name__,
+            "_validate_original_part_xsd",
+            part_name,
+            self.result_cache.hash_bytes(self.baseline.read_part(part_name)),
+        )
+        errors = self.result_cache.get(key)
+        if errors is None:
+            errors = self._validate_original_part_xsd(relative_path)
+            self.result_cache.put(key, errors)
+        return errors
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
+    def _validate_original_part_xsd(self, relative_path):
+        """Validate a part read directly from the original document.
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+        Args:
+            relative_path: Path of the part within the package
 
         Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
+            set: Set of error messages from the original part
         """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
-                    )
-                return template_pattern.sub("", text)
-            return text
+        if not self.baseline.has_part(relative_path.as_posix()):
+            # File didn't exist in original, so no original errors
+            return set()
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
+        try:
+            xml_doc = self.baseline.parse_part(relative_path.as_posix())
+        except Exception as e:
+            return {str(e)}
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+        # The tree was parsed for this call only, so it is preprocessed in place
+        is_valid, errors = self._validate_xml_doc_xsd(
+            xml_doc, schema_path, relative_path, copy_tree=False
+        )
+        return errors if errors else set()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+"""
+Content-hash keyed cache of per-part validation results.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Bumped whenever the key layout or the stored result format changes
+CACHE_VERSION = 1
+
+
+def _encode(value):
+    """Convert a check result to JSON-compatible data (sets are tagged)."""
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(_encode(item) for item in value)}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value):
+    """Inverse of _encode. Tuples come back as lists."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if list(value) == ["__set__"]:
+            return set(value["__set__"])
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+class ValidationCache:
+    """Per-part validation results keyed by content hash.
+
+    A validator given a cache looks up each per-part check under a key built
+    from the part's content digest (plus the digests of anything else the
+    check reads, such as the part's .rels file). Only parts whose key is
+    missing are checked again, so re-validating after a small edit only
+    re-checks the parts that changed.
+
+    One cache can be shared by any number of validator runs over the same
+    unpacked directory, e.g. across repeated Document.validate() calls.
+
+    With a directory, results are also stored on disk (one JSON file per
+    key, written atomically) and shared between processes and runs. Keys
+    contain only content digests, part names and schema paths, so parts
+    copied unchanged from a template hit the cache in every document built
+    from it.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Args:
+            directory: Optional directory for persistent results (created if missing)
+        """
+        self.directory = Path(directory) if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        # File path -> ((mtime_ns, size), digest) of the bytes last hashed
+        self._digests = {}
+
+        # Cache key -> check result
+        self._results = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_bytes(data):
+        """Return the content digest used in cache keys."""
+        return hashlib.sha256(data).hexdigest()
+
+    def file_digest(self, path, refresh=False):
+        """Return the content digest of a file.
+
+        The digest is remembered together with the file's modification time
+        and size, and the file is only read again when those change or when
+        refresh is set (for parts known to have been edited).
+
+        Args:
+            path: Path to the file
+            refresh: Re-read the file even if its stat signature is unchanged
+
+        Returns:
+            str: Hex digest of the file contents
+        """
+        path = Path(path)
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self._digests.get(str(path))
+        if refresh or entry is None or entry[0] != signature:
+            entry = (signature, self.hash_bytes(path.read_bytes()))
+            self._digests[str(path)] = entry
+        return entry[1]
+
+    def get(self, key, default=None):
+        """Return the cached result for key, or default on a miss."""
+        if key not in self._results and self.directory:
+            stored = self._load(key)
+            if stored is not None:
+                self._results[key] = stored[0]
+
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, result):
+        """Store the result of a check under key."""
+        self._results[key] = result
+        if self.directory:
+            self._store(key, result)
+
+    def clear(self):
+        """Drop all cached digests and results (including those on disk)."""
+        self._digests.clear()
+        self._results.clear()
+        if self.directory:
+            for entry_file in self.directory.glob(f"v{CACHE_VERSION}/*/*.json"):
+                entry_file.unlink(missing_ok=True)
+
+    def _entry_path(self, key):
+        """Return the file holding the stored result for key."""
+        key_digest = self.hash_bytes(json.dumps(list(key)).encode("utf-8"))
+        return (
+            self.directory / f"v{CACHE_VERSION}" / key_digest[:2] / f"{key_digest}.json"
+        )
+
+    def _load(self, key):
+        """Read a stored result as a one-element list, or None if there is none."""
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            # Missing or unreadable entries are treated as misses
+            return None
+
+        if entry.get("key") != _encode(key):
+            return None
+        return [_decode(entry["result"])]
+
+    def _store(self, key, result):
+        """Write a result to disk, replacing any previous entry atomically."""
+        entry_path = self._entry_path(key)
+        temp_path = None
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=entry_path.parent, suffix=".tmp", delete=False
+            ) as temp_file:
+                temp_path = Path(temp_file.name)
+                json.dump({"key": _encode(key), "result": _encode(result)}, temp_file)
+            os.replace(temp_path, entry_path)
+        except OSError:
+            # The cache is an optimization; failing to persist is not an error
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,266 @@
+"""
+Single-pass tree walker shared by the per-element validation checks.
+"""
+
+import lxml.etree
+
+MC_ALTERNATE_CONTENT = (
+    "{http://schemas.openxmlformats.org/markup-compatibility/2006}AlternateContent"
+)
+
+
+class PartVisitor:
+    """One check's share of a PartWalker walk over a part.
+
+    Subclasses declare which nodes they want and implement visit(). Nodes
+    are visited in document order with their attributes available; their
+    text is only guaranteed when NEEDS_TEXT is set (streaming walks then
+    visit them as they close). Errors go in self.errors; an exception
+    raised by visit() ends the check for this part via fail(), like an
+    exception in a standalone per-part loop would.
+    """
+
+    # Clark-notation tags to visit; None visits every element
+    TAGS = frozenset()
+
+    # Lower-cased local names to visit, in any namespace
+    LOCAL_NAMES = frozenset()
+
+    # Clark-notation attribute names; elements carrying any of them are visited
+    ATTRIBUTES = frozenset()
+
+    # Also visit comments and processing instructions
+    COMMENTS = False
+
+    # Skip mc:AlternateContent elements and everything inside them
+    SKIP_ALTERNATE_CONTENT = False
+
+    # visit() reads the node's text (or children)
+    NEEDS_TEXT = False
+
+    def __init__(self):
+        self.errors = []
+        self.active = True
+
+    def root(self, root, walker):
+        """Handle the root element before any node is visited.
+
+        Only the root's tag, attributes and namespace declarations are
+        guaranteed to be available.
+        """
+
+    def visit(self, node, walker):
+        """Handle a node of interest."""
+
+    def fail(self, error):
+        """Stop this check for the part after an error."""
+        self.active = False
+
+    def result(self):
+        """Return the check result for the part (by default, its errors)."""
+        return self.errors
+
+
+class PartWalker:
+    """Walks a part once and dispatches each node to the visitors interested in it.
+
+    Which visitors want a given tag is worked out once per distinct tag, and
+    namespace splitting is done once per distinct name via local_name().
+    Ancestor tests (inside()) are only evaluated for the nodes that ask.
+
+    walk() visits an already parsed tree; stream() parses a file with
+    iterparse and discards each subtree once it has been visited, so memory
+    stays bounded by the depth of the document rather than its size.
+    """
+
+    def __init__(self, visitors):
+        self.visitors = [visitor for visitor in visitors if visitor.active]
+
+        # Clark name -> local name
+        self._local_names = {}
+
+        # Tag -> visitors interested in every node with that tag
+        self._by_tag = {}
+
+        # (attribute, visitor) pairs for attribute interest
+        self._by_attribute = [
+            (attribute, visitor)
+            for visitor in self.visitors
+            for attribute in visitor.ATTRIBUTES
+        ]
+
+        # Nodes inside mc:AlternateContent, for visitors that skip them
+        self._alternate_content = set()
+
+        self._node = None
+
+    def local_name(self, name):
+        """Return the local part of a Clark-notation tag or attribute name."""
+        local = self._local_names.get(name)
+        if local is None:
+            local = name.split("}")[-1] if "}" in name else name
+            self._local_names[name] = local
+        return local
+
+    def inside(self, tag):
+        """Return True if the node being visited has an ancestor with the given tag."""
+        for _ in self._node.iterancestors(tag):
+            return True
+        return False
+
+    def walk(self, root):
+        """Visit every node under root (inclusive) in document order."""
+        self._visit_root(root)
+
+        if any(visitor.SKIP_ALTERNATE_CONTENT for visitor in self.visitors):
+            for alternate_content in root.iter(MC_ALTERNATE_CONTENT):
+                self._alternate_content.update(alternate_content.iter())
+
+        for node in root.iter():
+            visitors = self._visitors_of(node)
+            if visitors:
+                self._visit(node, visitors, node in self._alternate_content)
+
+    def stream(self, source):
+        """Parse an XML file incrementally, visiting each node as it is parsed.
+
+        Visitors that need text are called when their node closes; all
+        others when it opens, so they still see nodes in document order.
+        Visited subtrees are cleared and removed, keeping only the open
+        ancestors (for inside()) in memory.
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the file is not well-formed
+        """
+        # Tag -> (visitors called on open, visitors called on close)
+        by_event = {}
+
+        depth = 0
+        alternate_content_depth = 0
+        events = ("start", "end", "comment", "pi")
+        for event, node in _iterparse(source, events):
+            tag = node.tag
+            if event == "start" or event == "end":
+                split = by_event.get(tag)
+                if split is None:
+                    visitors = self._visitors_of_tag(tag)
+                    split = by_event[tag] = (
+                        [visitor for visitor in visitors if not visitor.NEEDS_TEXT],
+                        [visitor for visitor in visitors if visitor.NEEDS_TEXT],
+                    )
+
+            if event == "start":
+                if depth == 0:
+                    self._visit_root(node)
+                depth += 1
+                if tag == MC_ALTERNATE_CONTENT:
+                    alternate_content_depth += 1
+
+                visitors = self._with_attribute_visitors(node, split[0])
+                if visitors:
+                    self._visit(node, visitors, alternate_content_depth > 0)
+
+            elif event == "end":
+                if split[1]:
+                    self._visit(node, split[1], alternate_content_depth > 0)
+
+                if tag == MC_ALTERNATE_CONTENT:
+                    alternate_content_depth -= 1
+                depth -= 1
+
+                # Drop the finished subtree and any earlier siblings (the
+                # root's siblings are top-level comments and processing
+                # instructions, which have no parent to be removed from)
+                node.clear()
+                parent = node.getparent()
+                if parent is not None:
+                    while node.getprevious() is not None:
+                        del parent[0]
+
+            elif depth:
+                # Comments and processing instructions inside the root element
+                visitors = self._visitors_of_tag(tag)
+                if visitors:
+                    self._visit(node, visitors, alternate_content_depth > 0)
+
+    def _visit_root(self, root):
+        """Call the root hook of every active visitor."""
+        for visitor in self.visitors:
+            if not visitor.active:
+                continue
+            try:
+                visitor.root(root, self)
+            except Exception as e:
+                visitor.fail(e)
+
+    def _visitors_of(self, node):
+        """Return the visitors interested in a node."""
+        return self._with_attribute_visitors(node, self._visitors_of_tag(node.tag))
+
+    def _visitors_of_tag(self, tag):
+        """Return the visitors interested in every node with the given tag."""
+        visitors = self._by_tag.get(tag)
+        if visitors is None:
+            visitors = self._by_tag[tag] = self._visitors_for(tag)
+        return visitors
+
+    def _with_attribute_visitors(self, node, visitors):
+        """Add the visitors interested in the attributes the node carries."""
+        if self._by_attribute:
+            extra = [
+                visitor
+                for attribute, visitor in self._by_attribute
+                if visitor not in visitors and node.get(attribute) is not None
+            ]
+            if extra:
+                visitors = visitors + extra
+        return visitors
+
+    def _visitors_for(self, tag):
+        """Work out which visitors want nodes with the given tag."""
+        if not isinstance(tag, str):
+            # Comment or processing instruction
+            return [visitor for visitor in self.visitors if visitor.COMMENTS]
+
+        local_name = self.local_name(tag).lower()
+        return [
+            visitor
+            for visitor in self.visitors
+            if visitor.TAGS is None
+            or tag in visitor.TAGS
+            or local_name in visitor.LOCAL_NAMES
+        ]
+
+    def _visit(self, node, visitors, in_alternate_content):
+        self._node = node
+        for visitor in visitors:
+            if not visitor.active:
+                continue
+            if visitor.SKIP_ALTERNATE_CONTENT and in_alternate_content:
+                continue
+            try:
+                visitor.visit(node, self)
+            except Exception as e:
+                visitor.fail(e)
+
+
+def _iterparse(source, events):
+    """Yield lxml.etree.iterparse() events, with the errors of a full parse.
+
+    iterparse words some errors before the root element differently (e.g.
+    "no element found" for an empty file instead of "Document is empty");
+    a full parse stops at the same point, so its error is raised instead.
+    """
+    root_seen = False
+    try:
+        for event, node in lxml.etree.iterparse(str(source), events=events):
+            root_seen = root_seen or event == "start"
+            yield event, node
+    except lxml.etree.XMLSyntaxError:
+        if not root_seen:
+            lxml.etree.parse(str(source))
+        raise
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
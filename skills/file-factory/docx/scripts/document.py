@@ -24,6 +24,7 @@ Usage:
 
     # Save
     doc.save()
+    doc.pack("output.docx")  # Or write a .docx, repacking only the edited parts
 """
 
 import html
@@ -34,7 +35,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from defusedxml import minidom
-from ooxml.scripts.pack import pack_document
+from ooxml.scripts.pack import pack_document, repack_document
+from ooxml.scripts.validation.cache import ValidationCache
 from ooxml.scripts.validation.docx import DOCXSchemaValidator
 from ooxml.scripts.validation.redlining import RedliningValidator
 
@@ -71,20 +73,33 @@ class DocxXMLEditor(XMLEditor):
         self.rsid = rsid
         self.author = author
         self.initials = initials
+        self._next_change_id = None  # Found on first use
 
     def _get_next_change_id(self):
-        """Get the next available change ID by checking all tracked change elements."""
-        max_id = -1
-        for tag in ("w:ins", "w:del"):
-            elements = self.dom.getElementsByTagName(tag)
-            for elem in elements:
-                change_id = elem.getAttribute("w:id")
-                if change_id:
-                    try:
-                        max_id = max(max_id, int(change_id))
-                    except ValueError:
-                        pass
-        return max_id + 1
+        """Get the next available change ID for a tracked change element.
+
+        The highest w:id of the document's w:ins and w:del elements is looked
+        up once; after that IDs are handed out from a counter, which also skips
+        past the IDs of content inserted through the editor. A w:id set directly
+        on the DOM later is not seen.
+        """
+        if self._next_change_id is None:
+            self._next_change_id = 0
+            for tag in ("w:ins", "w:del"):
+                for elem in self.dom.getElementsByTagName(tag):
+                    self._skip_change_id(elem)
+        change_id = self._next_change_id
+        self._next_change_id += 1
+        return change_id
+
+    def _skip_change_id(self, elem):
+        """Make sure the counter never hands out the w:id an element already has."""
+        change_id = elem.getAttribute("w:id")
+        if change_id:
+            try:
+                self._next_change_id = max(self._next_change_id, int(change_id) + 1)
+            except ValueError:
+                pass
 
     def _ensure_w16du_namespace(self):
         """Ensure w16du namespace is declared on the root element."""
@@ -204,6 +219,17 @@ class DocxXMLEditor(XMLEditor):
                     if not elem.hasAttribute("xml:space"):
                         elem.setAttribute("xml:space", "preserve")
 
+        # IDs written in the inserted content are taken before any are assigned
+        if self._next_change_id is not None:
+            for node in nodes:
+                if node.nodeType != node.ELEMENT_NODE:
+                    continue
+                for tag in ("w:ins", "w:del"):
+                    if node.tagName == tag:
+                        self._skip_change_id(node)
+                    for elem in node.getElementsByTagName(tag):
+                        self._skip_change_id(elem)
+
         for node in nodes:
             if node.nodeType != node.ELEMENT_NODE:
                 continue
@@ -658,6 +684,9 @@ class Document:
         # Cache for lazy-loaded editors
         self._editors = {}
 
+        # Per-part validation results, reused for parts unchanged between validate() calls
+        self._validation_cache = ValidationCache()
+
         # Comment file paths
         self.comments_path = self.word_path / "comments.xml"
         self.comments_extended_path = self.word_path / "commentsExtended.xml"
@@ -842,16 +871,29 @@ class Document:
         Raises:
             ValueError: If validation fails.
         """
+        # Parts opened through an editor are always re-hashed; any other part is
+        # re-hashed only if its size or mtime changed (e.g. copied templates)
+        dirty_parts = set(self._editors)
+
         # Create validators with current state
-        schema_validator = DOCXSchemaValidator(
-            self.unpacked_path, self.original_docx, verbose=False
-        )
+        with DOCXSchemaValidator(
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            dirty_parts=dirty_parts,
+            result_cache=self._validation_cache,
+        ) as schema_validator:
+            schema_valid = schema_validator.validate()
         redlining_validator = RedliningValidator(
-            self.unpacked_path, self.original_docx, verbose=False
+            self.unpacked_path,
+            self.original_docx,
+            verbose=False,
+            dirty_parts=dirty_parts,
+            result_cache=self._validation_cache,
         )
 
         # Run validations
-        if not schema_validator.validate():
+        if not schema_valid:
             raise ValueError("Schema validation failed")
         if not redlining_validator.validate():
             raise ValueError("Redlining validation failed")
@@ -866,6 +908,36 @@ class Document:
             destination: Optional path to save to. If None, saves back to original directory.
             validate: If True, validates document before saving (default: True).
         """
+        self._write_parts(validate)
+
+        # Copy contents from temp directory to destination (or original directory)
+        target_path = Path(destination) if destination else self.original_path
+        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
+
+    def pack(self, output_file, validate=True) -> None:
+        """
+        Save all modified XML files and pack the document into a .docx file.
+
+        Only the parts opened through an editor (and any files added to
+        unpacked_path) are condensed and compressed; every other part is
+        copied from the baseline package as is.
+
+        Args:
+            output_file: Path to the .docx file to write
+            validate: If True, validates document before packing (default: True).
+
+        Note:
+            Existing parts changed without an editor (e.g. an image overwritten
+            in unpacked_path) keep their original content; use save() and
+            pack.py for those.
+        """
+        self._write_parts(validate)
+        repack_document(
+            self.original_docx, self.unpacked_path, output_file, set(self._editors)
+        )
+
+    def _write_parts(self, validate):
+        """Write all modified XML files in the temp directory, then validate."""
         # Only ensure comment relationships and content types if comment files exist
         if self.comments_path.exists():
             self._ensure_comment_relationships()
@@ -879,10 +951,6 @@ class Document:
         if validate:
             self.validate()
 
-        # Copy contents from temp directory to destination (or original directory)
-        target_path = Path(destination) if destination else self.original_path
-        shutil.copytree(self.unpacked_path, target_path, dirs_exist_ok=True)
-
     # ==================== Private: Initialization ====================
 
     def _get_next_comment_id(self):
@@ -0,0 +1,118 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from scripts.document import DocxXMLEditor
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+DOCUMENT = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:document {W}>
+  <w:body>
+    <w:p>
+      <w:r>
+        <w:t>first</w:t>
+      </w:r>
+      <w:ins w:id="3" w:author="Other">
+        <w:r>
+          <w:t>inserted</w:t>
+        </w:r>
+      </w:ins>
+    </w:p>
+    <w:p>
+      <w:r>
+        <w:t>second</w:t>
+      </w:r>
+      <w:del w:id="7" w:author="Other">
+        <w:r>
+          <w:delText>deleted</w:delText>
+        </w:r>
+      </w:del>
+      <w:r>
+        <w:t>third</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+
+class _ScanningEditor(DocxXMLEditor):
+    """Assigns change IDs by scanning the whole document each time, as before."""
+
+    def _get_next_change_id(self):
+        max_id = -1
+        for tag in ("w:ins", "w:del"):
+            for elem in self.dom.getElementsByTagName(tag):
+                change_id = elem.getAttribute("w:id")
+                if change_id:
+                    try:
+                        max_id = max(max_id, int(change_id))
+                    except ValueError:
+                        pass
+        return max_id + 1
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestChangeIds(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = Path(self.temp_dir.name) / "document.xml"
+        self.path.write_text(DOCUMENT)
+
+    def change_ids(self, editor_class):
+        """Make the same edits with an editor and return the IDs in the result."""
+        editor = editor_class(self.path, rsid="00AB12CD")
+        first = editor.get_node(tag="w:r", contains="first")
+        second = editor.get_node(tag="w:r", contains="second")
+        third = editor.get_node(tag="w:r", contains="third")
+
+        editor.suggest_deletion(first)
+
+        # Explicit IDs are taken before any are assigned, wherever they are
+        editor.insert_after(
+            second,
+            "<w:ins><w:r><w:t>a</w:t></w:r></w:ins>"
+            '<w:ins w:id="20"><w:r><w:t>b</w:t></w:r></w:ins>',
+        )
+
+        # Nested changes, with and without IDs
+        editor.insert_before(
+            third,
+            "<w:ins><w:r><w:t>c</w:t></w:r>"
+            "<w:del><w:r><w:delText>d</w:delText></w:r></w:del></w:ins>"
+            '<w:ins w:id="2"><w:del><w:r><w:delText>e</w:delText></w:r></w:del>'
+            "</w:ins>",
+        )
+
+        # Reverts add changes of their own
+        editor.revert_insertion(editor.get_node(tag="w:ins", attrs={"w:id": "3"}))
+        editor.revert_deletion(editor.get_node(tag="w:del", attrs={"w:id": "7"}))
+        editor.suggest_deletion(editor.get_node(tag="w:r", contains="third"))
+
+        return [
+            (elem.tagName, elem.getAttribute("w:id"))
+            for elem in editor.dom.getElementsByTagName("*")
+            if elem.tagName in ("w:ins", "w:del")
+        ]
+
+    def test_same_ids_as_full_scan(self):
+        ids = self.change_ids(DocxXMLEditor)
+        self.assertEqual(ids, self.change_ids(_ScanningEditor))
+        self.assertEqual(len({change_id for _, change_id in ids}), len(ids))
+
+    def test_explicit_id_before_first_change(self):
+        """The first ID assigned also skips explicit IDs in the inserted content"""
+        for editor_class in (DocxXMLEditor, _ScanningEditor):
+            editor = editor_class(self.path, rsid="00AB12CD")
+            first = editor.append_to(
+                editor.get_node(tag="w:p", contains="first"),
+                "<w:ins><w:r><w:t>a</w:t></w:r></w:ins>"
+                '<w:ins w:id="30"><w:r><w:t>b</w:t></w:r></w:ins>',
+            )[0]
+            self.assertEqual(first.getAttribute("w:id"), "31")
+
+
+if __name__ == "__main__":
+    unittest.main()
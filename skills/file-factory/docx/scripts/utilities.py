@@ -6,6 +6,10 @@ This module provides XMLEditor, a tool for manipulating XML files with support f
 line-number-based node finding and DOM manipulation. Each element is automatically
 annotated with its original line and column position during parsing.
 
+LxmlXMLEditor has the same get_node, replace_node, insert_*, append_to and save
+API on an lxml tree, which loads, saves and holds large files much more cheaply
+than a minidom DOM; it returns lxml elements instead of DOM nodes.
+
 Example usage:
     editor = XMLEditor("document.xml")
 
@@ -22,6 +26,10 @@ Example usage:
     # Combine filters
     elem = editor.get_node(tag="w:p", line_number=range(1, 50), contains="text")
 
+    # Find every occurrence of some text, even when it is split across runs
+    for match in editor.find_text("specific text"):
+        runs = [span.run for span in match.runs]
+
     # Replace, insert, or manipulate
     new_elem = editor.replace_node(elem, "<w:r><w:t>new text</w:t></w:r>")
     editor.insert_after(new_elem, "<w:r><w:t>more</w:t></w:r>")
@@ -30,12 +38,54 @@ Example usage:
     editor.save()
 """
 
+import bisect
 import html
+import re
+import xml.parsers.expat
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 import defusedxml.minidom
 import defusedxml.sax
+import lxml.etree
+
+# Namespace of the xml: prefix, which is never declared
+XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
+
+# XMLEditor methods that insert an XML fragment, for insert_fragments
+FRAGMENT_METHODS = ("replace_node", "insert_after", "insert_before", "append_to")
+
+# libxml2 stores exact line numbers up to this one only
+MAX_SOURCELINE = 65535
+
+# Markup in an XML file; group 1 is set for start tags
+MARKUP_START_PATTERN = re.compile(
+    rb"<(?:!--.*?-->|!\[CDATA\[.*?\]\]>|!DOCTYPE(?:[^\[>]|\[.*?\])*>|\?.*?\?>|/|([^\s/>!?]))",
+    re.DOTALL,
+)
+
+
+@dataclass
+class RunSpan:
+    """The part of a run's text covered by a text match."""
+
+    run: Any  # w:r element
+    text_element: Any  # w:t element holding the text
+    start: int  # Offsets in the text of text_element
+    end: int
+
+
+@dataclass
+class TextMatch:
+    """Text found in a paragraph by XMLEditor.find_text."""
+
+    paragraph: Any  # w:p element
+    start: int  # Offsets in the text of the paragraph's w:t elements
+    end: int
+    text: str
+    runs: list[RunSpan]
 
 
 class XMLEditor:
@@ -73,6 +123,20 @@ class XMLEditor:
         parser = _create_line_tracking_parser()
         self.dom = defusedxml.minidom.parse(str(self.xml_path), parser)
 
+        # Lookup indexes, built on first use by get_node
+        self._tag_index = None  # tag -> elements
+        self._line_index = {}  # tag -> (sorted line numbers, elements)
+        self._created = []  # Elements created since the tag index was built
+        self._paragraph_text = {}  # w:p -> text, see _read_paragraph_text
+        self._paragraphs = None  # w:p elements in document order
+        self._joined_text = None  # (text of all paragraphs, their offsets)
+        self._watch_element_creation()
+
+        # (xmlns name/value pairs, xmlns declarations) for _parse_fragment
+        self._namespace_declarations = None
+        # Fragment -> nodes parsed ahead by insert_fragments
+        self._parsed_fragments = {}
+
     def get_node(
         self,
         tag: str,
@@ -86,6 +150,12 @@ class XMLEditor:
         Finds an element by either its line number in the original file or by
         matching attribute values. Exactly one match must be found.
 
+        Candidates come from indexes by tag and line number that are built
+        on first use, so repeated lookups do not scan the whole document.
+        Attributes are read from the candidates themselves. Elements added,
+        moved, removed or re-attributed through this editor or directly in
+        the DOM are taken into account.
+
         Args:
             tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
             attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
@@ -109,76 +179,336 @@ class XMLEditor:
             elem = editor.get_node(tag="w:t", contains="&#8220;Agreement")  # Entity notation
             elem = editor.get_node(tag="w:t", contains="\u201cAgreement")   # Unicode character
         """
-        matches = []
-        for elem in self.dom.getElementsByTagName(tag):
-            # Check line_number filter
-            if line_number is not None:
-                parse_pos = getattr(elem, "parse_position", (None,))
-                elem_line = parse_pos[0]
+        matches = [
+            elem
+            for elem in self._get_candidates(tag, attrs, line_number)
+            if self._matches(elem, attrs, line_number, contains)
+        ]
+        if contains is not None and tag == "w:p":
+            # Text changed directly in the DOM may be stale in the text index
+            matches = [
+                elem
+                for elem in matches
+                if self._matches(elem, attrs, line_number, contains, refresh=True)
+            ]
+            refresh = not matches
+        else:
+            refresh = False
+        if not matches and (refresh or attrs and line_number is None):
+            # Elements not created by this document (see
+            # _watch_element_creation) are only found by a full scan
+            matches = [
+                elem
+                for elem in self.dom.getElementsByTagName(tag)
+                if self._matches(elem, attrs, line_number, contains, refresh)
+            ]
+
+        return _single_match(matches, tag, attrs, line_number, contains)
+
+    def find_text(self, pattern, regex=False):
+        """
+        Find text in the paragraphs of the document, even across runs.
 
-                # Handle both single line number and range
-                if isinstance(line_number, range):
-                    if elem_line not in line_number:
-                        continue
-                else:
-                    if elem_line != line_number:
-                        continue
+        The text of a paragraph is the text of its w:t elements, so deleted
+        text (w:delText) is not found. Paragraph texts are extracted once and
+        kept in an index that is updated as the document is edited, and each
+        search is a single pass over the text of the whole document.
 
-            # Check attrs filter
-            if attrs is not None:
-                if not all(
-                    elem.getAttribute(attr_name) == attr_value
-                    for attr_name, attr_value in attrs.items()
-                ):
-                    continue
+        Changes made through this editor, or by adding elements, are picked
+        up. Runs moved and text edited directly in the DOM are picked up when
+        every paragraph is read again, which happens whenever a search finds
+        nothing or finds a match in a paragraph that has changed; a search
+        that does find matches may otherwise miss text changed that way.
 
-            # Check contains filter
-            if contains is not None:
+        Args:
+            pattern: Text to find, in entity notation (&#8220;) or Unicode
+                characters (\u201c), or a regular expression if regex is True
+            regex: If True, pattern is a regular expression (str or compiled)
+
+        Returns:
+            list[TextMatch]: Non-overlapping matches in document order, each
+                with the runs it covers; matches do not span paragraphs
+
+        Example:
+            for match in editor.find_text("Agreement"):
+                first_run = match.runs[0].run
+            matches = editor.find_text(r"Section \\d+", regex=True)
+        """
+        if not regex:
+            pattern = re.escape(html.unescape(pattern))
+        pattern = re.compile(pattern)
+
+        found = self._find_in_joined_text(pattern)
+        if not found or self._hits_are_stale(found):
+            # Text moved or changed directly in the DOM may be in any
+            # paragraph, so read them all again, as get_node falls back to
+            # a full scan; the search is only repeated if something changed
+            self._refresh_paragraph_text()
+            if self._joined_text is None:
+                found = self._find_in_joined_text(pattern)
+
+        matches = []
+        for paragraph, offset, match in found:
+            start, end = match.start() - offset, match.end() - offset
+            _, paragraph_text, segments = self._paragraph_text[paragraph]
+            if end > len(paragraph_text):
+                continue
+            runs = [
+                RunSpan(
+                    text_element.parentNode,
+                    text_element,
+                    max(start, segment_start) - segment_start,
+                    min(end, segment_end) - segment_start,
+                )
+                for segment_start, segment_end, text_element in segments
+                if segment_start < end and segment_end > start
+            ]
+            matches.append(TextMatch(paragraph, start, end, match.group(), runs))
+        return matches
+
+    def _find_in_joined_text(self, pattern):
+        """Return (paragraph, its offset, match) for each match in the joined text."""
+        text, starts, paragraphs = self._get_joined_text()
+        found = []
+        for match in pattern.finditer(text):
+            if match.start() == match.end():
+                continue
+            index = bisect.bisect_right(starts, match.start()) - 1
+            found.append((paragraphs[index], starts[index], match))
+        return found
+
+    def _hits_are_stale(self, found):
+        """Return True if a paragraph with a match was changed directly in the DOM."""
+        stale = False
+        for paragraph in {paragraph for paragraph, _, _ in found}:
+            old_text = self._paragraph_text[paragraph][1]
+            if not self._is_attached(paragraph):
+                stale = True
+            elif self._read_paragraph_text(paragraph)[1] != old_text:
+                stale = True
+        return stale
+
+    def _refresh_paragraph_text(self):
+        """Read the text of every paragraph in the document again."""
+        paragraphs = self.dom.getElementsByTagName("w:p")
+        if self._paragraphs is None or len(paragraphs) != len(self._paragraphs):
+            self._joined_text = None
+        elif any(new is not old for new, old in zip(paragraphs, self._paragraphs)):
+            self._joined_text = None
+        self._paragraphs = paragraphs
+        # Paragraphs no longer in the document are dropped
+        self._paragraph_text = {
+            paragraph: self._paragraph_text[paragraph]
+            for paragraph in paragraphs
+            if paragraph in self._paragraph_text
+        }
+        for paragraph in paragraphs:
+            self._read_paragraph_text(paragraph)
+
+    def _matches(self, elem, attrs, line_number, contains, refresh=False):
+        """Return True if an element is in the document and passes every filter."""
+        # Check line_number filter
+        if line_number is not None:
+            parse_pos = getattr(elem, "parse_position", (None,))
+            elem_line = parse_pos[0]
+
+            # Handle both single line number and range
+            if isinstance(line_number, range):
+                if elem_line not in line_number:
+                    return False
+            else:
+                if elem_line != line_number:
+                    return False
+
+        # Check attrs filter
+        if attrs is not None:
+            if not all(
+                elem.getAttribute(attr_name) == attr_value
+                for attr_name, attr_value in attrs.items()
+            ):
+                return False
+
+        # Checked after the cheaper filters, as it walks up to the document
+        if not self._is_attached(elem):
+            return False
+
+        # Check contains filter
+        if contains is not None:
+            if elem.tagName == "w:p":
+                if refresh or elem not in self._paragraph_text:
+                    self._read_paragraph_text(elem)
+                elem_text = self._paragraph_text[elem][0]
+            else:
                 elem_text = self._get_element_text(elem)
-                # Normalize the search string: convert HTML entities to Unicode characters
-                # This allows searching for both "&#8220;Rowan" and ""Rowan"
-                normalized_contains = html.unescape(contains)
-                if normalized_contains not in elem_text:
-                    continue
+            # Normalize the search string: convert HTML entities to Unicode characters
+            # This allows searching for both "&#8220;Rowan" and ""Rowan"
+            normalized_contains = html.unescape(contains)
+            if normalized_contains not in elem_text:
+                return False
 
-            # If all applicable filters passed, this is a match
-            matches.append(elem)
+        return True
 
-        if not matches:
-            # Build descriptive error message
-            filters = []
-            if line_number is not None:
-                line_str = (
-                    f"lines {line_number.start}-{line_number.stop - 1}"
-                    if isinstance(line_number, range)
-                    else f"line {line_number}"
+    def _get_candidates(self, tag, attrs, line_number):
+        """
+        Return the elements that may match a lookup, from the indexes.
+
+        The candidates are a superset of the elements with the tag that are
+        in the document (see get_node); they may include elements that have
+        since been removed or changed, which _matches() filters out.
+        Attributes are not indexed, since they can be set directly in the
+        DOM without the editor noticing.
+        """
+        self._index_created_elements()
+
+        if line_number is not None:
+            # Only parsed elements have a line number, so this index is
+            # never missing an element
+            if tag not in self._line_index:
+                positioned = sorted(
+                    (elem.parse_position[0], i, elem)
+                    for i, elem in enumerate(self._tag_index.get(tag, ()))  # type: ignore
+                    if hasattr(elem, "parse_position")
                 )
-                filters.append(f"at {line_str}")
-            if attrs is not None:
-                filters.append(f"with attributes {attrs}")
-            if contains is not None:
-                filters.append(f"containing '{contains}'")
-
-            filter_desc = " ".join(filters) if filters else ""
-            base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
-
-            # Add helpful hint based on filters used
-            if contains:
-                hint = "Text may be split across elements or use different wording."
-            elif line_number:
-                hint = "Line numbers may have changed if document was modified."
-            elif attrs:
-                hint = "Verify attribute values are correct."
+                self._line_index[tag] = (
+                    [line for line, _, _ in positioned],
+                    [elem for _, _, elem in positioned],
+                )
+            lines, elements = self._line_index[tag]
+            if isinstance(line_number, range):
+                if not line_number:
+                    return []
+                first, last = min(line_number), max(line_number)
             else:
-                hint = "Try adding filters (attrs, line_number, or contains)."
+                first = last = line_number
+            start = bisect.bisect_left(lines, first)
+            return elements[start : bisect.bisect_right(lines, last, lo=start)]
+
+        return self._tag_index.get(tag, ())  # type: ignore
+
+    def _index_created_elements(self):
+        """Build the tag index, or add the elements created since to it."""
+        if self._tag_index is None:
+            self._tag_index = {}
+            for elem in self.dom.getElementsByTagName("*"):
+                self._tag_index.setdefault(elem.tagName, []).append(elem)
+            # Elements not in the document yet are indexed once they are added
+            self._created = [e for e in self._created if not self._is_attached(e)]
+            return
+
+        pending = []
+        for elem in self._created:
+            if not self._is_attached(elem):
+                pending.append(elem)
+                continue
+            self._tag_index.setdefault(elem.tagName, []).append(elem)
+            self._forget_text(elem)
+        self._created = pending
+
+    def _forget_text(self, elem):
+        """Drop the indexed text of the paragraphs an added element is part of."""
+        if elem.tagName == "w:p":
+            self._paragraphs = None
+            self._joined_text = None
+        node = elem.parentNode
+        while node is not None and node.nodeType == node.ELEMENT_NODE:
+            if node.tagName == "w:p" and self._paragraph_text.pop(node, None):
+                self._joined_text = None
+            node = node.parentNode
+
+    def _get_joined_text(self):
+        """
+        Return the text of all paragraphs, joined by newlines.
 
-            raise ValueError(f"{base_msg}. {hint}")
-        if len(matches) > 1:
-            raise ValueError(
-                f"Multiple nodes found: <{tag}>. "
-                f"Add more filters (attrs, line_number, or contains) to narrow the search."
-            )
-        return matches[0]
+        Returns:
+            tuple: (joined text, offset of each paragraph in it, paragraphs)
+        """
+        self._index_created_elements()
+        if self._paragraphs is None:
+            self._paragraphs = self.dom.getElementsByTagName("w:p")
+            self._joined_text = None
+
+        if self._joined_text is None:
+            texts = []
+            starts = []
+            offset = 0
+            for paragraph in self._paragraphs:
+                if paragraph not in self._paragraph_text:
+                    self._read_paragraph_text(paragraph)
+                text = self._paragraph_text[paragraph][1]
+                texts.append(text)
+                starts.append(offset)
+                offset += len(text) + 1
+            self._joined_text = ("\n".join(texts), starts)
+        return (*self._joined_text, self._paragraphs)
+
+    def _read_paragraph_text(self, paragraph):
+        """
+        Extract the text of a paragraph and store it in the text index.
+
+        Returns:
+            tuple: (text as _get_element_text returns it, for get_node;
+                text of the paragraph's w:t elements, excluding nested
+                paragraphs, for find_text; (start, end, w:t element) for
+                each of those w:t elements)
+        """
+        contains_parts = []
+        text_parts = []
+        segments = []
+        offset = 0
+
+        def visit(elem, nested):
+            nonlocal offset
+            for node in elem.childNodes:
+                if node.nodeType == node.TEXT_NODE:
+                    # Skip whitespace-only text nodes (XML formatting)
+                    if node.data.strip():
+                        contains_parts.append(node.data)
+                elif node.nodeType == node.ELEMENT_NODE:
+                    if node.tagName == "w:t" and not nested:
+                        text = "".join(
+                            child.data
+                            for child in node.childNodes
+                            if child.nodeType == child.TEXT_NODE
+                        )
+                        text_parts.append(text)
+                        segments.append((offset, offset + len(text), node))
+                        offset += len(text)
+                    visit(node, nested or node.tagName == "w:p")
+
+        visit(paragraph, False)
+        entry = ("".join(contains_parts), "".join(text_parts), segments)
+        if self._paragraph_text.get(paragraph) != entry:
+            self._paragraph_text[paragraph] = entry
+            self._joined_text = None
+        return entry
+
+    def _is_attached(self, node):
+        """Return True if a node is part of the document."""
+        while node is not None:
+            if node is self.dom:
+                return True
+            node = node.parentNode
+        return False
+
+    def _watch_element_creation(self):
+        """
+        Record every element created in the DOM, so the indexes can add it.
+
+        Elements created by replace_node, insert_*, append_to (through
+        importNode), cloneNode and direct createElement calls all go through
+        the document's createElement or createElementNS. Elements from
+        another document that are appended without importNode are not seen,
+        and get_node only finds them with its full-scan fallback.
+        """
+        for name in ("createElement", "createElementNS"):
+            create = getattr(self.dom, name)
+
+            def create_and_record(*args, _create=create):
+                elem = _create(*args)
+                self._created.append(elem)
+                return elem
+
+            setattr(self.dom, name, create_and_record)
 
     def _get_element_text(self, elem):
         """
@@ -287,6 +617,56 @@ class XMLEditor:
             elem.appendChild(node)
         return nodes
 
+    def insert_fragments(self, operations):
+        """
+        Apply many insertions, parsing all their XML fragments at once.
+
+        Each operation runs as the method it names would (including the
+        attributes DocxXMLEditor adds), in order, but the fragments are
+        parsed together instead of with one parser each.
+
+        Args:
+            operations: Iterable of (method, elem, xml_content) tuples, where
+                method is "replace_node", "insert_after", "insert_before" or
+                "append_to"
+
+        Returns:
+            List[List[defusedxml.minidom.Node]]: The inserted nodes of each
+                operation
+
+        Raises:
+            ValueError: If an operation names another method
+            AssertionError: If a fragment contains no element nodes (no
+                operation is applied then)
+
+        Example:
+            editor.insert_fragments([
+                ("insert_after", elem, "<w:r><w:t>A</w:t></w:r>"),
+                ("append_to", para, "<w:r><w:t>B</w:t></w:r>"),
+            ])
+        """
+        operations = list(operations)
+        for method, _, _ in operations:
+            if method not in FRAGMENT_METHODS:
+                raise ValueError(f"Not an insertion method: {method}")
+
+        contents = [xml_content for _, _, xml_content in operations]
+        try:
+            parsed = self._parse_fragments(contents)
+        except xml.parsers.expat.ExpatError:
+            # Report the error for the fragment it is in
+            parsed = [self._parse_fragment(xml_content) for xml_content in contents]
+        for xml_content, nodes in zip(contents, parsed):
+            self._parsed_fragments.setdefault(xml_content, deque()).append(nodes)
+
+        try:
+            return [
+                getattr(self, method)(elem, xml_content)
+                for method, elem, xml_content in operations
+            ]
+        finally:
+            self._parsed_fragments.clear()
+
     def get_next_rid(self):
         """Get the next available rId for relationships files."""
         max_id = 0
@@ -322,26 +702,397 @@ class XMLEditor:
         Raises:
             AssertionError: If fragment contains no element nodes
         """
+        parsed = self._parsed_fragments.get(xml_content)
+        if parsed:
+            return parsed.popleft()
+        return self._parse_fragments([xml_content])[0]
+
+    def _parse_fragments(self, contents):
+        """
+        Parse XML fragments in one document and import each one's nodes.
+
+        Returns:
+            List of lists of defusedxml.minidom.Node objects, one per fragment
+
+        Raises:
+            AssertionError: If a fragment contains no element nodes
+            xml.parsers.expat.ExpatError: If a fragment is not well-formed
+        """
+        wrapper = "".join(
+            f"<fragment>{xml_content}</fragment>" for xml_content in contents
+        )
+        fragment_doc = defusedxml.minidom.parseString(
+            f"<root {self._get_namespace_declarations()}>{wrapper}</root>"
+        )
+
+        parsed = []
+        for fragment in fragment_doc.documentElement.childNodes:  # type: ignore
+            nodes = [
+                self.dom.importNode(child, deep=True) for child in fragment.childNodes
+            ]
+            elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
+            assert elements, "Fragment must contain at least one element"
+            parsed.append(nodes)
+        return parsed
+
+    def _get_namespace_declarations(self):
+        """
+        Return the xmlns declarations of the root element, for fragments.
+
+        The string is built again only when the root's xmlns attributes
+        change, as when DocxXMLEditor declares a namespace it needs.
+        """
         # Extract namespace declarations from the root document element
         root_elem = self.dom.documentElement
-        namespaces = []
-        if root_elem and root_elem.attributes:
-            for i in range(root_elem.attributes.length):
-                attr = root_elem.attributes.item(i)
-                if attr.name.startswith("xmlns"):  # type: ignore
-                    namespaces.append(f'{attr.name}="{attr.value}"')  # type: ignore
-
-        ns_decl = " ".join(namespaces)
-        wrapper = f"<root {ns_decl}>{xml_content}</root>"
-        fragment_doc = defusedxml.minidom.parseString(wrapper)
-        nodes = [
-            self.dom.importNode(child, deep=True)
-            for child in fragment_doc.documentElement.childNodes  # type: ignore
-        ]
-        elements = [n for n in nodes if n.nodeType == n.ELEMENT_NODE]
-        assert elements, "Fragment must contain at least one element"
+        attributes = root_elem.attributes.values() if root_elem else ()
+        pairs = tuple(
+            (attr.name, attr.value)
+            for attr in attributes
+            if attr.name.startswith("xmlns")
+        )
+        cached = self._namespace_declarations
+        if cached is None or cached[0] != pairs:
+            namespaces = " ".join(f'{name}="{value}"' for name, value in pairs)
+            cached = (pairs, namespaces)
+            self._namespace_declarations = cached
+        return cached[1]
+
+
+class LxmlXMLEditor:
+    """
+    Editor for OOXML XML files backed by lxml instead of minidom.
+
+    Finds and edits nodes like XMLEditor, with the same tag and attribute
+    names ("w:p", {"w:id": "1"}) and line numbers (lxml's sourceline), and
+    saves the file the same way. Elements are lxml.etree elements, so code
+    that uses the minidom API directly (like DocxXMLEditor) needs XMLEditor.
+
+    Text between elements is held in the text and tail of lxml elements
+    rather than in text nodes; the editing methods keep it in place, so
+    the formatting of the file is preserved as with XMLEditor.
+
+    Attributes:
+        xml_path: Path to the XML file being edited
+        encoding: Detected encoding of the XML file ('ascii' or 'utf-8')
+        tree: Parsed lxml.etree.ElementTree
+    """
+
+    def __init__(self, xml_path):
+        """
+        Initialize with path to XML file and parse it with lxml.
+
+        Args:
+            xml_path: Path to XML file to edit (str or Path)
+
+        Raises:
+            ValueError: If the XML file does not exist
+        """
+        self.xml_path = Path(xml_path)
+        if not self.xml_path.exists():
+            raise ValueError(f"XML file not found: {xml_path}")
+
+        data = self.xml_path.read_bytes()
+        header = data[:200].decode("utf-8", errors="ignore")
+        self.encoding = "ascii" if 'encoding="ascii"' in header else "utf-8"
+
+        self._parser = lxml.etree.XMLParser(huge_tree=True, resolve_entities=False)
+        self.tree = lxml.etree.fromstring(data, self._parser).getroottree()
+
+        # Element -> line, for files too long for sourceline to be exact
+        self._source_lines = None
+        if data.count(b"\n") >= MAX_SOURCELINE:
+            self._source_lines = dict(
+                zip(self.root.iter(lxml.etree.Element), _start_tag_lines(data))
+            )
+
+    @property
+    def root(self):
+        """The root element of the file."""
+        return self.tree.getroot()
+
+    def get_node(
+        self,
+        tag: str,
+        attrs: Optional[dict[str, str]] = None,
+        line_number: Optional[Union[int, range]] = None,
+        contains: Optional[str] = None,
+    ):
+        """
+        Get an element by tag and identifier, as XMLEditor.get_node does.
+
+        Args:
+            tag: The XML tag name (e.g., "w:del", "w:ins", "w:r")
+            attrs: Dictionary of attribute name-value pairs to match (e.g., {"w:id": "1"})
+            line_number: Line number (int) or line range (range) in original XML file (1-indexed)
+            contains: Text string that must appear in any text node within the element.
+                      Supports both entity notation (&#8220;) and Unicode characters (\u201c).
+
+        Returns:
+            lxml.etree._Element: The matching element
+
+        Raises:
+            ValueError: If node not found or multiple matches found
+        """
+        try:
+            qualified_attrs = (
+                {
+                    self._qualify(name, attribute=True): value
+                    for name, value in attrs.items()
+                }
+                if attrs is not None
+                else None
+            )
+            elements = self._iter_tag(tag)
+        except KeyError:
+            # Attributes with a prefix the file does not declare
+            elements = ()
+        normalized_contains = html.unescape(contains) if contains is not None else None
+
+        matches = []
+        for elem in elements:
+            if line_number is not None:
+                elem_line = (
+                    elem.sourceline
+                    if self._source_lines is None
+                    else self._source_lines.get(elem)
+                )
+                if isinstance(line_number, range):
+                    if elem_line not in line_number:
+                        continue
+                elif elem_line != line_number:
+                    continue
+            if qualified_attrs is not None:
+                if not all(
+                    elem.get(name, "") == value
+                    for name, value in qualified_attrs.items()
+                ):
+                    continue
+            if normalized_contains is not None:
+                if normalized_contains not in self._get_element_text(elem):
+                    continue
+            matches.append(elem)
+
+        return _single_match(matches, tag, attrs, line_number, contains)
+
+    def replace_node(self, elem, new_content):
+        """
+        Replace an element with new XML content.
+
+        Args:
+            elem: lxml.etree._Element to replace
+            new_content: String containing XML to replace the node with
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements (and comments)
+        """
+        nodes = self.insert_before(elem, new_content)
+        nodes[-1].tail = (nodes[-1].tail or "") + (elem.tail or "")
+        elem.getparent().remove(elem)
+        return nodes
+
+    def insert_after(self, elem, xml_content):
+        """
+        Insert XML content after an element.
+
+        Args:
+            elem: lxml.etree._Element to insert after
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements (and comments)
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        # The text that followed elem now follows the inserted content
+        nodes[-1].tail = (nodes[-1].tail or "") + (elem.tail or "")
+        elem.tail = text
+        for node in reversed(nodes):
+            elem.addnext(node)
         return nodes
 
+    def insert_before(self, elem, xml_content):
+        """
+        Insert XML content before an element.
+
+        Args:
+            elem: lxml.etree._Element to insert before
+            xml_content: String containing XML to insert
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements (and comments)
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        previous = elem.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + text
+        else:
+            parent = elem.getparent()
+            parent.text = (parent.text or "") + text
+        for node in nodes:
+            elem.addprevious(node)
+        return nodes
+
+    def append_to(self, elem, xml_content):
+        """
+        Append XML content as a child of an element.
+
+        Args:
+            elem: lxml.etree._Element to append to
+            xml_content: String containing XML to append
+
+        Returns:
+            List[lxml.etree._Element]: All inserted elements (and comments)
+        """
+        text, nodes = self._parse_fragment(xml_content)
+        if len(elem):
+            elem[-1].tail = (elem[-1].tail or "") + text
+        else:
+            elem.text = (elem.text or "") + text
+        elem.extend(nodes)
+        return nodes
+
+    def get_next_rid(self):
+        """Get the next available rId for relationships files."""
+        max_id = 0
+        for rel_elem in self._iter_tag("Relationship"):
+            rel_id = rel_elem.get("Id", "")
+            if rel_id.startswith("rId"):
+                try:
+                    max_id = max(max_id, int(rel_id[3:]))
+                except ValueError:
+                    pass
+        return f"rId{max_id + 1}"
+
+    def save(self):
+        """
+        Save the edited XML back to the file.
+
+        Writes the same XML declaration as XMLEditor.save, preserving the
+        original encoding (ascii or utf-8).
+        """
+        declaration = f'<?xml version="1.0" encoding="{self.encoding}"?>'
+        content = lxml.etree.tostring(
+            self.tree, encoding=self.encoding, xml_declaration=False
+        )
+        self.xml_path.write_bytes(declaration.encode(self.encoding) + content)
+
+    def _iter_tag(self, tag):
+        """Iterate over the elements with a prefixed tag name, in document order."""
+        try:
+            return self.root.iter(self._qualify(tag))
+        except KeyError:
+            # Prefix declared below the root element
+            prefix, _, local_name = tag.rpartition(":")
+            return (
+                elem
+                for elem in self.root.iter(f"{{*}}{local_name}")
+                if elem.prefix == prefix
+            )
+
+    def _qualify(self, name, attribute=False):
+        """
+        Return the {namespace}name form of a prefixed name.
+
+        Raises:
+            KeyError: If the prefix is not declared on the root element
+        """
+        prefix, _, local_name = name.rpartition(":")
+        if prefix == "xml":
+            return f"{{{XML_NAMESPACE}}}{local_name}"
+        if not prefix:
+            namespace = None if attribute else self.root.nsmap.get(None)
+        else:
+            namespace = self.root.nsmap[prefix]
+        return f"{{{namespace}}}{local_name}" if namespace else local_name
+
+    def _get_element_text(self, elem):
+        """Return the text of an element, skipping whitespace-only text."""
+        return "".join(text for text in elem.itertext() if text.strip())
+
+    def _parse_fragment(self, xml_content):
+        """
+        Parse XML fragment with the namespaces of the root element.
+
+        Returns:
+            tuple: (text before the first node, list of parsed nodes)
+
+        Raises:
+            AssertionError: If fragment contains no element nodes
+        """
+        ns_decl = " ".join(
+            f'xmlns:{prefix}="{namespace}"' if prefix else f'xmlns="{namespace}"'
+            for prefix, namespace in self.root.nsmap.items()
+        )
+        wrapper = lxml.etree.fromstring(
+            f"<root {ns_decl}>{xml_content}</root>", self._parser
+        )
+        nodes = list(wrapper)
+        assert any(isinstance(node.tag, str) for node in nodes), (
+            "Fragment must contain at least one element"
+        )
+        # New elements have no line in the original file
+        for node in nodes:
+            for elem in node.iter():
+                elem.sourceline = 0
+        return wrapper.text or "", nodes
+
+
+def _start_tag_lines(data):
+    """Return the line number of every start tag in an XML file, in order."""
+    lines = []
+    line = 1
+    position = 0
+    for match in MARKUP_START_PATTERN.finditer(data):
+        if match.group(1) is not None:
+            line += data.count(b"\n", position, match.start())
+            position = match.start()
+            lines.append(line)
+    return lines
+
+
+def _single_match(matches, tag, attrs, line_number, contains):
+    """
+    Return the only element found by get_node.
+
+    Raises:
+        ValueError: If no element or several elements were found, with a
+            message describing the filters used
+    """
+    if not matches:
+        # Build descriptive error message
+        filters = []
+        if line_number is not None:
+            line_str = (
+                f"lines {line_number.start}-{line_number.stop - 1}"
+                if isinstance(line_number, range)
+                else f"line {line_number}"
+            )
+            filters.append(f"at {line_str}")
+        if attrs is not None:
+            filters.append(f"with attributes {attrs}")
+        if contains is not None:
+            filters.append(f"containing '{contains}'")
+
+        filter_desc = " ".join(filters) if filters else ""
+        base_msg = f"Node not found: <{tag}> {filter_desc}".strip()
+
+        # Add helpful hint based on filters used
+        if contains:
+            hint = "Text may be split across elements or use different wording."
+        elif line_number:
+            hint = "Line numbers may have changed if document was modified."
+        elif attrs:
+            hint = "Verify attribute values are correct."
+        else:
+            hint = "Try adding filters (attrs, line_number, or contains)."
+
+        raise ValueError(f"{base_msg}. {hint}")
+    if len(matches) > 1:
+        raise ValueError(
+            f"Multiple nodes found: <{tag}>. "
+            f"Add more filters (attrs, line_number, or contains) to narrow the search."
+        )
+    return matches[0]
+
 
 def _create_line_tracking_parser():
     """
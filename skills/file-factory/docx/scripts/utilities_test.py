@@ -0,0 +1,285 @@
+import tempfile
+import unittest
+import xml.parsers.expat
+from pathlib import Path
+
+import lxml.etree
+
+from utilities import LxmlXMLEditor, XMLEditor
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+DOCUMENT = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:document {W}>
+  <w:body>
+    <w:p w:id="1">
+      <w:r>
+        <w:t>first</w:t>
+      </w:r>
+    </w:p>
+    <w:p w:id="2">
+      <w:r>
+        <w:t>second</w:t>
+      </w:r>
+    </w:p>
+  </w:body>
+</w:document>
+"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestGetNode(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        path = Path(self.temp_dir.name) / "document.xml"
+        path.write_text(DOCUMENT)
+        self.editor = XMLEditor(path)
+
+    def test_lookups(self):
+        second = self.editor.get_node(tag="w:p", attrs={"w:id": "2"})
+        self.assertIs(self.editor.get_node(tag="w:p", line_number=9), second)
+        self.assertIs(self.editor.get_node(tag="w:p", line_number=range(5, 10)), second)
+        self.assertIs(self.editor.get_node(tag="w:p", contains="second"), second)
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p")
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", line_number=range(10, 10))
+
+    def test_editor_changes(self):
+        first = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        self.editor.insert_after(
+            first, '<w:p w:id="3"><w:r><w:t>third</w:t></w:r></w:p>'
+        )
+        third = self.editor.get_node(tag="w:p", attrs={"w:id": "3"})
+        self.assertIs(
+            self.editor.get_node(tag="w:t", contains="third").parentNode.parentNode,
+            third,
+        )
+
+        self.editor.replace_node(first, '<w:p w:id="1"><w:r><w:t>new</w:t></w:r></w:p>')
+        self.assertIsNot(self.editor.get_node(tag="w:p", attrs={"w:id": "1"}), first)
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", line_number=4)
+
+    def test_direct_dom_changes(self):
+        first = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        second = self.editor.get_node(tag="w:p", attrs={"w:id": "2"})
+
+        # Moved and re-identified elements
+        second.parentNode.insertBefore(second, first)
+        first.setAttribute("w:id", "4")
+        self.assertIs(self.editor.get_node(tag="w:p", line_number=9), second)
+        self.assertIs(self.editor.get_node(tag="w:p", attrs={"w:id": "4"}), first)
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+
+        # A value set directly that another element already has
+        self.assertIs(self.editor.get_node(tag="w:p", attrs={"w:id": "4"}), first)
+        second.setAttribute("w:id", "4")
+        with self.assertRaisesRegex(ValueError, "Multiple nodes found"):
+            self.editor.get_node(tag="w:p", attrs={"w:id": "4"})
+        second.setAttribute("w:id", "2")
+
+        # Created and cloned elements
+        body = first.parentNode
+        created = self.editor.dom.createElement("w:p")
+        created.setAttribute("w:id", "5")
+        body.appendChild(created)
+        clone = second.cloneNode(True)
+        clone.setAttribute("w:id", "6")
+        body.appendChild(clone)
+        self.assertIs(self.editor.get_node(tag="w:p", attrs={"w:id": "5"}), created)
+        self.assertIs(self.editor.get_node(tag="w:p", attrs={"w:id": "6"}), clone)
+        with self.assertRaises(ValueError):
+            self.editor.get_node(tag="w:p", contains="second")
+
+        body.removeChild(second)
+        self.assertIs(self.editor.get_node(tag="w:p", contains="second"), clone)
+
+        # Text edited in place
+        second.getElementsByTagName("w:t")[0].firstChild.data = "changed"
+        clone.getElementsByTagName("w:t")[0].firstChild.data = "changed"
+        self.assertIs(self.editor.get_node(tag="w:p", contains="changed"), clone)
+
+
+class TestInsertFragments(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def edit(self, batch):
+        path = Path(self.temp_dir.name) / f"{batch}.xml"
+        path.write_text(DOCUMENT)
+        editor = XMLEditor(path)
+        first = editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        second = editor.get_node(tag="w:p", attrs={"w:id": "2"})
+        operations = [
+            ("insert_before", first, "<w:p/>"),
+            ("append_to", first, "<w:r><w:t>a</w:t></w:r>"),
+            ("insert_after", second, "<w:p/><w:p/>"),
+            ("replace_node", second, "<w:p><w:r><w:t>b</w:t></w:r></w:p>"),
+            ("append_to", first, "<w:r><w:t>a</w:t></w:r>"),
+        ]
+        if batch:
+            results = editor.insert_fragments(operations)
+        else:
+            results = [getattr(editor, m)(e, x) for m, e, x in operations]
+        return editor, [len(nodes) for nodes in results]
+
+    def test_same_as_separate_calls(self):
+        batch, batch_counts = self.edit(batch=True)
+        separate, separate_counts = self.edit(batch=False)
+        self.assertEqual(batch_counts, [1, 1, 2, 1, 1])
+        self.assertEqual(batch_counts, separate_counts)
+        self.assertEqual(batch.dom.toxml(), separate.dom.toxml())
+        self.assertEqual(batch._parsed_fragments, {})
+
+    def test_errors(self):
+        path = Path(self.temp_dir.name) / "document.xml"
+        path.write_text(DOCUMENT)
+        editor = XMLEditor(path)
+        first = editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        with self.assertRaises(ValueError):
+            editor.insert_fragments([("remove", first, "<w:p/>")])
+        with self.assertRaises(xml.parsers.expat.ExpatError):
+            editor.insert_fragments(
+                [("insert_after", first, "<w:p/>"), ("insert_after", first, "<w:p>")]
+            )
+        with self.assertRaises(AssertionError):
+            editor.insert_fragments([("insert_after", first, "text")])
+        self.assertEqual(len(editor.dom.getElementsByTagName("w:p")), 2)
+
+        # Namespaces declared on the root later are available to fragments
+        editor.dom.documentElement.setAttribute("xmlns:x", "urn:x")
+        editor.insert_fragments([("append_to", first, "<x:y/>")])
+        self.assertEqual(first.lastChild.namespaceURI, "urn:x")
+
+        # As are changes to their values
+        editor.dom.documentElement.setAttribute("xmlns:x", "urn:y")
+        editor.insert_fragments([("append_to", first, "<x:y/>")])
+        self.assertEqual(first.lastChild.namespaceURI, "urn:y")
+
+
+class TestFindText(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        path = Path(self.temp_dir.name) / "document.xml"
+        path.write_text(DOCUMENT)
+        self.editor = XMLEditor(path)
+        first = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        self.editor.append_to(first, "<w:r><w:t>hand</w:t></w:r>")
+
+    def test_across_runs(self):
+        matches = self.editor.find_text("first")
+        self.assertEqual(len(matches), 1)
+        match = matches[0]
+        self.assertEqual((match.start, match.end, match.text), (0, 5, "first"))
+
+        (match,) = self.editor.find_text("sthan")
+        self.assertEqual((match.start, match.end), (3, 8))
+        self.assertEqual(
+            [(span.start, span.end) for span in match.runs], [(3, 5), (0, 3)]
+        )
+        self.assertEqual(
+            [span.text_element.firstChild.data for span in match.runs],
+            ["first", "hand"],
+        )
+        self.assertEqual(match.runs[1].run.tagName, "w:r")
+
+    def test_regex(self):
+        matches = self.editor.find_text(r"(fir|sec)\w+", regex=True)
+        self.assertEqual([match.text for match in matches], ["firsthand", "second"])
+        # Matches do not span paragraphs
+        self.assertEqual(self.editor.find_text(r"hand\s*second", regex=True), [])
+
+    def test_after_edits(self):
+        (match,) = self.editor.find_text("second")
+        self.editor.replace_node(
+            match.runs[0].run, "<w:r><w:delText>second</w:delText></w:r>"
+        )
+        self.assertEqual(self.editor.find_text("second"), [])
+        self.editor.insert_after(
+            match.paragraph, "<w:p><w:r><w:t>second again</w:t></w:r></w:p>"
+        )
+        self.assertEqual(self.editor.find_text("second")[0].end, 6)
+
+    def test_direct_dom_changes(self):
+        first = self.editor.get_node(tag="w:p", attrs={"w:id": "1"})
+        second = self.editor.get_node(tag="w:p", attrs={"w:id": "2"})
+        self.assertEqual(len(self.editor.find_text("hand")), 1)
+
+        # A run moved to another paragraph, found by its old and new text
+        second.appendChild(first.getElementsByTagName("w:r")[1])
+        (match,) = self.editor.find_text("hand")
+        self.assertIs(match.paragraph, second)
+        (match,) = self.editor.find_text("secondhand")
+        self.assertEqual((match.start, match.end), (0, 10))
+
+        # Text edited in place
+        second.getElementsByTagName("w:t")[0].firstChild.data = "other"
+        self.assertEqual(self.editor.find_text("second"), [])
+        self.assertEqual(len(self.editor.find_text("otherhand")), 1)
+
+
+class TestLxmlXMLEditor(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def write(self, name, content):
+        path = Path(self.temp_dir.name) / name
+        path.write_text(content)
+        return path
+
+    def test_same_result_as_minidom(self):
+        results = []
+        for editor_class in (XMLEditor, LxmlXMLEditor):
+            editor = editor_class(self.write(editor_class.__name__, DOCUMENT))
+            first = editor.get_node(tag="w:p", attrs={"w:id": "1"})
+            second = editor.get_node(tag="w:p", line_number=9, contains="second")
+            editor.insert_before(first, "<w:p/>")
+            editor.insert_after(first, "<!--note--><w:p><w:r/></w:p>tail")
+            editor.append_to(second, "<w:r><w:t>\u201cmore\u201d</w:t></w:r>")
+            editor.replace_node(
+                editor.get_node(tag="w:t", contains="&#8220;more"),
+                "<w:t xml:space='preserve'> last</w:t>",
+            )
+            editor.save()
+            results.append(lxml.etree.tostring(lxml.etree.parse(editor.xml_path)))
+        self.assertEqual(results[0], results[1])
+
+    def test_line_numbers(self):
+        editor = LxmlXMLEditor(self.write("document.xml", DOCUMENT))
+        second = editor.get_node(tag="w:p", line_number=range(5, 10))
+        (new,) = editor.insert_after(second, "<w:p/>")
+        self.assertIsNone(new.sourceline)
+
+        # Past the lines libxml2 records exactly
+        padding = "\n" * 70000
+        path = self.write(
+            "long.xml", DOCUMENT.replace("<w:body>", f"{padding}<w:body>")
+        )
+        editor = LxmlXMLEditor(path)
+        self.assertIs(
+            editor.get_node(tag="w:p", line_number=70009),
+            editor.get_node(tag="w:p", attrs={"w:id": "2"}),
+        )
+
+    def test_relationships(self):
+        editor = LxmlXMLEditor(
+            self.write(
+                "document.xml.rels",
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+                'relationships"><Relationship Id="rId7"/></Relationships>',
+            )
+        )
+        self.assertEqual(editor.get_next_rid(), "rId8")
+        self.assertEqual(
+            editor.get_node(tag="Relationship", attrs={"Id": "rId7"}).get("Id"), "rId7"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
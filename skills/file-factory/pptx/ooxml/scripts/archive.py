@@ -0,0 +1,229 @@
+"""
+Zip helpers shared by pack.py, unpack.py and package.py.
+
+Members are compressed once and written with their compressed data as is,
+so parts can be compressed in worker processes and unchanged members can
+be copied from an original package without being recompressed.
+"""
+
+import contextlib
+import os
+import struct
+import uuid
+import zipfile
+import zlib
+from pathlib import Path
+
+# Formats that are already compressed, stored as is instead of deflated again
+STORED_EXTENSIONS = {
+    # Images
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".webp",
+    # Audio and video
+    ".mp3",
+    ".m4a",
+    ".aac",
+    ".ogg",
+    ".wma",
+    ".mp4",
+    ".m4v",
+    ".mov",
+    ".wmv",
+    ".webm",
+    # Embedded packages
+    ".zip",
+    ".docx",
+    ".xlsx",
+    ".pptx",
+}
+
+# Timestamp and permissions of every member in deterministic mode
+DETERMINISTIC_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+DETERMINISTIC_EXTERNAL_ATTR = 0o100644 << 16  # Regular file, rw-r--r--
+
+
+def compress_data(
+    zinfo, data, compresslevel=None, source_info=None, original_file=None
+):
+    """Compress the content of a part for writing with write_compressed_member.
+
+    Args:
+        zinfo: ZipInfo for the member; its CRC, sizes and compression type
+            are filled in
+        data: Uncompressed content of the part
+        compresslevel: Deflate level, or None for zlib's default
+        source_info: ZipInfo of the same member in the original package, if any
+        original_file: The original package source_info belongs to, read to
+            confirm that the content is unchanged
+
+    Returns:
+        tuple: (zinfo, compressed data), where the data is None if the
+        content is unchanged from source_info
+    """
+    zinfo.file_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    if source_info is not None and _same_content(
+        original_file, source_info, zinfo, data
+    ):
+        return zinfo, None
+
+    if os.path.splitext(zinfo.filename)[1].lower() in STORED_EXTENSIONS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+        compressed = data
+    else:
+        # Raw deflate, as ZipFile.write() produces for ZIP_DEFLATED
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        level = zlib.Z_DEFAULT_COMPRESSION if compresslevel is None else compresslevel
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        compressed = compressor.compress(data) + compressor.flush()
+
+    zinfo.compress_size = len(compressed)
+    return zinfo, compressed
+
+
+@contextlib.contextmanager
+def replace_on_success(output_file):
+    """Yield a temporary path next to output_file and move it there on success.
+
+    If the block raises, the temporary file is removed and output_file is
+    left as it was, so a failed pack never leaves a partial package behind.
+    """
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = output_file.with_name(f".{output_file.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        yield temp_file
+        os.replace(temp_file, output_file)
+    except BaseException:
+        temp_file.unlink(missing_ok=True)
+        raise
+
+
+def _same_content(original_file, source_info, zinfo, data):
+    """Return True if a member of the original package holds exactly data.
+
+    The CRC and size rule out most changes without reading the original;
+    when they match, the member is decompressed and compared byte for byte,
+    since different contents can share a CRC.
+    """
+    if (source_info.CRC, source_info.file_size) != (zinfo.CRC, zinfo.file_size):
+        return False
+    if original_file is None:
+        return False
+    with open(original_file, "rb") as source:
+        compressed = read_raw_member(source, source_info)
+    if source_info.compress_type == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(compressed, -15) == data
+    return compressed == data
+
+
+def canonical_order(name):
+    """Sort key putting [Content_Types].xml first and the other parts by name."""
+    return (name != "[Content_Types].xml", name)
+
+
+def make_deterministic(zinfo):
+    """Replace the metadata of a member that depends on the environment."""
+    zinfo.date_time = DETERMINISTIC_DATE_TIME
+    zinfo.external_attr = DETERMINISTIC_EXTERNAL_ATTR
+    zinfo.create_system = 3  # Unix, which the permissions are written for
+
+
+def copyable_members(original_file):
+    """Return {name: ZipInfo} for the members of a package that can be copied raw.
+
+    Encrypted members and compression methods other than store and deflate
+    are left out; those parts are always compressed again.
+    """
+    with zipfile.ZipFile(original_file) as original:
+        return {
+            info.filename: info
+            for info in original.infolist()
+            if not info.flag_bits & 0x1
+            and info.compress_type in {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED}
+        }
+
+
+def copy_zipinfo(info):
+    """Return a ZipInfo for writing a member copied raw from another zip."""
+    zinfo = zipfile.ZipInfo(info.filename, info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.external_attr = info.external_attr
+    zinfo.CRC = info.CRC
+    zinfo.file_size = info.file_size
+    zinfo.compress_size = info.compress_size
+    return zinfo
+
+
+def read_raw_member(source, info):
+    """Read the compressed data of a member straight from an open zip file."""
+    source.seek(info.header_offset)
+    header = source.read(zipfile.sizeFileHeader)
+    if header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+
+    # The local header is followed by the file name and extra field
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    source.seek(name_length + extra_length, os.SEEK_CUR)
+    return source.read(info.compress_size)
+
+
+def write_compressed_member(zf, zinfo, compressed):
+    """Append a member whose data is already compressed to a zip being written.
+
+    zinfo must carry the compression type, CRC and both sizes; the data is
+    written as is, after the local file header. This goes through ZipFile
+    internals (see _supports_raw_writes); if they are not there, the data is
+    decompressed and written with writestr() instead.
+    """
+    if not _supports_raw_writes(zf):
+        if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+            compressed = zlib.decompress(compressed, -15)
+        zf.writestr(zinfo, compressed)
+        return
+
+    zinfo.header_offset = zf.fp.tell()
+    zf.fp.write(zinfo.FileHeader())
+    zf.fp.write(compressed)
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+    zf.start_dir = zf.fp.tell()
+
+
+def _supports_raw_writes(zf):
+    """Return True if a zip being written has the internals raw writes use.
+
+    write_compressed_member appends to the open file and the member lists
+    the central directory is written from, as ZipFile.writestr() does.
+    """
+    return (
+        isinstance(getattr(zf, "filelist", None), list)
+        and isinstance(getattr(zf, "NameToInfo", None), dict)
+        and isinstance(getattr(zf, "start_dir", None), int)
+        and hasattr(getattr(zf, "fp", None), "tell")
+        and hasattr(zipfile.ZipInfo, "FileHeader")
+        and not getattr(zf, "_writing", False)
+    )
+
+
+def member_path(output_path, name):
+    """Return where ZipFile.extract() would write a member.
+
+    Absolute paths, drive letters and '..' components are removed the same
+    way, so no part can be written outside the output directory.
+    """
+    arcname = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, os.path.sep)
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = (
+        x for x in arcname.split(os.path.sep) if x not in ("", os.curdir, os.pardir)
+    )
+    return Path(output_path, *parts)
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
@@ -0,0 +1,173 @@
+import copy
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest import mock
+from xml.parsers.expat import ExpatError
+
+from package import OOXMLPackage
+from unpack import pretty_print_xml
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+DOCUMENT = f"<w:document {W}><w:body><w:p/></w:body></w:document>".encode()
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestOOXMLPackage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.original = Path(self.temp_dir.name) / "original.docx"
+        self.output = Path(self.temp_dir.name) / "output.docx"
+        with zipfile.ZipFile(self.original, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", b"<Types/>")
+            zf.writestr("word/document.xml", DOCUMENT)
+            zf.writestr("word/styles.xml", b"<styles/>")
+            zf.writestr("word/media/image1.png", b"\x89PNG" * 100)
+
+    def assertCopiedRaw(self, name):
+        """The member must have been copied without being compressed again."""
+        with zipfile.ZipFile(self.original) as old, zipfile.ZipFile(self.output) as new:
+            old_info, new_info = old.getinfo(name), new.getinfo(name)
+            self.assertEqual(new_info.date_time, old_info.date_time)
+            self.assertEqual(new_info.compress_size, old_info.compress_size)
+            self.assertEqual(new.read(name), old.read(name))
+
+    def read_output(self):
+        with zipfile.ZipFile(self.output) as zf:
+            self.assertIsNone(zf.testzip())
+            return {name: zf.read(name) for name in zf.namelist()}
+
+    def test_unchanged_package(self):
+        with OOXMLPackage(self.original) as package:
+            package.save(self.output)
+
+        self.assertEqual(
+            list(self.read_output()),
+            [
+                "[Content_Types].xml",
+                "word/document.xml",
+                "word/styles.xml",
+                "word/media/image1.png",
+            ],
+        )
+        for name in self.read_output():
+            self.assertCopiedRaw(name)
+
+    def test_write_add_and_delete(self):
+        with OOXMLPackage(self.original) as package:
+            package.write_bytes("word/styles.xml", b"<styles><style/></styles>")
+            package.write_bytes("word/comments.xml", b"<comments/>")
+            package.delete("word/media/image1.png")
+            self.assertNotIn("word/media/image1.png", package)
+            with self.assertRaises(KeyError):
+                package.read_bytes("word/media/image1.png")
+            package.save(self.output)
+
+        parts = self.read_output()
+        self.assertEqual(parts["word/styles.xml"], b"<styles><style/></styles>")
+        self.assertEqual(parts["word/comments.xml"], b"<comments/>")
+        self.assertNotIn("word/media/image1.png", parts)
+        self.assertCopiedRaw("word/document.xml")
+
+    def test_tree(self):
+        with OOXMLPackage(self.original) as package:
+            tree = package.get_tree("word/document.xml")
+            self.assertIs(package.get_tree("word/document.xml"), tree)
+            tree.getroot()[0].append(copy.deepcopy(tree.getroot()[0][0]))
+            package.save(self.output)
+
+        document = self.read_output()["word/document.xml"]
+        self.assertEqual(document.count(b"<w:p/>"), 2)
+        self.assertCopiedRaw("word/styles.xml")
+
+    def test_unedited_tree(self):
+        with OOXMLPackage(self.original) as package:
+            tree = package.get_tree("word/document.xml")
+            self.assertFalse(package.is_modified("word/document.xml"))
+            self.assertEqual(package.read_bytes("word/document.xml"), DOCUMENT)
+            package.save(self.output)
+            self.assertCopiedRaw("word/document.xml")
+
+            # An edit undone leaves the part unchanged again
+            paragraph = tree.getroot()[0][0]
+            paragraph.set("a", "b")
+            self.assertTrue(package.is_modified("word/document.xml"))
+            del paragraph.attrib["a"]
+            self.assertFalse(package.is_modified("word/document.xml"))
+
+            # Trees of parts that were already changed keep their bytes
+            styles = b'<?xml version="1.0"?>\n<styles ></styles>'
+            package.write_bytes("word/styles.xml", styles)
+            package.get_tree("word/styles.xml")
+            self.assertTrue(package.is_modified("word/styles.xml"))
+            self.assertEqual(package.read_bytes("word/styles.xml"), styles)
+
+    def test_tree_keeps_declaration(self):
+        declaration = b"<?xml version='1.0' encoding='UTF-8' standalone='no'?>\r\n"
+        with OOXMLPackage(self.original) as package:
+            package.write_bytes("word/styles.xml", declaration + b"<styles/>")
+            package.get_tree("word/styles.xml").getroot().set("a", "b")
+            self.assertEqual(
+                package.read_bytes("word/styles.xml"),
+                declaration + b'<styles a="b"/>',
+            )
+
+            # Parts without a declaration get the one Office writes
+            body = package.get_tree("word/document.xml").getroot()[0]
+            body.remove(body[0])
+            self.assertEqual(
+                package.read_bytes("word/document.xml"),
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+                b"<w:document " + W.encode() + b"><w:body/></w:document>",
+            )
+
+    def test_materialize(self):
+        with OOXMLPackage(self.original) as package:
+            path = package.materialize("word/document.xml")
+            self.assertEqual(path.read_bytes(), pretty_print_xml(DOCUMENT))
+            self.assertFalse(package.is_modified("word/document.xml"))
+
+            # Unedited materialized parts are still copied as is
+            package.save(self.output)
+            self.assertCopiedRaw("word/document.xml")
+
+            path.write_text(path.read_text().replace("<w:p/>", "<w:p/><w:p/>"))
+            self.assertTrue(package.is_modified("word/document.xml"))
+            package.save(self.output)
+
+            # Switching to a tree keeps the edit made to the file
+            tree = package.get_tree("word/document.xml")
+            self.assertEqual(len(tree.getroot()[0]), 2)
+            self.assertFalse(path.exists())
+
+        self.assertIn(b"<w:p/><w:p/></w:body>", self.read_output()["word/document.xml"])
+
+    def test_failed_save_writes_nothing(self):
+        with OOXMLPackage(self.original) as package:
+            package.materialize("word/styles.xml").write_text("<styles>")
+            with self.assertRaises(ExpatError):
+                package.save(self.output)
+
+            package.write_bytes("word/styles.xml", b"<styles/>")
+            with mock.patch(
+                "package.write_compressed_member",
+                side_effect=RuntimeError("disk full"),
+            ):
+                with self.assertRaises(RuntimeError):
+                    package.save(self.output)
+        self.assertFalse(self.output.exists())
+        self.assertEqual(
+            [path.name for path in self.output.parent.iterdir()], ["original.docx"]
+        )
+
+    def test_cannot_overwrite_original(self):
+        with OOXMLPackage(self.original) as package:
+            with self.assertRaises(ValueError):
+                package.save(self.original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import soffice
+from soffice import SofficeError, SofficePool, SofficeTimeout, _ListeningSlot
+
+# Stands in for soffice --convert-to: records its arguments, then writes the
+# output file unless the input's name asks it to fail or hang
+FAKE_SOFFICE = f"""#!{sys.executable}
+import json, sys, time
+from pathlib import Path
+
+args = sys.argv[1:]
+with open(Path(__file__).with_name("calls.jsonl"), "a") as calls:
+    calls.write(json.dumps(args) + "\\n")
+source = Path(args[-1])
+if "hang" in source.name:
+    time.sleep(60)
+if "broken" in source.name:
+    sys.exit("Error: source file could not be loaded")
+extension = args[args.index("--convert-to") + 1].split(":")[0]
+outdir = Path(args[args.index("--outdir") + 1])
+(outdir / f"{{source.stem}}.{{extension}}").write_text("converted")
+"""
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestCommandSlots(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.soffice = self.root / "soffice"
+        self.soffice.write_text(FAKE_SOFFICE)
+        self.soffice.chmod(0o755)
+        self.output_dir = self.root / "out"
+
+    def document(self, name):
+        path = self.root / name
+        path.write_text("document")
+        return path
+
+    def calls(self):
+        return (self.root / "calls.jsonl").read_text().splitlines()
+
+    def test_convert(self):
+        with SofficePool(soffice=str(self.soffice), use_uno=False) as pool:
+            output = pool.convert(self.document("report.docx"), self.output_dir, "pdf")
+        self.assertEqual(output, self.output_dir.resolve() / "report.pdf")
+        self.assertEqual(output.read_text(), "converted")
+
+        # A single slot keeps the user's profile
+        (call,) = self.calls()
+        self.assertIn('"--headless"', call)
+        self.assertNotIn("UserInstallation", call)
+
+    def test_concurrent_slots_get_own_profiles(self):
+        with SofficePool(size=2, soffice=str(self.soffice), use_uno=False) as pool:
+            with pool._slot() as first, pool._slot() as second:
+                self.assertIsNone(first.profile)
+                self.assertIsNotNone(second.profile)
+                self.output_dir.mkdir()
+                second.convert(
+                    self.document("notes.docx").resolve(),
+                    self.output_dir.resolve(),
+                    "html:HTML",
+                    10,
+                )
+        self.assertIn(
+            f"-env:UserInstallation={second.profile.as_uri()}", self.calls()[0]
+        )
+        self.assertTrue((self.output_dir / "notes.html").exists())
+
+    def test_errors(self):
+        with SofficePool(soffice=str(self.soffice), use_uno=False) as pool:
+            with self.assertRaisesRegex(SofficeError, "could not be loaded"):
+                pool.convert(self.document("broken.docx"), self.output_dir, "pdf")
+
+            start = time.monotonic()
+            with self.assertRaises(SofficeTimeout):
+                pool.convert(
+                    self.document("hang.docx"), self.output_dir, "pdf", timeout=0.5
+                )
+            self.assertLess(time.monotonic() - start, 30)
+
+            with self.assertRaises(SofficeError):
+                pool.recalculate(self.document("book.xlsx"))
+
+        with SofficePool(soffice=str(self.root / "missing"), use_uno=False) as pool:
+            with self.assertRaises(FileNotFoundError):
+                pool.convert(self.document("report.docx"), self.output_dir, "pdf")
+
+
+class TestUnoFallback(unittest.TestCase):
+    def test_without_uno(self):
+        with mock.patch.object(soffice, "uno", None):
+            pool = SofficePool()
+            self.assertFalse(pool.uses_uno)
+            with pool._slot() as slot:
+                self.assertIsInstance(slot, soffice._CommandSlot)
+            pool.close()
+
+            with self.assertRaises(ValueError):
+                SofficePool(use_uno=True)
+
+    def test_hung_instance_is_restarted(self):
+        """The health check of a listening slot is bounded by the timeout"""
+        process = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(60)"]
+        )
+        self.addCleanup(process.kill)
+
+        class Desktop:
+            def getComponents(self):
+                # Answers only once the process is gone
+                process.wait()
+                raise RuntimeError("Connection lost")
+
+        slot = _ListeningSlot(os.devnull + "/soffice", None)
+        slot._process = process
+        slot._desktop = Desktop()
+
+        # Restarting fails without soffice, after the hung process is killed
+        start = time.monotonic()
+        with self.assertRaises(FileNotFoundError):
+            slot._ensure_running(timeout=0.5)
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertIsNotNone(process.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ Validation modules for Word document processing.
 """
 
 from .base import BaseSchemaValidator
+from .cache import ValidationCache
 from .docx import DOCXSchemaValidator
 from .pptx import PPTXSchemaValidator
 from .redlining import RedliningValidator
@@ -12,4 +13,5 @@ __all__ = [
     "DOCXSchemaValidator",
     "PPTXSchemaValidator",
     "RedliningValidator",
+    "ValidationCache",
 ]
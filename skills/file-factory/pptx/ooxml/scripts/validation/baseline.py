@@ -0,0 +1,66 @@
+"""
+Read-only access to the original document used as the validation baseline.
+"""
+
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+
+class BaselineSession:
+    """Read-only access to the parts of the original document.
+
+    The original package is opened once and members are read straight from
+    the zip, so comparing against the baseline never extracts anything to
+    disk. XSD error sets computed for original parts are cached in
+    xsd_errors so each original part is validated at most once.
+    """
+
+    def __init__(self, original_file):
+        self.original_file = Path(original_file)
+
+        # Part name (e.g. "word/document.xml") -> set of XSD error messages
+        self.xsd_errors = {}
+
+        self._zip = None
+
+    def _open(self):
+        """Open the original package on first use."""
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.original_file, "r")
+        return self._zip
+
+    def has_part(self, part_name):
+        """Return True if the original package contains the given part."""
+        return part_name in self._open().NameToInfo
+
+    def read_part(self, part_name):
+        """Return the raw bytes of a part, or None if the original lacks it."""
+        if not self.has_part(part_name):
+            return None
+        return self._open().read(part_name)
+
+    def parse_part(self, part_name):
+        """Parse a part of the original package.
+
+        Returns:
+            lxml.etree._ElementTree, or None if the original lacks the part
+
+        Raises:
+            lxml.etree.XMLSyntaxError: If the part is not well-formed
+        """
+        data = self.read_part(part_name)
+        if data is None:
+            return None
+        return lxml.etree.ElementTree(lxml.etree.fromstring(data))
+
+    def close(self):
+        """Close the original package."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module should not be run directly.")
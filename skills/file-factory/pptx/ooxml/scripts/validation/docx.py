@@ -3,12 +3,9 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
-
-import lxml.etree
 
 from .base import BaseSchemaValidator
+from .walker import PartVisitor
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,6 +18,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
+    PART_CHECKS = BaseSchemaValidator.PART_CHECKS + (
+        "_check_whitespace_part",
+        "_check_deletions_part",
+        "_check_insertions_part",
+    )
+
     def validate(self):
         """Run all validation checks and return True if all pass."""
         # Test 0: XML well-formedness
@@ -67,49 +70,25 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         # Count and compare paragraphs
         self.compare_paragraph_counts()
 
+        self.report_cache_stats()
         return all_valid
 
+    def _part_visitors(self, xml_file):
+        visitors = super()._part_visitors(xml_file)
+
+        # Only check document.xml files
+        if xml_file.name == "document.xml":
+            visitors["whitespace"] = _WhitespaceVisitor(self, xml_file)
+            visitors["deletions"] = _DeletionsVisitor(self, xml_file)
+            visitors["insertions"] = _InsertionsVisitor(self, xml_file)
+            visitors["paragraphs"] = _ParagraphCountVisitor()
+        return visitors
+
     def validate_whitespace_preservation(self):
         """
         Validate that w:t elements with whitespace have xml:space='preserve'.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._collect_part_errors("_check_whitespace_part")
 
         if errors:
             print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
@@ -121,44 +100,16 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - All whitespace is properly preserved")
             return True
 
+    def _check_whitespace_part(self, xml_file):
+        """Check xml:space on the w:t elements of one file. Returns a list of errors."""
+        return self._walk_part(xml_file).get("whitespace", [])
+
     def validate_deletions(self):
         """
         Validate that w:t elements are not within w:del elements.
         For some reason, XSD validation does not catch this, so we do it manually.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            # Only check document.xml files
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._collect_part_errors("_check_deletions_part")
 
         if errors:
             print(f"FAILED - Found {len(errors)} deletion validation violations:")
@@ -170,6 +121,10 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - No w:t elements found within w:del elements")
             return True
 
+    def _check_deletions_part(self, xml_file):
+        """Check for w:t within w:del in one file. Returns a list of errors."""
+        return self._walk_part(xml_file).get("deletions", [])
+
     def count_paragraphs_in_unpacked(self):
         """Count the number of paragraphs in the unpacked document."""
         count = 0
@@ -179,13 +134,15 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
-            except Exception as e:
-                print(f"Error counting paragraphs in unpacked document: {e}")
+            # Count all w:p elements
+            results = self._walk_part(xml_file)
+            if results["parse_error"] is not None:
+                print(
+                    "Error counting paragraphs in unpacked document: "
+                    f"{results['parse_error']}"
+                )
+            else:
+                count = results["paragraphs"]
 
         return count
 
@@ -194,19 +151,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         count = 0
 
         try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
+            # Parse document.xml straight from the original docx
+            root = self.baseline.parse_part("word/document.xml").getroot()
 
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
-
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            count = len(paragraphs)
 
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
@@ -218,37 +168,7 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         Validate that w:delText elements are not within w:ins elements.
         w:delText is only allowed in w:ins if nested within a w:del.
         """
-        errors = []
-
-        for xml_file in self.xml_files:
-            if xml_file.name != "document.xml":
-                continue
-
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+        errors = self._collect_part_errors("_check_insertions_part")
 
         if errors:
             print(f"FAILED - Found {len(errors)} insertion validation violations:")
@@ -260,6 +180,10 @@ class DOCXSchemaValidator(BaseSchemaValidator):
                 print("PASSED - No w:delText elements within w:ins elements")
             return True
 
+    def _check_insertions_part(self, xml_file):
+        """Check for w:delText within w:ins in one file. Returns a list of errors."""
+        return self._walk_part(xml_file).get("insertions", [])
+
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
         original_count = self.count_paragraphs_in_original()
@@ -270,5 +194,100 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
 
 
+class _ParagraphCountVisitor(PartVisitor):
+    """Counts the w:p elements of document.xml."""
+
+    TAGS = frozenset({f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}p"})
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def visit(self, elem, walker):
+        self.count += 1
+
+    def result(self):
+        return self.count
+
+
+class _DocumentTextVisitor(PartVisitor):
+    """Base for the document.xml checks that report text previews."""
+
+    W = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}"
+
+    NEEDS_TEXT = True
+
+    def __init__(self, validator, xml_file):
+        super().__init__()
+        self.xml_space_attr = f"{{{validator.XML_NAMESPACE}}}space"
+        self.relative_path = xml_file.relative_to(validator.unpacked_dir)
+
+    def fail(self, error):
+        self.errors.append(f"  {self.relative_path}: Error: {error}")
+        super().fail(error)
+
+
+class _WhitespaceVisitor(_DocumentTextVisitor):
+    """Finds w:t elements with edge whitespace but no xml:space='preserve'."""
+
+    TAGS = frozenset({f"{_DocumentTextVisitor.W}t"})
+
+    def visit(self, elem, walker):
+        if elem.text:
+            text = elem.text
+            # Check if text starts or ends with whitespace
+            if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
+                # Check if xml:space="preserve" attribute exists
+                if (
+                    self.xml_space_attr not in elem.attrib
+                    or elem.attrib[self.xml_space_attr] != "preserve"
+                ):
+                    # Show a preview of the text
+                    text_preview = (
+                        repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+                    )
+                    self.errors.append(
+                        f"  {self.relative_path}: "
+                        f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
+                    )
+
+
+class _DeletionsVisitor(_DocumentTextVisitor):
+    """Finds w:t elements that are descendants of w:del elements."""
+
+    TAGS = frozenset({f"{_DocumentTextVisitor.W}t"})
+
+    def visit(self, elem, walker):
+        if elem.text and walker.inside(f"{self.W}del"):
+            # Show a preview of the text
+            text_preview = (
+                repr(elem.text)[:50] + "..."
+                if len(repr(elem.text)) > 50
+                else repr(elem.text)
+            )
+            self.errors.append(
+                f"  {self.relative_path}: "
+                f"Line {elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
+            )
+
+
+class _InsertionsVisitor(_DocumentTextVisitor):
+    """Finds w:delText elements in w:ins that are NOT within w:del."""
+
+    TAGS = frozenset({f"{_DocumentTextVisitor.W}delText"})
+
+    def visit(self, elem, walker):
+        if walker.inside(f"{self.W}ins") and not walker.inside(f"{self.W}del"):
+            text_preview = (
+                repr(elem.text or "")[:50] + "..."
+                if len(repr(elem.text or "")) > 50
+                else repr(elem.text or "")
+            )
+            self.errors.append(
+                f"  {self.relative_path}: "
+                f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
+            )
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
@@ -11,10 +11,23 @@ from pathlib import Path
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
-    def __init__(self, unpacked_dir, original_docx, verbose=False):
+    def __init__(
+        self,
+        unpacked_dir,
+        original_docx,
+        verbose=False,
+        dirty_parts=None,
+        result_cache=None,
+    ):
         self.unpacked_dir = Path(unpacked_dir)
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.dirty_parts = (
+            None
+            if dirty_parts is None
+            else {Path(part).as_posix() for part in dirty_parts}
+        )
+        self.result_cache = result_cache
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
@@ -27,6 +40,15 @@ class RedliningValidator:
             print(f"FAILED - Modified document.xml not found at {modified_file}")
             return False
 
+        # A passing result is reused while document.xml and the original are unchanged
+        cache_key = self._cache_key(modified_file)
+        if cache_key is not None:
+            message = self.result_cache.get(cache_key)
+            if message is not None:
+                if self.verbose:
+                    print(message)
+                return True
+
         # First, check if there are any tracked changes by Claude to validate
         try:
             import xml.etree.ElementTree as ET
@@ -52,9 +74,9 @@ class RedliningValidator:
 
             # Redlining validation is only needed if tracked changes by Claude have been used.
             if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
+                return self._passed(
+                    "PASSED - No tracked changes by Claude found.", cache_key
+                )
 
         except Exception:
             # If we can't parse the XML, continue with full validation
@@ -107,9 +129,28 @@ class RedliningValidator:
                 print(error_message)
                 return False
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+            return self._passed(
+                "PASSED - All changes by Claude are properly tracked", cache_key
+            )
+
+    def _cache_key(self, modified_file):
+        """Return the result cache key for the current document.xml, or None."""
+        if self.result_cache is None:
+            return None
+        refresh = self.dirty_parts is None or "word/document.xml" in self.dirty_parts
+        return (
+            type(self).__name__,
+            self.result_cache.file_digest(modified_file, refresh=refresh),
+            self.result_cache.file_digest(self.original_docx),
+        )
+
+    def _passed(self, message, cache_key):
+        """Report a passing validation and remember it in the result cache."""
+        if cache_key is not None:
+            self.result_cache.put(cache_key, message)
+        if self.verbose:
+            print(message)
+        return True
 
     def _generate_detailed_diff(self, original_text, modified_text):
         """Generate detailed word-level differences using git word diff."""
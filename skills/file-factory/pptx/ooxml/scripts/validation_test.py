@@ -0,0 +1,297 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+import lxml.etree
+
+from validation import DOCXSchemaValidator, RedliningValidator, ValidationCache
+from validation.base import SCHEMAS_DIR
+from validation.cache import _encode
+from validation.walker import PartVisitor, PartWalker
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+NS = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+)
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+CONTENT_TYPES = (
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/comments.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.comments+xml"/>'
+    "</Types>"
+)
+PACKAGE_RELS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{REL}/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+DOCUMENT_RELS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{REL}/comments" Target="comments.xml"/>'
+    f'<Relationship Id="rId1" Type="{REL}/hyperlink" Target="https://example.com" '
+    'TargetMode="External"/>'
+    "</Relationships>"
+)
+ORIGINAL_DOCUMENT = (
+    f"<w:document {NS}><w:body>"
+    "<w:p><w:r><w:t>First paragraph</w:t></w:r></w:p>"
+    "<w:p><w:r><w:t>Second paragraph</w:t></w:r></w:p>"
+    "</w:body></w:document>"
+)
+# Duplicate IDs, a dangling r:id, ins/del misuse, stray whitespace, an
+# undeclared Ignorable prefix and comments before the root and in the body
+BAD_DOCUMENT = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<!--before the root-->\n<w:document {NS} mc:Ignorable="w14">\n<w:body>\n'
+    '<w:p><w:bookmarkStart w:id="1" w:name="a"/><w:bookmarkEnd w:id="1"/>'
+    '<w:bookmarkStart w:id="1" w:name="b"/><w:bookmarkEnd w:id="1"/>\n'
+    '<w:commentRangeStart w:id="0"/><w:r><w:t>First paragraph</w:t></w:r>'
+    '<w:commentRangeEnd w:id="0"/></w:p>\n<!--in the body-->\n'
+    '<w:p><w:hyperlink r:id="rId9"><w:r><w:t>link</w:t></w:r></w:hyperlink>\n'
+    '<w:del w:id="1" w:author="Claude" w:date="2024-01-01T00:00:00Z">'
+    "<w:r><w:t>Second</w:t></w:r></w:del>\n"
+    '<w:ins w:id="2" w:author="Claude" w:date="2024-01-01T00:00:00Z">'
+    "<w:r><w:delText>paragraph</w:delText><w:t> paragraph</w:t></w:r></w:ins>\n"
+    '<mc:AlternateContent><mc:Choice Requires="w14">'
+    '<w:bookmarkStart w:id="1" w:name="c"/></mc:Choice></mc:AlternateContent>'
+    "</w:p>\n<w:bogus/>\n</w:body>\n</w:document>\n"
+)
+COMMENTS = (
+    f"<w:comments {NS}>"
+    '<w:comment w:id="0" w:author="A"><w:p/></w:comment>'
+    '<w:comment w:id="0" w:author="B"><w:p/></w:comment>'
+    "</w:comments>"
+)
+
+
+class _TagVisitor(PartVisitor):
+    """Records the local name of every element and comment visited."""
+
+    TAGS = None
+    COMMENTS = True
+
+    def visit(self, node, walker):
+        if isinstance(node.tag, str):
+            self.errors.append(walker.local_name(node.tag))
+        else:
+            self.errors.append(node.text)
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestPartWalker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def write(self, content):
+        path = Path(self.temp_dir.name) / "part.xml"
+        path.write_text(content)
+        return path
+
+    def assertStreamSameAsWalk(self, path):
+        walked, streamed = _TagVisitor(), _TagVisitor()
+        PartWalker([walked]).walk(lxml.etree.parse(str(path)).getroot())
+        PartWalker([streamed]).stream(path)
+        self.assertEqual(streamed.result(), walked.result())
+        return streamed.result()
+
+    def test_nodes_before_and_after_root(self):
+        """Top-level processing instructions and comments are not pruned"""
+        path = self.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<?mso-application progid="Word.Document"?>\n<!--top-->\n'
+            f"<w:styles {W}><w:style/><!--in--><w:style><w:name/></w:style></w:styles>"
+            "\n<!--after-->"
+        )
+        self.assertEqual(
+            self.assertStreamSameAsWalk(path),
+            ["styles", "style", "in", "style", "name"],
+        )
+
+    def test_parse_errors_match_full_parse(self):
+        for content in ("", "  \n", f"<w:p {W}><w:r></w:p>", "<a/><b/>"):
+            path = self.write(content)
+            with self.assertRaises(lxml.etree.XMLSyntaxError) as parsed:
+                lxml.etree.parse(str(path))
+            with self.assertRaises(lxml.etree.XMLSyntaxError) as streamed:
+                PartWalker([_TagVisitor()]).stream(path)
+            self.assertEqual(
+                (streamed.exception.lineno, streamed.exception.msg),
+                (parsed.exception.lineno, parsed.exception.msg),
+            )
+
+
+class TestDocxValidator(unittest.TestCase):
+    """Every way of running the per-part checks must agree with a serial run"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.root = Path(self.temp_dir.name)
+        self.original = self.root / "original.docx"
+        self.unpacked = self.root / "unpacked"
+
+        parts = {
+            "[Content_Types].xml": CONTENT_TYPES,
+            "_rels/.rels": PACKAGE_RELS,
+            "word/_rels/document.xml.rels": DOCUMENT_RELS,
+            "word/document.xml": ORIGINAL_DOCUMENT,
+            "word/comments.xml": COMMENTS,
+        }
+        with zipfile.ZipFile(self.original, "w") as zf:
+            for name, content in parts.items():
+                zf.writestr(name, content)
+
+        parts["word/document.xml"] = BAD_DOCUMENT
+        for name, content in parts.items():
+            self.write(name, content)
+
+    def write(self, name, content):
+        path = self.unpacked / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def results(self, **options):
+        """Return {check: {part name: result}} in a form that survives the cache."""
+        with DOCXSchemaValidator(self.unpacked, self.original, **options) as validator:
+            results = {
+                check: validator._collect_part_results(check)
+                for check in validator.PART_CHECKS
+            }
+            results["xsd"] = validator._map_parts(
+                "validate_file_against_xsd", validator.xml_files
+            )
+            names = [
+                xml_file.relative_to(validator.unpacked_dir).as_posix()
+                for xml_file in validator.xml_files
+            ]
+        return {
+            check: dict(zip(names, _encode(part_results)))
+            for check, part_results in results.items()
+        }
+
+    def assertSameResults(self):
+        serial = self.results(streaming=False)
+        self.assertEqual(self.results(streaming=True), serial)
+        self.assertEqual(self.results(workers=2), serial)
+        self.assertEqual(self.results(workers=2, streaming=True), serial)
+
+        cache = ValidationCache()
+        self.assertEqual(self.results(result_cache=cache), serial)
+        misses = cache.misses
+        self.assertEqual(self.results(result_cache=cache), serial)
+        self.assertEqual(cache.misses, misses)
+
+        # Results stored on disk by parallel runs are read back by serial ones
+        cache_dir = self.root / "cache"
+        cache = ValidationCache(cache_dir)
+        self.assertEqual(self.results(workers=2, result_cache=cache), serial)
+        cache = ValidationCache(cache_dir)
+        self.assertEqual(self.results(result_cache=cache), serial)
+        self.assertEqual(cache.misses, 0)
+        return serial
+
+    def test_bad_document(self):
+        results = self.assertSameResults()
+        self.assertEqual(
+            results["_check_unique_ids_part"]["word/comments.xml"],
+            [
+                [
+                    "error",
+                    "  word/comments.xml: Line 1: Duplicate id='0' in <comment> "
+                    "(first occurrence at line 1)",
+                ]
+            ],
+        )
+        # The comment in the body ends the check, as in a full-tree loop
+        self.assertEqual(
+            [
+                error[1]
+                for error in results["_check_unique_ids_part"]["word/document.xml"]
+            ][:2],
+            [
+                "  word/document.xml: Line 5: Duplicate id='1' in <bookmarkstart> "
+                "(first occurrence at line 5)",
+                "  word/document.xml: Line 5: Duplicate id='1' in <bookmarkend> "
+                "(first occurrence at line 5)",
+            ],
+        )
+        self.assertIn(
+            "  word/document.xml: Line 8: <hyperlink> references non-existent "
+            "relationship 'rId9' (valid IDs: rId1)",
+            results["_check_relationship_ids_part"]["word/document.xml"],
+        )
+        for check in (
+            "_check_namespaces_part",
+            "_check_whitespace_part",
+            "_check_deletions_part",
+            "_check_insertions_part",
+        ):
+            self.assertEqual(len(results[check]["word/document.xml"]), 1, check)
+        if SCHEMAS_DIR.is_dir():
+            # Not every copy of these scripts ships the schemas
+            self.assertFalse(results["xsd"]["word/document.xml"][0])
+
+    def test_malformed_part(self):
+        self.write("word/footnotes.xml", f"<w:footnotes {W}><w:footnote>")
+        self.assertSameResults()
+
+    def test_dirty_parts(self):
+        """An edit that keeps the size and modification time is seen if listed"""
+        cache = ValidationCache()
+        with DOCXSchemaValidator(
+            self.unpacked, self.original, result_cache=cache
+        ) as validator:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertFalse(validator.validate())
+
+        document = self.unpacked / "word/document.xml"
+        stat = document.stat()
+        document.write_text(
+            BAD_DOCUMENT.replace('w:id="1" w:name="b"', 'w:id="3" w:name="b"')
+        )
+        os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        # Unlisted, the part keeps its cached digest and stale results
+        stale = self.results(result_cache=cache, dirty_parts=[])
+        self.assertNotEqual(stale, self.results())
+        self.assertEqual(
+            self.results(result_cache=cache, dirty_parts=["word/document.xml"]),
+            self.results(),
+        )
+
+    def test_redlining_cache(self):
+        """A cached pass is not reused once document.xml changes"""
+        self.write("word/document.xml", ORIGINAL_DOCUMENT)
+        cache = ValidationCache()
+        validator = RedliningValidator(self.unpacked, self.original, result_cache=cache)
+        self.assertTrue(validator.validate())
+
+        self.write("word/document.xml", BAD_DOCUMENT)
+        validator = RedliningValidator(
+            self.unpacked,
+            self.original,
+            dirty_parts=["word/document.xml"],
+            result_cache=cache,
+        )
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertFalse(validator.validate())
+        self.assertIn("FAILED", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
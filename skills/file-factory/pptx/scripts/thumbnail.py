@@ -50,12 +50,17 @@ from inventory import extract_text_inventory
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
+# Shared soffice pool from the OOXML scripts (skills/pptx/ooxml/scripts)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from ooxml.scripts.soffice import SofficeError, get_pool
+
 # Constants
 THUMBNAIL_WIDTH = 300  # Fixed thumbnail width in pixels
 CONVERSION_DPI = 100  # DPI for PDF to image conversion
 MAX_COLS = 6  # Maximum number of columns
 DEFAULT_COLS = 5  # Default number of columns
 JPEG_QUALITY = 95  # JPEG compression quality
+PDF_CONVERSION_TIMEOUT = 300  # Seconds allowed for converting the deck to PDF
 
 # Grid layout constants
 GRID_PADDING = 20  # Padding between thumbnails
@@ -212,24 +217,13 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
     # Convert to PDF
     print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
+    try:
+        pdf_path = get_pool().convert(
+            pptx_path, temp_dir, "pdf", timeout=PDF_CONVERSION_TIMEOUT
+        )
+    except (FileNotFoundError, SofficeError):
         raise RuntimeError("PDF conversion failed")
 
     # Convert PDF to images
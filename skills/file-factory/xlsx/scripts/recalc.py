@@ -11,6 +11,7 @@ import os
 import platform
 from pathlib import Path
 from openpyxl import load_workbook
+from soffice import SofficeError, get_pool
 
 
 def setup_libreoffice_macro():
@@ -50,22 +51,13 @@ def setup_libreoffice_macro():
         return False
 
 
-def recalc(filename, timeout=30):
+def recalc_with_macro(abs_path, timeout):
     """
-    Recalculate formulas in Excel file and report any errors
-    
-    Args:
-        filename: Path to Excel file
-        timeout: Maximum time to wait for recalculation (seconds)
+    Recalculate formulas by running soffice with the RecalculateAndSave macro
     
     Returns:
-        dict with error locations and counts
+        dict with an error message, or None on success
     """
-    if not Path(filename).exists():
-        return {'error': f'File {filename} does not exist'}
-    
-    abs_path = str(Path(filename).absolute())
-    
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
@@ -98,6 +90,39 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return None
+
+
+def recalc(filename, timeout=30):
+    """
+    Recalculate formulas in Excel file and report any errors
+    
+    Args:
+        filename: Path to Excel file
+        timeout: Maximum time to wait for recalculation (seconds)
+    
+    Returns:
+        dict with error locations and counts
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    
+    abs_path = str(Path(filename).absolute())
+    
+    # Reuse a running LibreOffice instance when the UNO bridge is available
+    pool = get_pool()
+    if pool.uses_uno:
+        try:
+            pool.recalculate(abs_path, timeout)
+        except FileNotFoundError:
+            return {'error': 'LibreOffice (soffice) not found'}
+        except SofficeError as e:
+            return {'error': str(e)}
+    else:
+        error = recalc_with_macro(abs_path, timeout)
+        if error:
+            return error
+    
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
         wb = load_workbook(filename, data_only=True)